@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark del arranque de la CLI.
+
+Ejecuta comandos livianos de cli.py en procesos nuevos con
+python -X importtime y mide:
+
+    segundos        Tiempo total del proceso, de la invocación a la salida
+    importacion_ms  Importaciones posteriores a site (las de cli.py)
+
+Además comprueba que esos comandos no carguen módulos pesados (pdfplumber,
+pymongo, pandas, asyncio...). Se ejecutan sin credenciales de MongoDB, que
+no deben hacer falta para listar juzgados ni consultar el historial.
+Termina con código 1 si algún comando importa un módulo pesado o supera
+--max-ms, así que sirve como prueba de regresión.
+
+Uso:
+    python benchmarks/bench_arranque.py
+    python benchmarks/bench_arranque.py --max-ms 100 --json arranque.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMANDOS = {
+    'list': ['--list'],
+    'help': ['--help'],
+    'historial': ['historial', '2025-00042'],
+}
+
+# Módulos que solo deben cargarse al procesar juzgados
+MODULOS_PESADOS = {'pdfplumber', 'pymongo', 'pandas', 'certifi', 'asyncio', 'pyarrow'}
+
+
+def commit_actual():
+    """Obtiene el commit del repositorio, si está disponible."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def leer_importtime(salida: str):
+    """
+    Interpreta la salida de -X importtime.
+    
+    Returns:
+        Tupla (ms de las importaciones posteriores a site, módulos importados después de site)
+    """
+    total_us = 0
+    modulos = set()
+    despues_de_site = False
+    for linea in salida.splitlines():
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+        _, acumulado, nombre = linea[len('import time:'):].split('|')
+        if not despues_de_site:
+            despues_de_site = nombre == ' site'
+            continue
+        modulos.add(nombre.strip())
+        # Los módulos de primer nivel llevan un solo espacio; su tiempo incluye el de sus hijos
+        if nombre.startswith(' ') and not nombre.startswith('  '):
+            total_us += int(acumulado)
+    return total_us / 1000, modulos
+
+
+def medir_comando(argumentos, repeticiones, entorno):
+    """Ejecuta cli.py con los argumentos indicados y mide su arranque."""
+    tiempos = []
+    importaciones = []
+    modulos = set()
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        proceso = subprocess.run(
+            [sys.executable, '-X', 'importtime', os.path.join(project_root, 'cli.py'), *argumentos],
+            capture_output=True, text=True, env=entorno, cwd=project_root
+        )
+        tiempos.append(time.perf_counter() - inicio)
+        importacion_ms, importados = leer_importtime(proceso.stderr)
+        importaciones.append(importacion_ms)
+        modulos |= importados
+    
+    pesados = sorted({modulo.split('.')[0] for modulo in modulos} & MODULOS_PESADOS)
+    return {
+        'segundos_min': min(tiempos),
+        'segundos_mediana': statistics.median(tiempos),
+        'importacion_ms_mediana': statistics.median(importaciones),
+        'modulos_pesados': pesados,
+        'repeticiones': repeticiones,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del arranque de la CLI')
+    parser.add_argument('--repeticiones', '-r', type=int, default=5, help='Ejecuciones por comando')
+    parser.add_argument('--max-ms', type=float, default=100.0,
+                        help='Máximo de la mediana de importacion_ms por comando')
+    parser.add_argument('--json', metavar='ARCHIVO', help='Guardar los resultados en JSON')
+    args = parser.parse_args()
+    
+    entorno = {
+        clave: valor for clave, valor in os.environ.items()
+        if clave not in ('USER', 'PASSWORD')
+    }
+    comandos = {nombre: medir_comando(argumentos, args.repeticiones, entorno)
+                for nombre, argumentos in COMANDOS.items()}
+    
+    fallos = []
+    print("=" * 72)
+    print(f"{'comando':<14}{'mín (s)':>10}{'mediana (s)':>14}{'imports (ms)':>14}  pesados")
+    for nombre, medicion in comandos.items():
+        pesados = ', '.join(medicion['modulos_pesados']) or '-'
+        print(f"{nombre:<14}{medicion['segundos_min']:>10.3f}{medicion['segundos_mediana']:>14.3f}"
+              f"{medicion['importacion_ms_mediana']:>14.1f}  {pesados}")
+        if medicion['modulos_pesados']:
+            fallos.append(f"{nombre} importa {pesados}")
+        if medicion['importacion_ms_mediana'] > args.max_ms:
+            fallos.append(f"{nombre} tarda {medicion['importacion_ms_mediana']:.1f} ms en importar "
+                          f"(máximo {args.max_ms:.0f})")
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'commit': commit_actual(),
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'parametros': vars(args),
+                'comandos': comandos,
+            }, archivo, ensure_ascii=False, indent=2)
+        print(f"Resultados guardados en {args.json}")
+    
+    for fallo in fallos:
+        print(f"✗ {fallo}")
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Compara los backends de extracción de texto sobre los PDFs de los juzgados.
+
+Mide el rendimiento (páginas y MB por segundo) de cada backend y la paridad
+de coincidencias frente a pdfplumber: para cada página se comparan los
+radicados y números de proceso que se encontrarían en el texto extraído.
+
+Uso:
+    python benchmarks/bench_extractores.py
+    python benchmarks/bench_extractores.py --repeticiones 5 --json resultados.json
+    python benchmarks/bench_extractores.py JPMCONTADERO/pdf otro/archivo.pdf
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Agregar el directorio del proyecto al path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from buscador_estados.core.indice import extraer_tokens
+from buscador_estados.core.pdf_processor import EXTRACTORES, ExtractorPdfplumber, obtener_extractor
+
+
+def buscar_pdfs(rutas):
+    """Obtiene los PDFs indicados o, si no hay rutas, los de todas las carpetas pdf/ de juzgados."""
+    if not rutas:
+        rutas = [
+            os.path.join(project_root, nombre, 'pdf') for nombre in sorted(os.listdir(project_root))
+            if os.path.isdir(os.path.join(project_root, nombre, 'pdf'))
+        ]
+    
+    pdfs = []
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            pdfs.extend(
+                os.path.join(ruta, archivo) for archivo in sorted(os.listdir(ruta))
+                if archivo.lower().endswith('.pdf')
+            )
+        elif ruta.lower().endswith('.pdf'):
+            pdfs.append(ruta)
+    return pdfs
+
+
+def medir(extractor, pdfs, repeticiones):
+    """Extrae todos los PDFs con un backend y devuelve el mejor tiempo y las páginas."""
+    mejor = None
+    paginas = {}
+    errores = 0
+    for _ in range(repeticiones):
+        errores = 0
+        inicio = time.perf_counter()
+        for ruta in pdfs:
+            try:
+                paginas[ruta] = list(extractor.extraer_paginas(ruta))
+            except Exception:
+                paginas[ruta] = None
+                errores += 1
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor, paginas, errores
+
+
+def comparar(referencia, candidato):
+    """Compara los tokens encontrados por página entre dos extracciones."""
+    paginas_iguales = paginas_totales = 0
+    faltantes = sobrantes = 0
+    for ruta, paginas_ref in referencia.items():
+        paginas_cand = candidato.get(ruta)
+        if paginas_ref is None:
+            continue
+        if paginas_cand is None:
+            paginas_cand = []
+        for numero, texto_ref in enumerate(paginas_ref):
+            tokens_ref = extraer_tokens(texto_ref)
+            tokens_cand = extraer_tokens(paginas_cand[numero]) if numero < len(paginas_cand) else set()
+            paginas_totales += 1
+            paginas_iguales += tokens_ref == tokens_cand
+            faltantes += len(tokens_ref - tokens_cand)
+            sobrantes += len(tokens_cand - tokens_ref)
+    return {
+        'paginas': paginas_totales,
+        'paginas_con_paridad': paginas_iguales,
+        'tokens_faltantes': faltantes,
+        'tokens_sobrantes': sobrantes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de los backends de extracción de texto')
+    parser.add_argument('rutas', nargs='*', help='Carpetas o PDFs a medir (por defecto, los de los juzgados)')
+    parser.add_argument('--repeticiones', '-r', type=int, default=3, help='Repeticiones por backend')
+    parser.add_argument('--json', metavar='ARCHIVO', help='Guardar los resultados en JSON')
+    args = parser.parse_args()
+    
+    pdfs = buscar_pdfs(args.rutas)
+    if not pdfs:
+        print("No se encontraron PDFs para medir.")
+        return 1
+    
+    megabytes = sum(os.path.getsize(ruta) for ruta in pdfs) / (1024 * 1024)
+    print(f"{len(pdfs)} PDFs, {megabytes:.2f} MB, {args.repeticiones} repeticiones")
+    print("=" * 78)
+    
+    extracciones = {}
+    resultados = {}
+    for nombre in sorted(EXTRACTORES, key=lambda nombre: nombre != ExtractorPdfplumber.nombre):
+        duracion, paginas, errores = medir(obtener_extractor(nombre), pdfs, args.repeticiones)
+        extracciones[nombre] = paginas
+        total_paginas = sum(len(texto) for texto in paginas.values() if texto is not None)
+        resultados[nombre] = {
+            'segundos': duracion,
+            'paginas': total_paginas,
+            'paginas_por_segundo': total_paginas / duracion if duracion else 0.0,
+            'mb_por_segundo': megabytes / duracion if duracion else 0.0,
+            'errores': errores,
+        }
+    
+    referencia = extracciones[ExtractorPdfplumber.nombre]
+    for nombre, resultado in resultados.items():
+        resultado['paridad'] = comparar(referencia, extracciones[nombre])
+    
+    base = resultados[ExtractorPdfplumber.nombre]['segundos']
+    print(f"{'backend':<12}{'segundos':>10}{'págs/s':>10}{'MB/s':>9}{'acelera':>9}"
+          f"{'paridad':>12}{'faltan':>8}{'sobran':>8}")
+    for nombre, resultado in resultados.items():
+        paridad = resultado['paridad']
+        print(f"{nombre:<12}{resultado['segundos']:>10.3f}{resultado['paginas_por_segundo']:>10.1f}"
+              f"{resultado['mb_por_segundo']:>9.2f}{base / resultado['segundos']:>8.1f}x"
+              f"{paridad['paginas_con_paridad']:>6}/{paridad['paginas']:<5}"
+              f"{paridad['tokens_faltantes']:>8}{paridad['tokens_sobrantes']:>8}")
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as archivo:
+            json.dump({'pdfs': len(pdfs), 'megabytes': megabytes, 'backends': resultados},
+                      archivo, ensure_ascii=False, indent=2)
+        print(f"\nResultados guardados en {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
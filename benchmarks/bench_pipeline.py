@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark del proceso de búsqueda sobre gacetas sintéticas.
+
+Genera un juzgado con PDFs de estados sintéticos y una colección de estados
+falsa, y mide por etapa el tiempo y el pico de memoria:
+
+    extraccion          Texto de todos los PDFs (sin caché)
+    busqueda            Autómata y búsqueda de todos los números por página
+    revision_fria       ejecutar_revision_completa sin caché ni manifest
+    revision_cache      ejecutar_revision_completa con la caché de textos llena
+    revision_incremental ejecutar_revision_completa sin PDFs ni estados nuevos
+
+Se ejecuta sin conexión: MongoDB se reemplaza por un sustituto local. El
+resultado se puede guardar en JSON para comparar commits.
+
+Uso:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --pdfs 20 --paginas 10 --densidad 40 --json base.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+# Agregar el directorio del proyecto al path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.sinteticos import ClienteMongoFalso, generar_estados, generar_juzgado
+from buscador_estados.core import database
+from buscador_estados.core.matcher import AhoCorasickMatcher
+from buscador_estados.core.pdf_processor import EXTRACTORES, PDFProcessor, buscar_por_pagina
+from buscador_estados.juzgados.manager import JuzgadoManager
+
+NOMBRE_JUZGADO = 'SINTETICO'
+
+
+def commit_actual():
+    """Obtiene el commit del repositorio, si está disponible."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def medir_etapa(funcion, repeticiones, preparar=None):
+    """
+    Ejecuta una etapa varias veces y mide tiempo y pico de memoria.
+    
+    El pico se mide en una ejecución adicional con tracemalloc, para no
+    distorsionar los tiempos; solo cuenta la memoria de este proceso.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    
+    if preparar:
+        preparar()
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return resultado, {
+        'segundos_min': min(tiempos),
+        'segundos_mediana': statistics.median(tiempos),
+        'repeticiones': repeticiones,
+        'pico_memoria_mb': pico / (1024 * 1024),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del proceso de búsqueda con gacetas sintéticas')
+    parser.add_argument('--pdfs', type=int, default=10, help='Gacetas del juzgado')
+    parser.add_argument('--paginas', type=int, default=5, help='Páginas por gaceta')
+    parser.add_argument('--densidad', type=int, default=30, help='Radicados por página')
+    parser.add_argument('--estados', type=int, default=500, help='Estados en la colección')
+    parser.add_argument('--encontrados', type=float, default=0.3,
+                        help='Fracción de estados publicados en las gacetas')
+    parser.add_argument('--backend', choices=sorted(EXTRACTORES), default='pdfplumber',
+                        help='Backend de extracción de texto')
+    parser.add_argument('--workers', '-w', type=int, default=1, help='Procesos de extracción')
+    parser.add_argument('--repeticiones', '-r', type=int, default=3, help='Repeticiones por etapa')
+    parser.add_argument('--semilla', type=int, default=0, help='Semilla de los datos sintéticos')
+    parser.add_argument('--json', metavar='ARCHIVO', help='Guardar los resultados en JSON')
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    carpeta_raiz = tempfile.mkdtemp(prefix='bench_buscador_')
+    os.environ['JUZGADOS_DIR'] = carpeta_raiz
+    os.environ['INDICE_RADICADOS'] = os.path.join(carpeta_raiz, '.indice_radicados.sqlite3')
+    
+    try:
+        inicio = time.perf_counter()
+        radicados = generar_juzgado(carpeta_raiz, NOMBRE_JUZGADO, args.pdfs, args.paginas,
+                                    args.densidad, semilla=args.semilla)
+        documentos = generar_estados(radicados, args.estados, args.encontrados, semilla=args.semilla)
+        database.establecer_cliente(ClienteMongoFalso({NOMBRE_JUZGADO: documentos}))
+        print(f"Generados {args.pdfs} PDFs x {args.paginas} páginas x {args.densidad} radicados "
+              f"y {len(documentos)} estados en {time.perf_counter() - inicio:.2f} s")
+        
+        carpeta_juzgado = os.path.join(carpeta_raiz, NOMBRE_JUZGADO)
+        carpeta_pdf = os.path.join(carpeta_juzgado, 'pdf')
+        carpeta_revision = os.path.join(carpeta_juzgado, 'revision')
+        numeros = [documento['numero'] for documento in documentos]
+        etapas = {}
+        
+        procesador = PDFProcessor(carpeta_pdf, workers=args.workers, extractor=args.backend)
+        textos, etapas['extraccion'] = medir_etapa(procesador.extract_all_texts, args.repeticiones)
+        
+        def buscar():
+            matcher = AhoCorasickMatcher(numeros)
+            return sum(len(buscar_por_pagina(matcher, contenido)) for contenido in textos.values())
+        
+        _, etapas['busqueda'] = medir_etapa(buscar, args.repeticiones)
+        
+        def revisar(incremental=True):
+            manager = JuzgadoManager(NOMBRE_JUZGADO, workers=args.workers,
+                                     incremental=incremental, extractor=args.backend)
+            manager.ejecutar_revision_completa()
+            return manager
+        
+        def limpiar_revision():
+            shutil.rmtree(carpeta_revision, ignore_errors=True)
+            if os.path.exists(os.environ['INDICE_RADICADOS']):
+                os.remove(os.environ['INDICE_RADICADOS'])
+        
+        _, etapas['revision_fria'] = medir_etapa(revisar, args.repeticiones, preparar=limpiar_revision)
+        _, etapas['revision_cache'] = medir_etapa(lambda: revisar(incremental=False), args.repeticiones)
+        manager, etapas['revision_incremental'] = medir_etapa(revisar, args.repeticiones)
+        
+        resultados = manager.procesar_estados(manager.obtener_estados_procesales())
+        encontrados = sum(1 for resultado in resultados if resultado.encontrado)
+        publicados = set(radicados)
+        esperados = sum(1 for numero in numeros if numero in publicados)
+    finally:
+        database.establecer_cliente(None)
+        shutil.rmtree(carpeta_raiz, ignore_errors=True)
+    
+    print("=" * 72)
+    print(f"{'etapa':<24}{'mín (s)':>10}{'mediana (s)':>14}{'pico (MB)':>12}")
+    for nombre, etapa in etapas.items():
+        print(f"{nombre:<24}{etapa['segundos_min']:>10.3f}{etapa['segundos_mediana']:>14.3f}"
+              f"{etapa['pico_memoria_mb']:>12.1f}")
+    print(f"\nEstados encontrados: {encontrados} de {len(numeros)} (esperados {esperados})")
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'commit': commit_actual(),
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'parametros': vars(args),
+                'etapas': etapas,
+                'estados_encontrados': encontrados,
+                'estados_esperados': esperados,
+            }, archivo, ensure_ascii=False, indent=2)
+        print(f"Resultados guardados en {args.json}")
+    
+    return 0 if encontrados == esperados else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
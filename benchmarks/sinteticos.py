@@ -0,0 +1,262 @@
+"""
+Datos sintéticos para los benchmarks: gacetas de estados en PDF y un
+sustituto local de MongoDB.
+
+Los PDFs se escriben a mano (sin dependencias) con una tabla de estados
+por página, una fuente Helvetica WinAnsi con anchos explícitos y content
+streams comprimidos con FlateDecode, de modo que todos los backends de
+extracción los lean igual.
+"""
+
+import os
+import random
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+ANCHO_PAGINA = 612
+ALTO_PAGINA = 792
+ANCHO_GLIFO = 556
+
+CLASES = ['EJECUTIVO', 'VERBAL SUMARIO', 'SUCESIÓN', 'RESTITUCIÓN', 'DIVORCIO', 'ALIMENTOS',
+          'PERTENENCIA', 'MONITORIO', 'EXTRAPROCESO']
+NOMBRES = ['ANA', 'LUIS', 'MARÍA', 'JESÚS', 'CARLOS', 'DORIS', 'YURANI', 'PEDRO', 'NAYIVE', 'JOSÉ']
+APELLIDOS = ['QUIROZ', 'MAYA', 'CORAL', 'LÓPEZ', 'CEBALLOS', 'BELTRÁN', 'IGUA', 'GUZMÁN', 'PAZ']
+DECISIONES = ['ADMITE DEMANDA', 'INADMITE', 'LIBRA MANDAMIENTO', 'FIJA FECHA', 'REQUIERE', 'RECHAZA']
+
+# Columnas de la tabla: (posición x, ancho máximo en caracteres)
+COLUMNAS = [(30, 23), (150, 16), (245, 32), (430, 18), (540, 10)]
+
+
+def radicado_aleatorio(rng: random.Random) -> str:
+    """Genera un radicado de 23 dígitos con año y consecutivo plausibles."""
+    return (f"52{rng.randint(100, 999)}40{rng.randint(10, 99)}{rng.randint(1, 9):03d}"
+            f"{rng.randint(2015, 2025)}{rng.randint(1, 99999):05d}00")
+
+
+def _escapar(texto: str) -> bytes:
+    """Convierte un texto a string literal PDF en WinAnsi."""
+    datos = texto.encode('cp1252', 'replace')
+    return b'(' + datos.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def _contenido_pagina(filas: List[List[str]], titulo: str) -> bytes:
+    """Dibuja el encabezado y las filas de la tabla de una página."""
+    separacion = max(5.0, min(14.0, 680.0 / max(1, len(filas))))
+    tamano = min(8.0, separacion * 0.7)
+    partes = [b'BT /F1 10 Tf', b'1 0 0 1 30 760 Tm ' + _escapar(titulo) + b' Tj', b'/F1 %.2f Tf' % tamano]
+    y = 740.0
+    for fila in filas:
+        for (x, ancho), celda in zip(COLUMNAS, fila):
+            partes.append(b'1 0 0 1 %d %.2f Tm ' % (x, y) + _escapar(celda[:ancho]) + b' Tj')
+        y -= separacion
+    partes.append(b'ET')
+    return b'\n'.join(partes)
+
+
+def escribir_pdf(ruta: str, paginas: List[List[List[str]]], titulo: str = 'LISTA DE ESTADOS') -> None:
+    """
+    Escribe un PDF con una tabla por página.
+    
+    Args:
+        ruta: Ruta del PDF a crear
+        paginas: Filas de cada página; cada fila es la lista de sus celdas
+        titulo: Encabezado de cada página
+    """
+    objetos: Dict[int, bytes] = {}
+    objetos[1] = b'<< /Type /Catalog /Pages 2 0 R >>'
+    anchos = b' '.join([b'%d' % ANCHO_GLIFO] * 224)
+    objetos[3] = (b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding '
+                  b'/FirstChar 32 /LastChar 255 /Widths [' + anchos + b'] >>')
+    
+    hijos = []
+    numero = 4
+    for indice, filas in enumerate(paginas, 1):
+        contenido = zlib.compress(_contenido_pagina(filas, f"{titulo} - PÁGINA {indice}"))
+        objetos[numero] = (b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(contenido)
+                           + contenido + b'\nendstream')
+        objetos[numero + 1] = (b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] '
+                               b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>'
+                               % (ANCHO_PAGINA, ALTO_PAGINA, numero))
+        hijos.append(b'%d 0 R' % (numero + 1))
+        numero += 2
+    objetos[2] = b'<< /Type /Pages /Kids [' + b' '.join(hijos) + b'] /Count %d >>' % len(hijos)
+    
+    salida = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    posiciones = {}
+    for numero_objeto in sorted(objetos):
+        posiciones[numero_objeto] = len(salida)
+        salida += b'%d 0 obj\n' % numero_objeto + objetos[numero_objeto] + b'\nendobj\n'
+    
+    inicio_xref = len(salida)
+    total = max(objetos) + 1
+    salida += b'xref\n0 %d\n0000000000 65535 f \n' % total
+    for numero_objeto in range(1, total):
+        salida += b'%010d 00000 n \n' % posiciones.get(numero_objeto, 0)
+    salida += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (total, inicio_xref)
+    
+    with open(ruta, 'wb') as archivo:
+        archivo.write(salida)
+
+
+def generar_gaceta(ruta: str, paginas: int, radicados_por_pagina: int,
+                   rng: random.Random) -> List[str]:
+    """
+    Genera una gaceta de estados sintética.
+    
+    Args:
+        ruta: Ruta del PDF a crear
+        paginas: Número de páginas
+        radicados_por_pagina: Filas (radicados) en cada página
+        rng: Generador aleatorio
+    
+    Returns:
+        Radicados publicados en la gaceta
+    """
+    radicados = []
+    contenido = []
+    for _ in range(paginas):
+        filas = []
+        for _ in range(radicados_por_pagina):
+            radicado = radicado_aleatorio(rng)
+            radicados.append(radicado)
+            partes = f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)} y {rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}"
+            fecha = f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2025"
+            filas.append([radicado, rng.choice(CLASES), partes, rng.choice(DECISIONES), fecha])
+        contenido.append(filas)
+    escribir_pdf(ruta, contenido)
+    return radicados
+
+
+def generar_juzgado(carpeta_raiz: str, nombre: str, pdfs: int, paginas: int,
+                    radicados_por_pagina: int, semilla: int = 0) -> List[str]:
+    """
+    Crea la carpeta de un juzgado sintético con sus gacetas en pdf/.
+    
+    Args:
+        carpeta_raiz: Carpeta donde se crea el juzgado
+        nombre: Nombre del juzgado
+        pdfs: Número de gacetas
+        paginas: Páginas por gaceta
+        radicados_por_pagina: Radicados en cada página
+        semilla: Semilla para que los datos sean reproducibles
+    
+    Returns:
+        Radicados publicados en todas las gacetas
+    """
+    rng = random.Random(semilla)
+    carpeta_pdf = os.path.join(carpeta_raiz, nombre, 'pdf')
+    os.makedirs(carpeta_pdf, exist_ok=True)
+    # settings.juzgados_config reconoce un juzgado por su buscador.py
+    with open(os.path.join(carpeta_raiz, nombre, 'buscador.py'), 'w', encoding='utf-8') as archivo:
+        archivo.write('# Juzgado sintético para benchmarks\n')
+    
+    radicados = []
+    for indice in range(pdfs):
+        ruta = os.path.join(carpeta_pdf, f"ESTADOS {indice + 1:04d}.pdf")
+        radicados.extend(generar_gaceta(ruta, paginas, radicados_por_pagina, rng))
+    return radicados
+
+
+def generar_estados(radicados: List[str], total: int, fraccion_encontrados: float,
+                    semilla: int = 0) -> List[dict]:
+    """
+    Genera los documentos de una colección de estados.
+    
+    Args:
+        radicados: Radicados publicados en las gacetas
+        total: Número de estados de la colección
+        fraccion_encontrados: Fracción de estados que aparecen en las gacetas
+        semilla: Semilla para que los datos sean reproducibles
+    
+    Returns:
+        Documentos con _id, numero y radicado
+    """
+    rng = random.Random(semilla)
+    encontrados = min(len(radicados), int(total * fraccion_encontrados))
+    numeros = rng.sample(radicados, encontrados)
+    publicados = set(radicados)
+    while len(numeros) < total:
+        radicado = radicado_aleatorio(rng)
+        if radicado not in publicados:
+            numeros.append(radicado)
+    rng.shuffle(numeros)
+    
+    return [
+        {'_id': indice, 'numero': numero,
+         'radicado': f"{numero[:5]}-{numero[5:7]}-{numero[7:9]}-{numero[9:12]}-{numero[12:16]}-{numero[16:21]}-{numero[21:]}",
+         'demandante': rng.choice(NOMBRES)}
+        for indice, numero in enumerate(numeros)
+    ]
+
+
+class _CursorFalso:
+    """Cursor en memoria con la interfaz que usa DatabaseManager."""
+    
+    def __init__(self, documentos: List[dict]):
+        self._documentos = documentos
+    
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._documentos)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class ColeccionFalsa:
+    """Colección en memoria que admite find con filtro vacío o por _id y proyección."""
+    
+    def __init__(self, documentos: List[dict]):
+        self.documentos = documentos
+    
+    def find(self, filtro: Optional[dict] = None, proyeccion: Optional[dict] = None, **kwargs) -> _CursorFalso:
+        documentos = self.documentos
+        condicion = (filtro or {}).get('_id')
+        if isinstance(condicion, dict) and '$gt' in condicion:
+            documentos = [documento for documento in documentos if documento['_id'] > condicion['$gt']]
+        if proyeccion:
+            campos = set(proyeccion) | {'_id'}
+            documentos = [{k: v for k, v in documento.items() if k in campos} for documento in documentos]
+        return _CursorFalso(documentos)
+
+
+class _BaseDatosFalsa:
+    def __init__(self, colecciones: Dict[str, List[dict]]):
+        self._colecciones = colecciones
+    
+    def __getitem__(self, nombre: str) -> ColeccionFalsa:
+        return ColeccionFalsa(self._colecciones.get(nombre, []))
+
+
+class _AdminFalso:
+    def command(self, *args, **kwargs) -> dict:
+        return {'ok': 1}
+
+
+class ClienteMongoFalso:
+    """
+    Sustituto local de pymongo.MongoClient para ejecutar sin conexión.
+    
+    Se instala con database.establecer_cliente(ClienteMongoFalso({...})).
+    """
+    
+    def __init__(self, colecciones: Dict[str, List[dict]]):
+        """
+        Args:
+            colecciones: Diccionario {coleccion: documentos}
+        """
+        self.colecciones = colecciones
+        self.admin = _AdminFalso()
+    
+    def __getitem__(self, nombre_db: str) -> _BaseDatosFalsa:
+        return _BaseDatosFalsa(self.colecciones)
+    
+    @contextmanager
+    def start_session(self):
+        yield None
+    
+    def close(self) -> None:
+        pass
@@ -0,0 +1,141 @@
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Tuple
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Carpetas de la raíz que nunca son juzgados
+CARPETAS_EXCLUIDAS = {'buscador_rama', 'buscador_estados', '.git', '__pycache__'}
+
+# Un mtime más reciente que esto puede no reflejar cambios hechos en el mismo
+# instante (sistemas de archivos con resolución gruesa), así que no se confía
+MARGEN_MTIME_SEGUNDOS = 2.0
+
+
+class _Escaneo:
+    """Resultado del escaneo de una raíz; sus juzgados son de solo lectura."""
+    
+    __slots__ = ('mtime_ns', 'juzgados', 'pendientes', 'confiable')
+    
+    def __init__(self, mtime_ns: int, juzgados: Dict[str, str],
+                 pendientes: List[Tuple[str, int]], confiable: bool):
+        self.mtime_ns = mtime_ns
+        self.juzgados: Mapping[str, str] = MappingProxyType(juzgados)
+        self.pendientes = pendientes
+        self.confiable = confiable
+
+
+class RegistroJuzgados:
+    """
+    Registro de las carpetas de juzgados de una o varias raíces.
+    
+    Cada raíz se recorre una vez con os.scandir y el resultado se reutiliza
+    mientras no cambie el mtime de la raíz, que cambia al crear, borrar o
+    renombrar carpetas en ella. Las subcarpetas que aún no tienen
+    buscador.py también se vigilan por su mtime, para detectar cuando una
+    carpeta nueva se completa. Un juzgado al que se le borra buscador.py
+    sigue registrado hasta que cambie la raíz.
+    """
+    
+    def __init__(self):
+        self._escaneos: Dict[str, _Escaneo] = {}
+        self._repetidos_avisados = set()
+        self._lock = threading.Lock()
+    
+    def juzgados(self, raices: Iterable[str]) -> Dict[str, str]:
+        """
+        Obtiene los juzgados de las raíces indicadas.
+        
+        Args:
+            raices: Carpetas donde buscar juzgados, en orden de prioridad
+        
+        Returns:
+            Diccionario nuevo {nombre del juzgado: carpeta}, que se puede
+            modificar sin afectar a los escaneos guardados. Si dos raíces
+            tienen un juzgado con el mismo nombre, se usa el de la primera.
+        """
+        juzgados: Dict[str, str] = {}
+        for raiz in raices:
+            for nombre, carpeta in self._juzgados_de_raiz(raiz).items():
+                if nombre in juzgados:
+                    if (juzgados[nombre] != carpeta
+                            and carpeta not in self._repetidos_avisados):
+                        self._repetidos_avisados.add(carpeta)
+                        logger.warning(f"Juzgado {nombre} repetido en {carpeta}; "
+                                       f"se usa {juzgados[nombre]}")
+                    continue
+                juzgados[nombre] = carpeta
+        return juzgados
+    
+    def invalidar(self) -> None:
+        """Descarta los escaneos guardados."""
+        with self._lock:
+            self._escaneos.clear()
+    
+    def _juzgados_de_raiz(self, raiz: str) -> Mapping[str, str]:
+        """Juzgados de una raíz, escaneándola solo si cambió."""
+        raiz = os.path.abspath(raiz)
+        try:
+            mtime_ns = os.stat(raiz).st_mtime_ns
+        except OSError as e:
+            logger.warning(f"No se pudo leer la carpeta de juzgados {raiz}: {e}")
+            return {}
+        
+        with self._lock:
+            escaneo = self._escaneos.get(raiz)
+            if escaneo is not None and self._vigente(escaneo, mtime_ns):
+                return escaneo.juzgados
+        
+        escaneo = self._escanear(raiz, mtime_ns)
+        with self._lock:
+            self._escaneos[raiz] = escaneo
+        return escaneo.juzgados
+    
+    @staticmethod
+    def _vigente(escaneo: _Escaneo, mtime_ns: int) -> bool:
+        """Indica si un escaneo sigue valiendo para la raíz con ese mtime."""
+        if not escaneo.confiable or escaneo.mtime_ns != mtime_ns:
+            return False
+        for carpeta, mtime_carpeta in escaneo.pendientes:
+            try:
+                if os.stat(carpeta).st_mtime_ns != mtime_carpeta:
+                    return False
+            except OSError:
+                return False
+        return True
+    
+    @staticmethod
+    def _escanear(raiz: str, mtime_ns: int) -> _Escaneo:
+        """Recorre una raíz y reconoce como juzgado cada carpeta con buscador.py."""
+        juzgados: Dict[str, str] = {}
+        pendientes: List[Tuple[str, int]] = []
+        limite_ns = time.time_ns() - int(MARGEN_MTIME_SEGUNDOS * 1e9)
+        confiable = mtime_ns < limite_ns
+        
+        try:
+            with os.scandir(raiz) as entradas:
+                for entrada in entradas:
+                    if entrada.name in CARPETAS_EXCLUIDAS or not entrada.is_dir():
+                        continue
+                    if os.path.exists(os.path.join(entrada.path, 'buscador.py')):
+                        juzgados[entrada.name] = entrada.path
+                        continue
+                    try:
+                        mtime_carpeta = entrada.stat().st_mtime_ns
+                    except OSError:
+                        continue
+                    pendientes.append((entrada.path, mtime_carpeta))
+                    confiable = confiable and mtime_carpeta < limite_ns
+        except OSError as e:
+            logger.warning(f"No se pudo recorrer la carpeta de juzgados {raiz}: {e}")
+            return _Escaneo(mtime_ns, {}, [], False)
+        
+        logger.debug(f"Encontrados {len(juzgados)} juzgados en {raiz}")
+        return _Escaneo(mtime_ns, dict(sorted(juzgados.items())), pendientes, confiable)
+
+
+# Registro compartido por todo el proceso
+registro_juzgados = RegistroJuzgados()
@@ -1,14 +1,21 @@
 import os
-from typing import Dict, Any, Optional
-from dotenv import load_dotenv
+import threading
+from typing import Dict, Any, List, Optional
 
 
 class Settings:
-    """Configuraciones centralizadas del sistema."""
+    """
+    Configuraciones centralizadas del sistema.
+    
+    Las credenciales de MongoDB solo se validan al construir la cadena de
+    conexión, así que los comandos que no consultan la base de datos
+    funcionan sin ellas.
+    """
     
     def __init__(self):
+        from dotenv import load_dotenv
+        
         load_dotenv()
-        self._validate_environment()
     
     @property
     def mongodb_user(self) -> str:
@@ -33,31 +40,146 @@ class Settings:
     @property
     def mongodb_connection_string(self) -> str:
         """Cadena de conexión completa a MongoDB."""
+        self._validate_environment()
         return (f"mongodb+srv://{self.mongodb_user}:{self.mongodb_password}"
                 f"@{self.mongodb_cluster}/?retryWrites=true&w=majority"
                 f"&appName=ClusterEstados")
     
+    @property
+    def mongodb_max_pool_size(self) -> int:
+        """Tamaño máximo del pool de conexiones del cliente compartido."""
+        return max(1, int(os.getenv("MONGO_MAX_POOL_SIZE", "10")))
+    
+    @property
+    def mongodb_batch_size(self) -> int:
+        """Documentos por lote al recorrer los cursores de MongoDB."""
+        return max(1, int(os.getenv("MONGO_BATCH_SIZE", "1000")))
+    
     @property
     def proyecto_root(self) -> str:
         """Directorio raíz del proyecto."""
         return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     
+    @property
+    def juzgados_root(self) -> str:
+        """Directorio que contiene las carpetas de los juzgados."""
+        return os.getenv("JUZGADOS_DIR", self.proyecto_root)
+    
+    @property
+    def metricas_dir(self) -> str:
+        """Carpeta donde se guardan los resúmenes de métricas de cada ejecución."""
+        return os.getenv("METRICAS_DIR", os.path.join(self.juzgados_root, 'metricas'))
+    
+    @property
+    def indice_radicados_ruta(self) -> str:
+        """Ruta del índice invertido de radicados de todos los juzgados."""
+        return os.getenv(
+            "INDICE_RADICADOS",
+            os.path.join(self.juzgados_root, '.indice_radicados.sqlite3')
+        )
+    
+    @property
+    def historial_revisiones_ruta(self) -> str:
+        """Ruta del historial de revisiones de todos los juzgados."""
+        return os.getenv(
+            "HISTORIAL_REVISIONES",
+            os.path.join(self.juzgados_root, '.historial_revisiones.sqlite3')
+        )
+    
+    @property
+    def juzgados_dirs_extra(self) -> List[str]:
+        """Carpetas adicionales con juzgados, separadas por os.pathsep en JUZGADOS_DIRS_EXTRA."""
+        valor = os.getenv("JUZGADOS_DIRS_EXTRA", "")
+        return [ruta.strip() for ruta in valor.split(os.pathsep) if ruta.strip()]
+    
+    @property
+    def juzgados_raices(self) -> List[str]:
+        """Carpetas donde se buscan juzgados, empezando por juzgados_root."""
+        return [self.juzgados_root, *self.juzgados_dirs_extra]
+    
     @property
     def juzgados_config(self) -> Dict[str, str]:
-        """Configuración de carpetas de juzgados."""
-        root = self.proyecto_root
-        juzgados = {}
+        """
+        Configuración de carpetas de juzgados.
         
-        # Buscar todas las carpetas que contengan archivos buscador.py
-        for item in os.listdir(root):
-            item_path = os.path.join(root, item)
-            if (os.path.isdir(item_path) and 
-                item not in ['buscador_rama', 'buscador_estados', '.git', '__pycache__']):
-                buscador_path = os.path.join(item_path, 'buscador.py')
-                if os.path.exists(buscador_path):
-                    juzgados[item] = item_path
+        Cada carpeta de juzgados_raices que contenga un buscador.py es un
+        juzgado. El escaneo se guarda en el registro compartido y solo se
+        repite cuando cambia alguna de las raíces.
+        """
+        from .registro import registro_juzgados
         
-        return juzgados
+        return registro_juzgados.juzgados(self.juzgados_raices)
+    
+    @property
+    def cache_textos_max_bytes(self) -> int:
+        """Tamaño máximo de la caché de textos extraídos por juzgado."""
+        return int(os.getenv("CACHE_TEXTOS_MAX_MB", "512")) * 1024 * 1024
+    
+    @property
+    def pdf_workers(self) -> int:
+        """Número de procesos por defecto para extraer texto de los PDFs."""
+        return max(1, int(os.getenv("PDF_WORKERS", "1")))
+    
+    @property
+    def pipeline_cola_textos(self) -> int:
+        """Textos extraídos que pueden esperar en cola mientras llegan los estados."""
+        return max(1, int(os.getenv("PIPELINE_COLA_TEXTOS", "16")))
+    
+    @property
+    def buscar_radicado(self) -> bool:
+        """Si es True, la revisión también busca el radicado de cada estado."""
+        return os.getenv("BUSCAR_RADICADO", "").strip().lower() in ('1', 'true', 'si', 'sí')
+    
+    @property
+    def watch_intervalo(self) -> float:
+        """Segundos entre revisiones de las carpetas pdf/ en el modo watch."""
+        return max(0.1, float(os.getenv("WATCH_INTERVALO", "2")))
+    
+    @property
+    def watch_refresco_estados(self) -> float:
+        """Segundos entre consultas de los estados a MongoDB en el modo watch."""
+        return max(1.0, float(os.getenv("WATCH_REFRESCO_ESTADOS_MIN", "15")) * 60)
+    
+    @property
+    def watch_sincronizacion_estados(self) -> float:
+        """Segundos entre consultas de los cambios de estados en el modo watch con la caché de estados."""
+        return max(1.0, float(os.getenv("WATCH_SINCRONIZACION_ESTADOS", "30")))
+    
+    @property
+    def watch_sondeo(self) -> bool:
+        """Si es True, el modo watch sondea las carpetas en lugar de usar inotify."""
+        return os.getenv("WATCH_SONDEO", "").strip().lower() in ('1', 'true', 'si', 'sí')
+    
+    @property
+    def cache_estados(self) -> bool:
+        """Si es True, los estados se guardan en una caché local que solo pide los cambios a MongoDB."""
+        return os.getenv("CACHE_ESTADOS", "0").strip().lower() in ('1', 'true', 'si', 'sí')
+    
+    @property
+    def estados_reconciliar_horas(self) -> float:
+        """Horas entre lecturas completas de cada colección para reconciliar la caché de estados."""
+        return max(0.0, float(os.getenv("ESTADOS_RECONCILIAR_HORAS", "24")))
+    
+    @property
+    def pdf_backend(self) -> str:
+        """Backend de extracción de texto de los PDFs: pdfplumber, flujos o auto."""
+        return os.getenv("PDF_BACKEND", "pdfplumber").strip().lower()
+    
+    @property
+    def revision_formatos(self) -> List[str]:
+        """Salidas estructuradas que se escriben junto al reporte de texto: jsonl, parquet (requiere pyarrow)."""
+        valor = os.getenv("REVISION_FORMATOS", "jsonl")
+        return [formato.strip().lower() for formato in valor.split(',') if formato.strip()]
+    
+    @property
+    def juzgados_concurrentes(self) -> int:
+        """Número de juzgados que se procesan a la vez."""
+        return max(1, int(os.getenv("JUZGADOS_CONCURRENTES", "4")))
+    
+    @property
+    def mongodb_max_consultas(self) -> int:
+        """Número máximo de consultas simultáneas a MongoDB entre juzgados."""
+        return max(1, int(os.getenv("MONGO_MAX_CONSULTAS", "4")))
     
     def _validate_environment(self) -> None:
         """Valida que las variables de entorno requeridas estén presentes."""
@@ -74,5 +196,26 @@ class Settings:
             )
 
 
+class _SettingsPerezosa:
+    """
+    Crea la configuración (y lee el .env) la primera vez que se consulta,
+    no al importar el módulo.
+    """
+    
+    def __init__(self):
+        self._instancia: Optional[Settings] = None
+        self._lock = threading.Lock()
+    
+    def _obtener(self) -> Settings:
+        if self._instancia is None:
+            with self._lock:
+                if self._instancia is None:
+                    self._instancia = Settings()
+        return self._instancia
+    
+    def __getattr__(self, nombre: str) -> Any:
+        return getattr(self._obtener(), nombre)
+
+
 # Instancia global de configuración
-settings = Settings()
+settings = _SettingsPerezosa()
@@ -1,74 +1,337 @@
-import pymongo
-import pandas as pd
-import certifi
-from typing import List, Optional
-from ..core.models import EstadoProcesal
+import atexit
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional
+from ..core.estados_cache import CacheEstados, CambiosEstados
+from ..core.models import EstadoProcesal, EstadoSet
 from ..config.settings import settings
+from ..utils.logger import get_logger
+from ..utils.metricas import Metricas
+
+if TYPE_CHECKING:
+    import pymongo
+
+logger = get_logger(__name__)
+
+# Solo se leen los campos que se usan para construir EstadoProcesal
+PROYECCION_ESTADOS = {'numero': 1, 'radicado': 1}
+
+# Espera máxima del servidor por eventos nuevos al leer el flujo de cambios
+ESPERA_FLUJO_CAMBIOS_MS = 200
+
+# Eventos tras los cuales el flujo de cambios deja de servir
+_EVENTOS_INVALIDANTES = {'drop', 'rename', 'dropDatabase', 'invalidate'}
+
+_cliente_compartido: Optional['pymongo.MongoClient'] = None
+_lock_cliente = threading.Lock()
+
+
+def get_cliente() -> 'pymongo.MongoClient':
+    """
+    Obtiene el cliente de MongoDB compartido por todo el proceso.
+    
+    El cliente se crea la primera vez que se solicita y mantiene su propio
+    pool de conexiones, de modo que la resolución SRV, el handshake TLS y el
+    ping solo se pagan una vez por ejecución. pymongo se importa aquí para
+    que los comandos que no consultan la base de datos no lo carguen.
+    
+    Returns:
+        Cliente de MongoDB
+    """
+    global _cliente_compartido
+    
+    with _lock_cliente:
+        if _cliente_compartido is None:
+            import certifi
+            import pymongo
+            
+            cliente = None
+            try:
+                cliente = pymongo.MongoClient(
+                    settings.mongodb_connection_string,
+                    tlsCAFile=certifi.where(),
+                    maxPoolSize=settings.mongodb_max_pool_size
+                )
+                # Verificar conexión
+                cliente.admin.command('ping')
+            except Exception as e:
+                # El cliente ya arrancó sus hilos de monitoreo aunque el ping falle
+                if cliente is not None:
+                    cliente.close()
+                raise ConnectionError(f"Error conectando a MongoDB: {e}") from e
+            
+            _cliente_compartido = cliente
+            atexit.register(cerrar_cliente)
+        
+        return _cliente_compartido
+
+
+def establecer_cliente(cliente) -> None:
+    """
+    Reemplaza el cliente compartido, por ejemplo por un sustituto local en
+    benchmarks que deben ejecutarse sin conexión.
+    
+    Args:
+        cliente: Objeto con la interfaz de pymongo.MongoClient que se usa aquí
+    """
+    global _cliente_compartido
+    
+    with _lock_cliente:
+        _cliente_compartido = cliente
+
+
+def cerrar_cliente() -> None:
+    """Cierra el cliente compartido de MongoDB si está abierto."""
+    global _cliente_compartido
+    
+    with _lock_cliente:
+        if _cliente_compartido is not None:
+            _cliente_compartido.close()
+            _cliente_compartido = None
+
+
+def _como_texto(valor) -> str:
+    """Convierte un campo de MongoDB a texto, usando cadena vacía si falta."""
+    return '' if valor is None else str(valor)
+
+
+def _estado(documento: dict) -> EstadoProcesal:
+    """Construye el EstadoProcesal de un documento de la colección."""
+    return EstadoProcesal(
+        numero=_como_texto(documento.get('numero')),
+        radicado=_como_texto(documento.get('radicado')),
+        id=str(documento['_id']) if '_id' in documento else None
+    )
 
 
 class DatabaseManager:
     """Gestor de conexiones y operaciones con MongoDB."""
     
-    def __init__(self):
-        self._client: Optional[pymongo.MongoClient] = None
+    def __init__(self, metricas: Optional[Metricas] = None):
+        """
+        Inicializa el gestor.
+        
+        Args:
+            metricas: Métricas opcionales donde registrar la conexión y las consultas
+        """
+        self._client: Optional['pymongo.MongoClient'] = None
         self._db = None
+        self.metricas = metricas or Metricas('mongodb')
     
     def connect(self) -> None:
-        """Establece conexión con MongoDB."""
-        try:
-            self._client = pymongo.MongoClient(
-                settings.mongodb_connection_string,
-                tlsCAFile=certifi.where()
-            )
+        """Obtiene la conexión compartida con MongoDB."""
+        with self.metricas.medir('conexion_db'):
+            self._client = get_cliente()
             self._db = self._client[settings.mongodb_database]
-            # Verificar conexión
-            self._client.admin.command('ping')
-        except Exception as e:
-            raise ConnectionError(f"Error conectando a MongoDB: {e}")
     
     def disconnect(self) -> None:
-        """Cierra la conexión con MongoDB."""
-        if self._client:
-            self._client.close()
-            self._client = None
-            self._db = None
+        """
+        Libera la conexión con MongoDB.
+        
+        El cliente compartido sigue abierto para los demás gestores; se
+        cierra con cerrar_cliente() o al terminar el proceso.
+        """
+        self._client = None
+        self._db = None
     
-    def get_estados_procesales(self, coleccion_nombre: str) -> List[EstadoProcesal]:
+    def iter_estados_procesales(self, coleccion_nombre: str, session=None,
+                                batch_size: Optional[int] = None) -> Iterator[EstadoProcesal]:
         """
-        Obtiene los estados procesales de una colección específica.
+        Recorre los estados procesales de una colección directamente desde el cursor.
         
         Args:
             coleccion_nombre: Nombre de la colección en MongoDB
+            session: Sesión de MongoDB opcional para la consulta
+            batch_size: Documentos por lote del cursor. Si es None, se usa la configuración.
             
-        Returns:
-            Lista de estados procesales
+        Yields:
+            Estados procesales de la colección
         """
+        for documento in self._iter_documentos(coleccion_nombre, {}, session=session,
+                                               batch_size=batch_size):
+            yield _estado(documento)
+    
+    def _iter_documentos(self, coleccion_nombre: str, filtro: dict, session=None,
+                         batch_size: Optional[int] = None) -> Iterator[dict]:
+        """Recorre los documentos de una colección que cumplen el filtro, con la proyección de estados."""
         if self._db is None:
             raise ConnectionError("No hay conexión a la base de datos")
         
         try:
-            coleccion = self._db[coleccion_nombre]
-            datos = coleccion.find()
-            lista_datos = list(datos)
-            
-            if not lista_datos:
-                return []
-            
-            df = pd.DataFrame(lista_datos)
-            estados = []
-            
-            for _, fila in df.iterrows():
-                estado = EstadoProcesal(
-                    numero=str(fila.get('numero', '')),
-                    radicado=str(fila.get('radicado', '')),
-                    id=str(fila.get('_id', '')) if '_id' in fila else None
-                )
-                estados.append(estado)
+            cursor = self._db[coleccion_nombre].find(
+                filtro,
+                PROYECCION_ESTADOS,
+                session=session,
+                batch_size=batch_size or settings.mongodb_batch_size
+            )
+            with cursor:
+                yield from cursor
+        
+        except Exception as e:
+            raise RuntimeError(f"Error obteniendo estados de {coleccion_nombre}: {e}")
+    
+    def get_estados_procesales(self, coleccion_nombre: str, session=None) -> EstadoSet:
+        """
+        Obtiene los estados procesales de una colección específica.
+        
+        Args:
+            coleccion_nombre: Nombre de la colección en MongoDB
+            session: Sesión de MongoDB opcional para la consulta
             
-            return estados
+        Returns:
+            Estados procesales, en una colección compacta
+        """
+        with self.metricas.medir('consulta_estados'):
+            estados = EstadoSet(self.iter_estados_procesales(coleccion_nombre, session=session))
+        self.metricas.incrementar('estados_leidos', len(estados))
+        return estados
+    
+    def get_estados_multiples(self, colecciones: Iterable[str]) -> Dict[str, EstadoSet]:
+        """
+        Obtiene los estados procesales de varias colecciones en una sola sesión.
+        
+        Args:
+            colecciones: Nombres de las colecciones en MongoDB
+        
+        Returns:
+            Diccionario {coleccion: estados procesales}
+        """
+        if self._client is None:
+            raise ConnectionError("No hay conexión a la base de datos")
+        
+        with self._client.start_session() as session:
+            return {
+                coleccion: self.get_estados_procesales(coleccion, session=session)
+                for coleccion in colecciones
+            }
+    
+    def sincronizar_estados(self, coleccion_nombre: str, cache: CacheEstados,
+                            reconciliar_sin_flujo: float = 0.0) -> CambiosEstados:
+        """
+        Trae a la caché local los cambios de una colección desde la última sincronización.
+        
+        Si la caché está vacía o toca reconciliarla, se lee la colección
+        completa y se compara con lo guardado. Si MongoDB admite flujos de
+        cambios (conjuntos de réplicas, como Atlas) se reconcilia cada
+        settings.estados_reconciliar_horas y entre tanto se leen los eventos
+        desde el último token, que incluyen ediciones y borrados; si el token
+        ya no es válido, se reconcilia. Sin flujo de cambios solo se pueden
+        pedir los documentos con _id mayor que el último leído, que no
+        muestran ediciones ni borrados, así que se reconcilia cada
+        reconciliar_sin_flujo segundos.
+        
+        Args:
+            coleccion_nombre: Nombre de la colección en MongoDB
+            cache: Caché local de los estados de esa colección
+            reconciliar_sin_flujo: Segundos entre reconciliaciones sin flujo
+                de cambios; 0 reconcilia en cada llamada
+        
+        Returns:
+            Estados agregados y eliminados respecto de la caché
+        """
+        from bson import json_util
+        
+        if self._db is None:
+            raise ConnectionError("No hay conexión a la base de datos")
+        
+        token = cache.leer_meta('token')
+        marca = cache.leer_meta('marca')
+        reconciliado = float(cache.leer_meta('reconciliado') or 0)
+        vigencia = (settings.estados_reconciliar_horas * 3600 if token is not None
+                    else reconciliar_sin_flujo)
+        reconciliar = not len(cache) or time.time() - reconciliado >= vigencia
+        
+        with self.metricas.medir('sincronizacion_estados'):
+            cambios = None
+            if not reconciliar and token is not None:
+                try:
+                    cambios, token = self._leer_flujo_cambios(coleccion_nombre, cache,
+                                                              json_util.loads(token))
+                except Exception as e:
+                    logger.warning(f"No se pudo leer el flujo de cambios de {coleccion_nombre}, "
+                                   f"se reconciliará la colección completa: {e}")
+                if cambios is not None:
+                    cache.guardar_meta(token=json_util.dumps(token))
+            elif not reconciliar and marca is not None:
+                documentos = list(self._iter_documentos(
+                    coleccion_nombre, {'_id': {'$gt': json_util.loads(marca)}}
+                ))
+                cambios = cache.aplicar(_estado(documento) for documento in documentos)
+                if documentos:
+                    marca = json_util.dumps(max(documento['_id'] for documento in documentos))
+                    cache.guardar_meta(marca=marca)
             
+            if cambios is None:
+                cambios = self._reconciliar_estados(coleccion_nombre, cache)
+        
+        self.metricas.incrementar('estados_agregados', len(cambios.agregados))
+        self.metricas.incrementar('estados_eliminados', len(cambios.eliminados))
+        return cambios
+    
+    def _reconciliar_estados(self, coleccion_nombre: str, cache: CacheEstados) -> CambiosEstados:
+        """Compara la caché con la colección completa y guarda las marcas nuevas."""
+        from bson import json_util
+        
+        # El flujo se abre antes de leer la colección para no perder los
+        # cambios que ocurran mientras tanto
+        token = self._token_flujo_cambios(coleccion_nombre)
+        documentos = list(self._iter_documentos(coleccion_nombre, {}))
+        cambios = cache.reemplazar(_estado(documento) for documento in documentos)
+        ids = [documento['_id'] for documento in documentos if '_id' in documento]
+        try:
+            marca = json_util.dumps(max(ids)) if ids else None
+        except TypeError:
+            # _id de tipos que no se pueden comparar: solo sirve el flujo de cambios
+            marca = None
+        cache.guardar_meta(
+            token=json_util.dumps(token) if token is not None else None,
+            marca=marca,
+            reconciliado=str(time.time())
+        )
+        self.metricas.incrementar('estados_leidos', len(documentos))
+        return cambios
+    
+    def _token_flujo_cambios(self, coleccion_nombre: str):
+        """Token para reanudar el flujo de cambios desde ahora, o None si MongoDB no lo admite."""
+        try:
+            with self._db[coleccion_nombre].watch(max_await_time_ms=ESPERA_FLUJO_CAMBIOS_MS) as flujo:
+                flujo.try_next()
+                return flujo.resume_token
         except Exception as e:
-            raise RuntimeError(f"Error obteniendo estados de {coleccion_nombre}: {e}")
+            logger.debug(f"Flujo de cambios no disponible para {coleccion_nombre}: {e}")
+            return None
+    
+    def _leer_flujo_cambios(self, coleccion_nombre: str, cache: CacheEstados, token):
+        """
+        Aplica a la caché los eventos del flujo de cambios posteriores al token.
+        
+        Returns:
+            Tupla (cambios, token nuevo), o (None, token) si el flujo se
+            invalidó y hay que reconciliar
+        """
+        # Solo importa el último evento de cada documento
+        pendientes: Dict[str, Optional[EstadoProcesal]] = {}
+        with self._db[coleccion_nombre].watch(resume_after=token, full_document='updateLookup',
+                                              max_await_time_ms=ESPERA_FLUJO_CAMBIOS_MS) as flujo:
+            while True:
+                evento = flujo.try_next()
+                if evento is None:
+                    break
+                operacion = evento.get('operationType')
+                if operacion in _EVENTOS_INVALIDANTES:
+                    return None, token
+                id_estado = str(evento.get('documentKey', {}).get('_id'))
+                if operacion == 'delete':
+                    pendientes[id_estado] = None
+                elif evento.get('fullDocument') is not None:
+                    pendientes[id_estado] = _estado(evento['fullDocument'])
+            token = flujo.resume_token
+        
+        cambios = cache.aplicar(
+            [estado for estado in pendientes.values() if estado is not None],
+            [id_estado for id_estado, estado in pendientes.items() if estado is None]
+        )
+        return cambios, token
     
     def __enter__(self):
         """Context manager entry."""
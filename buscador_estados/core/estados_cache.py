@@ -0,0 +1,183 @@
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from .models import EstadoProcesal, EstadoSet
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+NOMBRE_ARCHIVO_CACHE_ESTADOS = '.cache_estados.sqlite3'
+
+# Ids por consulta al leer filas concretas (límite de parámetros de SQLite)
+_IDS_POR_CONSULTA = 500
+
+
+class CambiosEstados(NamedTuple):
+    """Estados que cambiaron en una sincronización de la caché."""
+    agregados: List[EstadoProcesal]
+    eliminados: List[EstadoProcesal]
+    
+    def __bool__(self) -> bool:
+        return bool(self.agregados or self.eliminados)
+
+
+class CacheEstados:
+    """
+    Copia local de los estados procesales de un juzgado.
+    
+    Guarda en SQLite los estados de la colección de MongoDB junto con las
+    marcas para pedir solo lo que cambió desde la última sincronización
+    (el mayor _id leído y el token del flujo de cambios), de modo que cada
+    consulta trae unos pocos documentos en lugar de la colección completa.
+    Los estados se entregan en el orden en que se agregaron.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, ruta_db: str):
+        """
+        Inicializa la caché.
+        
+        Args:
+            ruta_db: Ruta del archivo SQLite de la caché
+        """
+        self.ruta_db = ruta_db
+        self._lock = threading.Lock()
+        # El pipeline consulta los estados desde un hilo distinto al que abre la caché
+        self._conexion = sqlite3.connect(ruta_db, timeout=30, check_same_thread=False)
+        self._crear_tablas()
+    
+    def _crear_tablas(self) -> None:
+        """Crea las tablas de la caché, descartándola si es de otra versión."""
+        with self._lock, self._conexion:
+            self._conexion.executescript('''
+                CREATE TABLE IF NOT EXISTS meta (
+                    clave TEXT PRIMARY KEY,
+                    valor TEXT
+                ) WITHOUT ROWID;
+            ''')
+            fila = self._conexion.execute("SELECT valor FROM meta WHERE clave = 'version'").fetchone()
+            if fila is not None and fila[0] != str(self.VERSION):
+                logger.info(f"Caché de estados con versión distinta en {self.ruta_db}, se reconstruirá")
+                self._conexion.execute('DROP TABLE IF EXISTS estados')
+                self._conexion.execute('DELETE FROM meta')
+            self._conexion.executescript('''
+                CREATE TABLE IF NOT EXISTS estados (
+                    id TEXT NOT NULL UNIQUE,
+                    numero TEXT NOT NULL,
+                    radicado TEXT NOT NULL
+                );
+            ''')
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO meta (clave, valor) VALUES ('version', ?)",
+                (str(self.VERSION),)
+            )
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conexion.execute('SELECT COUNT(*) FROM estados').fetchone()[0]
+    
+    def estados(self) -> EstadoSet:
+        """
+        Obtiene todos los estados guardados.
+        
+        Returns:
+            Estados procesales, en el orden en que se agregaron
+        """
+        with self._lock:
+            filas = self._conexion.execute(
+                'SELECT numero, radicado, id FROM estados ORDER BY rowid'
+            ).fetchall()
+        return EstadoSet(EstadoProcesal(numero=numero, radicado=radicado, id=id_estado)
+                         for numero, radicado, id_estado in filas)
+    
+    def leer_meta(self, clave: str) -> Optional[str]:
+        """Lee un valor guardado con guardar_meta, o None si no existe."""
+        with self._lock:
+            fila = self._conexion.execute('SELECT valor FROM meta WHERE clave = ?', (clave,)).fetchone()
+        return fila[0] if fila is not None else None
+    
+    def guardar_meta(self, **valores: Optional[str]) -> None:
+        """Guarda valores de sincronización; los que son None se borran."""
+        with self._lock, self._conexion:
+            for clave, valor in valores.items():
+                if valor is None:
+                    self._conexion.execute('DELETE FROM meta WHERE clave = ?', (clave,))
+                else:
+                    self._conexion.execute(
+                        'INSERT OR REPLACE INTO meta (clave, valor) VALUES (?, ?)', (clave, valor)
+                    )
+    
+    def aplicar(self, actualizados: Iterable[EstadoProcesal],
+                eliminados: Iterable[str] = ()) -> CambiosEstados:
+        """
+        Aplica los cambios leídos de MongoDB.
+        
+        Args:
+            actualizados: Estados nuevos o modificados, con su id
+            eliminados: Ids de los estados borrados
+        
+        Returns:
+            Cambios efectivos. Un estado modificado aparece como eliminado
+            (su versión anterior) y como agregado (la nueva).
+        """
+        actualizados = {estado.id: estado for estado in actualizados if estado.id is not None}
+        eliminados = [id_estado for id_estado in eliminados if id_estado not in actualizados]
+        
+        with self._lock, self._conexion:
+            anteriores = self._leer(list(actualizados) + eliminados)
+            cambios = CambiosEstados([], [])
+            for id_estado, estado in actualizados.items():
+                anterior = anteriores.get(id_estado)
+                if anterior == estado:
+                    continue
+                if anterior is not None:
+                    cambios.eliminados.append(anterior)
+                cambios.agregados.append(estado)
+            cambios.eliminados.extend(anteriores[id_estado] for id_estado in eliminados
+                                      if id_estado in anteriores)
+            
+            self._conexion.executemany(
+                'INSERT INTO estados (id, numero, radicado) VALUES (?, ?, ?) '
+                'ON CONFLICT (id) DO UPDATE SET numero = excluded.numero, radicado = excluded.radicado',
+                [(estado.id, estado.numero, estado.radicado) for estado in cambios.agregados]
+            )
+            self._conexion.executemany(
+                'DELETE FROM estados WHERE id = ?', [(id_estado,) for id_estado in eliminados]
+            )
+        return cambios
+    
+    def reemplazar(self, estados: Iterable[EstadoProcesal]) -> CambiosEstados:
+        """
+        Reconcilia la caché con la colección completa.
+        
+        Args:
+            estados: Todos los estados de la colección, con su id
+        
+        Returns:
+            Cambios respecto de lo que tenía la caché
+        """
+        estados = [estado for estado in estados if estado.id is not None]
+        vigentes = {estado.id for estado in estados}
+        with self._lock:
+            sobrantes = [id_estado for (id_estado,) in self._conexion.execute('SELECT id FROM estados')
+                         if id_estado not in vigentes]
+        return self.aplicar(estados, sobrantes)
+    
+    def _leer(self, ids: List[str]) -> Dict[str, EstadoProcesal]:
+        """Lee los estados guardados con esos ids."""
+        encontrados = {}
+        for inicio in range(0, len(ids), _IDS_POR_CONSULTA):
+            lote = ids[inicio:inicio + _IDS_POR_CONSULTA]
+            filas: List[Tuple[str, str, str]] = self._conexion.execute(
+                f"SELECT id, numero, radicado FROM estados WHERE id IN ({', '.join('?' * len(lote))})",
+                lote
+            ).fetchall()
+            for id_estado, numero, radicado in filas:
+                encontrados[id_estado] = EstadoProcesal(numero=numero, radicado=radicado, id=id_estado)
+        return encontrados
+    
+    def cerrar(self) -> None:
+        """Cierra la conexión con la caché."""
+        with self._lock:
+            self._conexion.close()
@@ -1,23 +1,38 @@
+import json
 import os
-from datetime import date
-from typing import List
+import shutil
+from datetime import date, datetime
+from typing import Iterable, List, Optional
+from ..core.historial import HistorialRevisiones, leer_reporte_revision
 from ..core.models import ResultadoBusqueda
+from ..config.settings import settings
 from ..utils.logger import get_logger
+from ..utils.metricas import Metricas
 
 logger = get_logger(__name__)
 
+# Filas por grupo al convertir el JSONL de resultados a Parquet
+FILAS_POR_GRUPO_PARQUET = 10000
+# Estados encontrados que se acumulan antes de registrarlos en el historial
+LOTE_HISTORIAL = 500
+# Líneas que abren las estadísticas y cierran un archivo de revisión
+_LINEA_ESTADISTICAS = "=== ESTADÍSTICAS ===\n"
+_LINEA_FIN = "=== FIN DE REVISIÓN ===\n"
+
 
 class FileManager:
     """Gestor de archivos y resultados."""
     
-    def __init__(self, carpeta_revision: str):
+    def __init__(self, carpeta_revision: str, juzgado: Optional[str] = None):
         """
         Inicializa el gestor con la carpeta de revisión.
         
         Args:
             carpeta_revision: Ruta a la carpeta donde guardar los resultados
+            juzgado: Nombre del juzgado, para las salidas estructuradas
         """
         self.carpeta_revision = carpeta_revision
+        self.juzgado = juzgado
         self._crear_carpeta_si_no_existe()
     
     def _crear_carpeta_si_no_existe(self) -> None:
@@ -42,6 +57,59 @@ class FileManager:
         nombre_archivo = f'{fecha}_revision.txt'
         return os.path.join(self.carpeta_revision, nombre_archivo)
     
+    def get_archivo_resultados(self, fecha: date = None, formato: str = 'jsonl') -> str:
+        """
+        Obtiene la ruta de los resultados estructurados de una fecha.
+        
+        Args:
+            fecha: Fecha para el archivo. Si es None, usa la fecha actual.
+            formato: 'jsonl' o 'parquet'
+            
+        Returns:
+            Ruta completa del archivo, junto al de revisión
+        """
+        if fecha is None:
+            fecha = date.today()
+        
+        return os.path.join(self.carpeta_revision, f'{fecha}_revision.{formato}')
+    
+    def get_archivo_metricas(self, fecha: date = None) -> str:
+        """
+        Obtiene la ruta del resumen de métricas de una fecha.
+        
+        Args:
+            fecha: Fecha para el archivo. Si es None, usa la fecha actual.
+            
+        Returns:
+            Ruta completa del archivo de métricas, junto al de revisión
+        """
+        if fecha is None:
+            fecha = date.today()
+        
+        return os.path.join(self.carpeta_revision, f'{fecha}_metricas.json')
+    
+    def escribir_metricas(self, metricas: Metricas, fecha: date = None,
+                          extra: Optional[dict] = None) -> Optional[str]:
+        """
+        Guarda el resumen de métricas de la revisión en JSON.
+        
+        Args:
+            metricas: Métricas de la revisión
+            fecha: Fecha de la revisión. Si es None, usa la fecha actual.
+            extra: Campos adicionales para el resumen
+            
+        Returns:
+            Ruta del archivo escrito, o None si no se pudo escribir
+        """
+        try:
+            ruta = metricas.guardar(self.get_archivo_metricas(fecha), extra)
+            logger.debug(f"Métricas guardadas en {ruta}")
+            return ruta
+        except Exception as e:
+            # Las métricas no deben hacer fallar una revisión
+            logger.warning(f"No se pudieron guardar las métricas: {e}")
+            return None
+    
     def escribir_resultado(self, resultado: ResultadoBusqueda) -> None:
         """
         Escribe un resultado de búsqueda al archivo de revisión.
@@ -62,51 +130,185 @@ class FileManager:
             logger.error(f"Error escribiendo resultado: {e}")
             raise
     
-    def escribir_resultados(self, resultados: List[ResultadoBusqueda]) -> None:
+    def abrir_escritor(self, fecha: date = None,
+                       formatos: Optional[List[str]] = None,
+                       historial: Optional[HistorialRevisiones] = None) -> 'EscritorRevision':
+        """
+        Abre un escritor que agrega los resultados al archivo de revisión a
+        medida que se producen.
+        
+        Args:
+            fecha: Fecha de la revisión. Si es None, usa la fecha actual.
+            formatos: Salidas estructuradas además del texto ('jsonl', 'parquet').
+                Si es None, se usa REVISION_FORMATOS. El Parquet se genera a
+                partir del JSONL, que se escribe siempre que haya alguna.
+            historial: Historial donde registrar los estados encontrados
+            
+        Returns:
+            Escritor de la revisión; se finaliza con finalizar() o al salir del bloque with
+        """
+        if fecha is None:
+            fecha = date.today()
+        if formatos is None:
+            formatos = settings.revision_formatos
+        estructurado = 'jsonl' in formatos or 'parquet' in formatos
+        
+        return EscritorRevision(
+            self.get_archivo_revision(fecha), fecha, juzgado=self.juzgado,
+            archivo_jsonl=self.get_archivo_resultados(fecha, 'jsonl') if estructurado else None,
+            archivo_parquet=self.get_archivo_resultados(fecha, 'parquet') if 'parquet' in formatos else None,
+            historial=historial,
+        )
+    
+    def escribir_resultados(self, resultados: Iterable[ResultadoBusqueda]) -> None:
         """
         Escribe múltiples resultados de búsqueda al archivo.
         Solo incluye los estados que SÍ fueron encontrados.
         
         Args:
-            resultados: Lista de resultados a escribir
+            resultados: Resultados a escribir; puede ser un generador
         """
-        if not resultados:
+        resultados = iter(resultados)
+        primero = next(resultados, None)
+        if primero is None:
             logger.warning("No hay resultados para escribir")
             return
         
-        # Filtrar solo los resultados encontrados
-        resultados_encontrados = [r for r in resultados if r.encontrado]
+        with self.abrir_escritor(primero.fecha_busqueda) as escritor:
+            escritor.agregar(primero)
+            for resultado in resultados:
+                escritor.agregar(resultado)
+    
+    def agregar_a_revision(self, resultados: List[ResultadoBusqueda], origen: str,
+                           fecha: date = None,
+                           historial: Optional[HistorialRevisiones] = None,
+                           total: Optional[int] = None,
+                           formatos: Optional[List[str]] = None) -> int:
+        """
+        Agrega al archivo de revisión del día los estados encontrados en PDFs
+        recién llegados o entre estados recién agregados, sin quitar lo ya
+        reportado.
+        
+        Los resultados se escriben en un bloque de actualización antes de
+        las estadísticas, que se recalculan, y el archivo (que se crea con
+        su encabezado si no existe) se reemplaza con un rename atómico. Un
+        estado ya reportado que vuelve a aparecer se cuenta una sola vez.
+        Las filas de los estados encontrados (ver fila_resultado) reemplazan
+        en {fecha}_revision.jsonl a las que ya tuvieran esos estados, y el
+        Parquet se regenera a partir del JSONL.
         
-        fecha = resultados[0].fecha_busqueda
+        Args:
+            resultados: Resultados de los estados encontrados
+            origen: Descripción de lo que originó la actualización, como
+                los nombres de los PDFs nuevos
+            fecha: Fecha de la revisión. Si es None, usa la fecha actual.
+            historial: Historial donde registrar los estados encontrados
+            total: Estados revisados. Si es None, se conserva el del archivo.
+            formatos: Salidas estructuradas a actualizar ('jsonl', 'parquet').
+                Si es None, se usa REVISION_FORMATOS.
+        
+        Returns:
+            Número de estados encontrados agregados
+        """
+        if fecha is None:
+            fecha = date.today()
+        if formatos is None:
+            formatos = settings.revision_formatos
+        encontrados = [resultado for resultado in resultados if resultado.encontrado]
         archivo_revision = self.get_archivo_revision(fecha)
+        temporal = f"{archivo_revision}.tmp"
+        ahora = datetime.now()
         
         try:
-            with open(archivo_revision, 'w', encoding='utf-8') as archivo:
-                archivo.write(f"=== REVISIÓN DEL {fecha} ===\n\n")
-                
-                if resultados_encontrados:
-                    archivo.write("🎯 ESTADOS ENCONTRADOS:\n\n")
-                    for resultado in resultados_encontrados:
-                        archivo.write(str(resultado) + '\n')
-                        archivo.write('\n')
+            numeros = set()
+            existe = os.path.exists(archivo_revision)
+            if existe:
+                previos, total_previo = leer_reporte_revision(archivo_revision)
+                numeros.update(numero for numero, _, _ in previos)
+                if total is None:
+                    total = total_previo
+            numeros.update(resultado.estado.numero for resultado in encontrados)
+            
+            with open(temporal, 'w', encoding='utf-8') as archivo:
+                if existe:
+                    # Se copia el reporte hasta sus estadísticas, que se reescriben al final
+                    with open(archivo_revision, 'r', encoding='utf-8') as anterior:
+                        for linea in anterior:
+                            if linea in (_LINEA_ESTADISTICAS, _LINEA_FIN):
+                                break
+                            archivo.write(linea)
                 else:
+                    archivo.write(f"=== REVISIÓN DEL {fecha} ===\n\n")
+                archivo.write(f"=== ACTUALIZACIÓN {ahora:%H:%M:%S}: {origen} ===\n\n")
+                if not encontrados:
                     archivo.write("❌ No se encontraron estados en los archivos PDF.\n\n")
-                
-                # Estadísticas finales
-                total_estados = len(resultados)
-                estados_encontrados = len(resultados_encontrados)
-                porcentaje = (estados_encontrados / total_estados * 100) if total_estados > 0 else 0
-                
-                archivo.write(f"=== ESTADÍSTICAS ===\n")
-                archivo.write(f"Estados encontrados: {estados_encontrados} de {total_estados} ({porcentaje:.1f}%)\n")
-                archivo.write(f"Estados no encontrados: {total_estados - estados_encontrados}\n")
-                archivo.write(f"\n=== FIN DE REVISIÓN ===\n")
-            
-            logger.info(f"Escritos {estados_encontrados} resultados encontrados de {total_estados} totales en {archivo_revision}")
-            
+                for resultado in encontrados:
+                    archivo.write(str(resultado) + '\n')
+                    archivo.write('\n')
+                _escribir_estadisticas(archivo, len(numeros), total)
+            os.replace(temporal, archivo_revision)
         except Exception as e:
-            logger.error(f"Error escribiendo resultados: {e}")
+            logger.error(f"Error agregando resultados a {archivo_revision}: {e}")
+            raise
+        
+        if 'jsonl' in formatos or 'parquet' in formatos:
+            self._agregar_a_resultados(encontrados, fecha, 'parquet' in formatos)
+        
+        if historial is not None and self.juzgado:
+            try:
+                revision = ahora.isoformat(timespec='seconds')
+                historial.registrar_apariciones(self.juzgado, fecha, revision, encontrados)
+                historial.actualizar_revision(self.juzgado, fecha, revision, total)
+            except Exception as e:
+                logger.warning(f"No se pudo actualizar el historial de revisiones: {e}")
+        
+        logger.info(f"Agregados {len(encontrados)} estados encontrados en {archivo_revision}")
+        return len(encontrados)
+    
+    def _agregar_a_resultados(self, encontrados: List[ResultadoBusqueda], fecha: date,
+                              parquet: bool) -> None:
+        """
+        Agrega las filas de los estados encontrados al JSONL de resultados del día.
+        
+        El JSONL se copia a un temporal sin las filas previas de esos estados
+        (que una revisión completa pudo escribir como no encontrados), se
+        agregan las nuevas y se reemplaza con un rename atómico.
+        
+        Args:
+            encontrados: Resultados de los estados encontrados
+            fecha: Fecha de la revisión
+            parquet: Si es True, se regenera también el Parquet
+        """
+        archivo_jsonl = self.get_archivo_resultados(fecha, 'jsonl')
+        temporal = f"{archivo_jsonl}.tmp"
+        claves = {(resultado.estado.id, resultado.estado.numero) for resultado in encontrados}
+        
+        try:
+            with open(temporal, 'w', encoding='utf-8') as archivo:
+                if os.path.exists(archivo_jsonl):
+                    with open(archivo_jsonl, 'r', encoding='utf-8') as anterior:
+                        for linea in anterior:
+                            if not linea.strip():
+                                continue
+                            fila = json.loads(linea)
+                            if (fila.get('id'), fila.get('numero')) not in claves:
+                                archivo.write(linea)
+                for resultado in encontrados:
+                    fila = fila_resultado(resultado, self.juzgado)
+                    archivo.write(json.dumps(fila, ensure_ascii=False) + '\n')
+            os.replace(temporal, archivo_jsonl)
+        except Exception as e:
+            logger.error(f"Error agregando resultados a {archivo_jsonl}: {e}")
             raise
+        
+        if parquet:
+            archivo_parquet = self.get_archivo_resultados(fecha, 'parquet')
+            try:
+                convertir_a_parquet(archivo_jsonl, archivo_parquet)
+            except ImportError:
+                logger.warning("pyarrow no está instalado; no se escribe el Parquet de resultados")
+            except Exception as e:
+                logger.warning(f"No se pudo escribir {archivo_parquet}: {e}")
     
     def leer_revision(self, fecha: date = None) -> str:
         """
@@ -153,3 +355,282 @@ class FileManager:
         except Exception as e:
             logger.error(f"Error listando archivos de revisión: {e}")
             return []
+
+
+class EscritorRevision:
+    """
+    Escritor incremental del archivo de revisión.
+    
+    Cada resultado encontrado se agrega de inmediato a un archivo parcial
+    ({revision}.parcial), de modo que si la ejecución se interrumpe no se
+    pierde lo ya encontrado, y la memoria no crece con el número de estados.
+    Al finalizar se escribe el archivo de revisión completo (encabezado,
+    resultados y estadísticas) en un temporal que reemplaza al definitivo
+    con un rename atómico.
+    
+    Opcionalmente escribe también una fila JSON por estado (ver
+    fila_resultado) en {fecha}_revision.jsonl, con el mismo esquema de
+    parcial y rename, y al finalizar la convierte a Parquet si pyarrow está
+    instalado. Si se indica un historial, los estados encontrados se
+    registran en él por lotes y los totales al finalizar.
+    """
+    
+    def __init__(self, archivo_revision: str, fecha: date, juzgado: Optional[str] = None,
+                 archivo_jsonl: Optional[str] = None, archivo_parquet: Optional[str] = None,
+                 historial: Optional[HistorialRevisiones] = None):
+        """
+        Inicializa el escritor y abre los archivos parciales.
+        
+        Args:
+            archivo_revision: Ruta final del archivo de revisión
+            fecha: Fecha de la revisión
+            juzgado: Nombre del juzgado para las filas estructuradas
+            archivo_jsonl: Ruta final del JSONL de resultados; None para no escribirlo
+            archivo_parquet: Ruta final del Parquet de resultados; requiere archivo_jsonl
+            historial: Historial de revisiones; requiere juzgado
+        """
+        self.archivo_revision = archivo_revision
+        self.archivo_parcial = f"{archivo_revision}.parcial"
+        self.archivo_jsonl = archivo_jsonl
+        self.archivo_parquet = archivo_parquet if archivo_jsonl else None
+        self.fecha = fecha
+        self.juzgado = juzgado
+        self.total_estados = 0
+        self.estados_encontrados = 0
+        self.finalizado = False
+        self.historial = historial if juzgado else None
+        self.revision = datetime.now().isoformat(timespec='seconds')
+        self._pendientes_historial: List[ResultadoBusqueda] = []
+        self._parcial = open(self.archivo_parcial, 'w', encoding='utf-8')
+        self._jsonl = None
+        if self.archivo_jsonl:
+            self._jsonl = open(f"{self.archivo_jsonl}.parcial", 'w', encoding='utf-8')
+    
+    def agregar(self, resultado: ResultadoBusqueda) -> None:
+        """
+        Registra un resultado; si fue encontrado, se escribe en el archivo parcial.
+        
+        Args:
+            resultado: Resultado de la búsqueda
+        """
+        self.total_estados += 1
+        if self._jsonl is not None:
+            fila = fila_resultado(resultado, self.juzgado)
+            self._jsonl.write(json.dumps(fila, ensure_ascii=False) + '\n')
+        if not resultado.encontrado:
+            return
+        
+        self.estados_encontrados += 1
+        self._parcial.write(str(resultado) + '\n')
+        self._parcial.write('\n')
+        self._parcial.flush()
+        
+        if self.historial is not None:
+            self._pendientes_historial.append(resultado)
+            if len(self._pendientes_historial) >= LOTE_HISTORIAL:
+                self._registrar_en_historial()
+    
+    def _registrar_en_historial(self, cerrar: bool = False) -> None:
+        """
+        Registra en el historial los estados encontrados pendientes.
+        
+        Args:
+            cerrar: Si es True, registra también los totales de la revisión
+        """
+        try:
+            self.historial.registrar_apariciones(
+                self.juzgado, self.fecha, self.revision, self._pendientes_historial
+            )
+            if cerrar:
+                self.historial.cerrar_revision(
+                    self.juzgado, self.fecha, self.revision,
+                    self.total_estados, self.estados_encontrados
+                )
+        except Exception as e:
+            # El historial no debe hacer fallar una revisión; se puede importar después
+            logger.warning(f"No se pudo actualizar el historial de revisiones: {e}")
+            self.historial = None
+        self._pendientes_historial = []
+    
+    def finalizar(self) -> Optional[str]:
+        """
+        Escribe el archivo de revisión definitivo y elimina el parcial.
+        
+        Returns:
+            Ruta del archivo de revisión, o None si no se registró ningún resultado
+        """
+        self.finalizado = True
+        self._cerrar()
+        if self.total_estados == 0:
+            logger.warning("No hay resultados para escribir")
+            os.remove(self.archivo_parcial)
+            if self.archivo_jsonl:
+                os.remove(f"{self.archivo_jsonl}.parcial")
+            return None
+        
+        temporal = f"{self.archivo_revision}.tmp"
+        try:
+            with open(temporal, 'w', encoding='utf-8') as archivo:
+                archivo.write(f"=== REVISIÓN DEL {self.fecha} ===\n\n")
+                
+                if self.estados_encontrados:
+                    archivo.write("🎯 ESTADOS ENCONTRADOS:\n\n")
+                    with open(self.archivo_parcial, 'r', encoding='utf-8') as parcial:
+                        shutil.copyfileobj(parcial, archivo)
+                else:
+                    archivo.write("❌ No se encontraron estados en los archivos PDF.\n\n")
+                
+                _escribir_estadisticas(archivo, self.estados_encontrados, self.total_estados)
+            
+            os.replace(temporal, self.archivo_revision)
+            os.remove(self.archivo_parcial)
+            
+            if self.archivo_jsonl:
+                os.replace(f"{self.archivo_jsonl}.parcial", self.archivo_jsonl)
+        except Exception as e:
+            logger.error(f"Error escribiendo resultados: {e}")
+            raise
+        
+        if self.historial is not None:
+            self._registrar_en_historial(cerrar=True)
+        
+        if self.archivo_parquet:
+            try:
+                convertir_a_parquet(self.archivo_jsonl, self.archivo_parquet)
+            except ImportError:
+                logger.warning("pyarrow no está instalado; no se escribe el Parquet de resultados")
+            except Exception as e:
+                # El Parquet se puede regenerar desde el JSONL
+                logger.warning(f"No se pudo escribir {self.archivo_parquet}: {e}")
+        
+        logger.info(f"Escritos {self.estados_encontrados} resultados encontrados de "
+                    f"{self.total_estados} totales en {self.archivo_revision}")
+        return self.archivo_revision
+    
+    def _cerrar(self) -> None:
+        """Cierra los archivos parciales."""
+        self._parcial.close()
+        if self._jsonl is not None:
+            self._jsonl.close()
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Finaliza si no se hizo antes y no hubo errores; si los hubo, conserva el archivo parcial."""
+        if self.finalizado:
+            return
+        if exc_type is None:
+            self.finalizar()
+        else:
+            self._cerrar()
+            logger.warning(f"Revisión interrumpida; resultados parciales en {self.archivo_parcial}")
+
+
+def _escribir_estadisticas(archivo, encontrados: int, total: Optional[int]) -> None:
+    """
+    Escribe las estadísticas finales y el cierre de un archivo de revisión.
+    
+    Args:
+        archivo: Archivo de texto abierto para escritura
+        encontrados: Estados encontrados
+        total: Estados revisados, o None si no se conoce
+    """
+    archivo.write(_LINEA_ESTADISTICAS)
+    if total:
+        porcentaje = (encontrados / total * 100)
+        archivo.write(f"Estados encontrados: {encontrados} de {total} ({porcentaje:.1f}%)\n")
+        archivo.write(f"Estados no encontrados: {total - encontrados}\n")
+    else:
+        archivo.write(f"Estados encontrados: {encontrados}\n")
+    archivo.write(f"\n{_LINEA_FIN}")
+
+
+def fila_resultado(resultado: ResultadoBusqueda, juzgado: Optional[str] = None) -> dict:
+    """
+    Convierte un resultado en una fila para las salidas estructuradas.
+    
+    Args:
+        resultado: Resultado de la búsqueda
+        juzgado: Nombre del juzgado
+        
+    Returns:
+        Diccionario serializable a JSON con el esquema de ESQUEMA_PARQUET
+    """
+    return {
+        'fecha': resultado.fecha_busqueda.isoformat(),
+        'juzgado': juzgado,
+        'id': resultado.estado.id,
+        'numero': resultado.estado.numero,
+        'radicado': resultado.estado.radicado,
+        'encontrado': resultado.encontrado,
+        'archivos': resultado.archivos_encontrados,
+        'paginas': [
+            {'archivo': archivo, 'paginas': list(paginas)}
+            for archivo, paginas in resultado.iter_archivos()
+        ],
+        'fragmento': resultado.fragmento,
+    }
+
+
+def _esquema_parquet():
+    """Esquema Arrow de las filas de fila_resultado."""
+    import pyarrow as pa
+    
+    return pa.schema([
+        ('fecha', pa.date32()),
+        ('juzgado', pa.string()),
+        ('id', pa.string()),
+        ('numero', pa.string()),
+        ('radicado', pa.string()),
+        ('encontrado', pa.bool_()),
+        ('archivos', pa.list_(pa.string())),
+        ('paginas', pa.list_(pa.struct([('archivo', pa.string()), ('paginas', pa.list_(pa.int32()))]))),
+        ('fragmento', pa.string()),
+    ])
+
+
+def convertir_a_parquet(archivo_jsonl: str, archivo_parquet: str) -> str:
+    """
+    Convierte el JSONL de resultados a Parquet por grupos de filas.
+    
+    Lee el JSONL en lotes de FILAS_POR_GRUPO_PARQUET, de modo que la memoria
+    no depende del número de estados, y reemplaza el Parquet de forma atómica.
+    
+    Args:
+        archivo_jsonl: Ruta del JSONL de resultados
+        archivo_parquet: Ruta del Parquet a escribir
+        
+    Returns:
+        Ruta del Parquet escrito
+        
+    Raises:
+        ImportError: Si pyarrow no está instalado
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    esquema = _esquema_parquet()
+    temporal = f"{archivo_parquet}.tmp"
+    
+    def escribir_lote(escritor, filas):
+        for fila in filas:
+            fila['fecha'] = date.fromisoformat(fila['fecha'])
+        escritor.write_table(pa.Table.from_pylist(filas, schema=esquema))
+    
+    with pq.ParquetWriter(temporal, esquema) as escritor, \
+            open(archivo_jsonl, 'r', encoding='utf-8') as archivo:
+        filas = []
+        for linea in archivo:
+            if linea.strip():
+                filas.append(json.loads(linea))
+            if len(filas) >= FILAS_POR_GRUPO_PARQUET:
+                escribir_lote(escritor, filas)
+                filas = []
+        if filas:
+            escribir_lote(escritor, filas)
+    
+    os.replace(temporal, archivo_parquet)
+    logger.debug(f"Resultados convertidos a Parquet en {archivo_parquet}")
+    return archivo_parquet
@@ -0,0 +1,364 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+from ..core.indice import LONGITUD_RADICADO, normalizar_consulta, normalizar_proceso
+from ..core.models import ResultadoBusqueda
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Líneas del reporte de texto que escribe EscritorRevision
+_RE_ARCHIVO_REVISION = re.compile(r'^(\d{4}-\d{2}-\d{2})_revision\.txt$')
+_RE_ENCONTRADO = re.compile(r'^Se encontró el numero (.*) con radicado (.*) en los archivos: (.*)$')
+_RE_ARCHIVO = re.compile(r'(.+?\.pdf)(?: \(págs?\. [\d, ]+\))?(?:, |$)', re.IGNORECASE)
+_RE_ESTADISTICAS = re.compile(r'^Estados encontrados: (\d+) de (\d+)')
+
+
+def claves_busqueda(numero: str, radicado: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Obtiene las claves normalizadas con las que se consulta un estado.
+    
+    Args:
+        numero: Número del estado
+        radicado: Radicado del estado
+    
+    Returns:
+        Tupla (radicado de 23 dígitos o None, número de proceso AAAA-NNNNN o None)
+    """
+    radicado_digitos = None
+    proceso = None
+    for texto in (radicado, numero):
+        token = normalizar_consulta(texto) if texto else None
+        if token is None:
+            continue
+        if len(token) == LONGITUD_RADICADO:
+            radicado_digitos = radicado_digitos or token
+            proceso = proceso or normalizar_proceso(token[12:16], token[16:21])
+        else:
+            proceso = proceso or token
+    return radicado_digitos, proceso
+
+
+def leer_reporte_revision(ruta: str) -> Tuple[List[Tuple[str, str, List[str]]], Optional[int]]:
+    """
+    Lee los estados encontrados de un reporte {fecha}_revision.txt.
+    
+    Args:
+        ruta: Ruta del reporte de texto
+    
+    Returns:
+        Tupla (lista de (numero, radicado, archivos), total de estados revisados o None)
+    """
+    encontrados = []
+    total = None
+    with open(ruta, 'r', encoding='utf-8') as archivo:
+        for linea in archivo:
+            linea = linea.rstrip('\n')
+            coincidencia = _RE_ENCONTRADO.match(linea)
+            if coincidencia:
+                numero, radicado, archivos = coincidencia.groups()
+                encontrados.append((numero, radicado, _RE_ARCHIVO.findall(archivos)))
+                continue
+            coincidencia = _RE_ESTADISTICAS.match(linea)
+            if coincidencia:
+                total = int(coincidencia.group(2))
+    return encontrados, total
+
+
+class HistorialRevisiones:
+    """
+    Historial de los estados encontrados en las revisiones de todos los juzgados.
+    
+    Guarda una fila por estado encontrado en cada (juzgado, fecha), indexada
+    por radicado y por número de proceso, y los totales de cada revisión,
+    para responder sin leer los reportes cuándo apareció un radicado por
+    primera o última vez y cuántos estados se encontraron por fecha.
+    """
+    
+    def __init__(self, ruta_db: str):
+        """
+        Inicializa el historial.
+        
+        Args:
+            ruta_db: Ruta del archivo SQLite del historial
+        """
+        self.ruta_db = ruta_db
+        self._lock = threading.Lock()
+        # Varios juzgados pueden escribir a la vez desde sus propias conexiones
+        self._conexion = sqlite3.connect(ruta_db, timeout=30, check_same_thread=False)
+        self._crear_tablas()
+    
+    def _crear_tablas(self) -> None:
+        """Crea las tablas del historial si no existen."""
+        with self._lock, self._conexion:
+            self._conexion.executescript('''
+                CREATE TABLE IF NOT EXISTS revisiones (
+                    juzgado TEXT NOT NULL,
+                    fecha TEXT NOT NULL,
+                    revision TEXT NOT NULL,
+                    total INTEGER,
+                    encontrados INTEGER NOT NULL,
+                    PRIMARY KEY (juzgado, fecha)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS apariciones (
+                    juzgado TEXT NOT NULL,
+                    fecha TEXT NOT NULL,
+                    numero TEXT NOT NULL,
+                    radicado TEXT,
+                    radicado_digitos TEXT,
+                    proceso TEXT,
+                    archivos TEXT NOT NULL,
+                    revision TEXT NOT NULL,
+                    PRIMARY KEY (juzgado, fecha, numero)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_apariciones_radicado
+                    ON apariciones (radicado_digitos, fecha, juzgado);
+                CREATE INDEX IF NOT EXISTS idx_apariciones_proceso
+                    ON apariciones (proceso, fecha, juzgado);
+                CREATE INDEX IF NOT EXISTS idx_apariciones_fecha ON apariciones (fecha, juzgado);
+            ''')
+    
+    def registrar_apariciones(self, juzgado: str, fecha: date, revision: str,
+                              resultados: Iterable[ResultadoBusqueda]) -> int:
+        """
+        Registra los estados encontrados en una revisión.
+        
+        Args:
+            juzgado: Nombre del juzgado
+            fecha: Fecha de la revisión
+            revision: Identificador de la ejecución que los encontró
+            resultados: Resultados de la búsqueda; se ignoran los no encontrados
+        
+        Returns:
+            Número de apariciones registradas
+        """
+        filas = [
+            (juzgado, fecha.isoformat(), resultado.estado.numero, resultado.estado.radicado,
+             *claves_busqueda(resultado.estado.numero, resultado.estado.radicado),
+             json.dumps(resultado.archivos_encontrados, ensure_ascii=False), revision)
+            for resultado in resultados if resultado.encontrado
+        ]
+        self._insertar_apariciones(filas)
+        return len(filas)
+    
+    def _insertar_apariciones(self, filas: List[tuple]) -> None:
+        """Inserta o reemplaza filas completas de la tabla apariciones."""
+        with self._lock, self._conexion:
+            self._conexion.executemany(
+                'INSERT OR REPLACE INTO apariciones (juzgado, fecha, numero, radicado, '
+                'radicado_digitos, proceso, archivos, revision) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                filas
+            )
+    
+    def cerrar_revision(self, juzgado: str, fecha: date, revision: str,
+                        total: Optional[int], encontrados: int) -> None:
+        """
+        Registra los totales de una revisión y descarta las apariciones de
+        ejecuciones anteriores del mismo día que ya no se encontraron.
+        
+        Args:
+            juzgado: Nombre del juzgado
+            fecha: Fecha de la revisión
+            revision: Identificador de la ejecución
+            total: Estados revisados, o None si no se conoce
+            encontrados: Estados encontrados
+        """
+        with self._lock, self._conexion:
+            self._conexion.execute(
+                'DELETE FROM apariciones WHERE juzgado = ? AND fecha = ? AND revision != ?',
+                (juzgado, fecha.isoformat(), revision)
+            )
+            self._conexion.execute(
+                'INSERT OR REPLACE INTO revisiones (juzgado, fecha, revision, total, encontrados) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (juzgado, fecha.isoformat(), revision, total, encontrados)
+            )
+    
+    def actualizar_revision(self, juzgado: str, fecha: date, revision: str,
+                            total: Optional[int]) -> int:
+        """
+        Recalcula los totales de una revisión tras agregarle apariciones,
+        sin descartar las de ejecuciones anteriores del mismo día.
+        
+        Args:
+            juzgado: Nombre del juzgado
+            fecha: Fecha de la revisión
+            revision: Identificador de la ejecución, si la revisión aún no existe
+            total: Estados revisados, o None para conservar el registrado
+        
+        Returns:
+            Estados encontrados en la revisión
+        """
+        with self._lock, self._conexion:
+            encontrados = self._conexion.execute(
+                'SELECT COUNT(*) FROM apariciones WHERE juzgado = ? AND fecha = ?',
+                (juzgado, fecha.isoformat())
+            ).fetchone()[0]
+            self._conexion.execute(
+                'INSERT INTO revisiones (juzgado, fecha, revision, total, encontrados) '
+                'VALUES (?, ?, ?, ?, ?) ON CONFLICT (juzgado, fecha) DO UPDATE SET '
+                'total = COALESCE(excluded.total, revisiones.total), encontrados = excluded.encontrados',
+                (juzgado, fecha.isoformat(), revision, total, encontrados)
+            )
+        return encontrados
+    
+    def tiene_revision(self, juzgado: str, fecha: date) -> bool:
+        """Indica si ya hay una revisión registrada para el juzgado y la fecha."""
+        with self._lock:
+            fila = self._conexion.execute(
+                'SELECT 1 FROM revisiones WHERE juzgado = ? AND fecha = ?',
+                (juzgado, fecha.isoformat())
+            ).fetchone()
+        return fila is not None
+    
+    def importar_reportes(self, juzgado: str, carpeta_revision: str,
+                          reemplazar: bool = False) -> int:
+        """
+        Carga en el historial los reportes {fecha}_revision.txt de un juzgado.
+        
+        Args:
+            juzgado: Nombre del juzgado
+            carpeta_revision: Carpeta con los reportes
+            reemplazar: Si es True, también se vuelven a cargar las fechas ya registradas
+        
+        Returns:
+            Número de reportes importados
+        """
+        if not os.path.isdir(carpeta_revision):
+            return 0
+        
+        importados = 0
+        for nombre in sorted(os.listdir(carpeta_revision)):
+            coincidencia = _RE_ARCHIVO_REVISION.match(nombre)
+            if not coincidencia:
+                continue
+            fecha = date.fromisoformat(coincidencia.group(1))
+            if not reemplazar and self.tiene_revision(juzgado, fecha):
+                continue
+            
+            try:
+                encontrados, total = leer_reporte_revision(os.path.join(carpeta_revision, nombre))
+            except (OSError, UnicodeDecodeError) as e:
+                logger.warning(f"No se pudo importar {juzgado}/{nombre}: {e}")
+                continue
+            
+            revision = f"importado:{nombre}"
+            filas = [
+                (juzgado, fecha.isoformat(), numero, radicado, *claves_busqueda(numero, radicado),
+                 json.dumps(archivos, ensure_ascii=False), revision)
+                for numero, radicado, archivos in encontrados
+            ]
+            self._insertar_apariciones(filas)
+            # Un estado se repite si una actualización del modo watch lo volvió a reportar
+            self.cerrar_revision(juzgado, fecha, revision, total, len({fila[2] for fila in filas}))
+            importados += 1
+        
+        logger.info(f"Historial de {juzgado}: {importados} reportes importados")
+        return importados
+    
+    def _condicion_consulta(self, consulta: str) -> Optional[Tuple[str, tuple]]:
+        """
+        Obtiene la condición SQL que selecciona las apariciones de una consulta.
+        
+        Un radicado completo coincide con su radicado o, si el estado no lo
+        tenía completo, con su número de proceso.
+        """
+        token = normalizar_consulta(consulta)
+        if token is None:
+            return None
+        if len(token) == LONGITUD_RADICADO:
+            proceso = normalizar_proceso(token[12:16], token[16:21])
+            return ('(radicado_digitos = ? OR (radicado_digitos IS NULL AND proceso = ?))',
+                    (token, proceso))
+        return 'proceso = ?', (token,)
+    
+    def apariciones(self, consulta: str) -> List[Tuple[str, str, str, str, List[str]]]:
+        """
+        Lista las revisiones en las que se encontró un radicado o número de proceso.
+        
+        Args:
+            consulta: Radicado o número de proceso, con o sin separadores
+        
+        Returns:
+            Lista de tuplas (fecha, juzgado, numero, radicado, archivos) ordenada por fecha
+        """
+        condicion = self._condicion_consulta(consulta)
+        if condicion is None:
+            return []
+        
+        sql, parametros = condicion
+        with self._lock:
+            filas = self._conexion.execute(
+                f'SELECT fecha, juzgado, numero, radicado, archivos FROM apariciones '
+                f'WHERE {sql} ORDER BY fecha, juzgado',
+                parametros
+            ).fetchall()
+        return [(fecha, juzgado, numero, radicado, json.loads(archivos))
+                for fecha, juzgado, numero, radicado, archivos in filas]
+    
+    def primera_aparicion(self, consulta: str) -> Optional[Tuple[str, str]]:
+        """
+        Obtiene la primera revisión en la que se encontró un radicado o número de proceso.
+        
+        Args:
+            consulta: Radicado o número de proceso
+        
+        Returns:
+            Tupla (fecha, juzgado) o None si nunca se encontró
+        """
+        return self._aparicion_extrema(consulta, 'ASC')
+    
+    def ultima_aparicion(self, consulta: str) -> Optional[Tuple[str, str]]:
+        """
+        Obtiene la última revisión en la que se encontró un radicado o número de proceso.
+        
+        Args:
+            consulta: Radicado o número de proceso
+        
+        Returns:
+            Tupla (fecha, juzgado) o None si nunca se encontró
+        """
+        return self._aparicion_extrema(consulta, 'DESC')
+    
+    def _aparicion_extrema(self, consulta: str, orden: str) -> Optional[Tuple[str, str]]:
+        """Primera (ASC) o última (DESC) aparición usando los índices por fecha."""
+        condicion = self._condicion_consulta(consulta)
+        if condicion is None:
+            return None
+        
+        sql, parametros = condicion
+        with self._lock:
+            return self._conexion.execute(
+                f'SELECT fecha, juzgado FROM apariciones WHERE {sql} '
+                f'ORDER BY fecha {orden}, juzgado {orden} LIMIT 1',
+                parametros
+            ).fetchone()
+    
+    def conteos_por_fecha(self, juzgado: Optional[str] = None) -> List[Tuple[str, int, Optional[int], int]]:
+        """
+        Cuenta los estados encontrados en cada fecha.
+        
+        Args:
+            juzgado: Nombre del juzgado. Si es None, se suman todos.
+        
+        Returns:
+            Lista de tuplas (fecha, encontrados, revisados, juzgados) ordenada por
+            fecha; revisados es None si algún reporte importado no lo indicaba
+        """
+        filtro, parametros = ('WHERE juzgado = ?', (juzgado,)) if juzgado else ('', ())
+        with self._lock:
+            return self._conexion.execute(
+                f'SELECT fecha, SUM(encontrados), '
+                f'CASE WHEN COUNT(total) = COUNT(*) THEN SUM(total) END, COUNT(*) '
+                f'FROM revisiones {filtro} GROUP BY fecha ORDER BY fecha',
+                parametros
+            ).fetchall()
+    
+    def cerrar(self) -> None:
+        """Cierra la conexión con el historial."""
+        with self._lock:
+            self._conexion.close()
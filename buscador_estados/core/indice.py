@@ -0,0 +1,247 @@
+import re
+import sqlite3
+import threading
+from typing import Iterable, List, Optional, Set, Tuple
+from .normalizacion import LONGITUD_RADICADO, RE_SECUENCIA_DIGITOS
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+# Números cortos de proceso del tipo 2025-00042 o 2025– 42
+_RE_PROCESO = re.compile(r'(?<!\d)((?:19|20)\d{2})\s*[-–—]\s*(\d{1,5})(?!\d)')
+# Dígitos contiguos dentro de una secuencia con separadores
+_RE_GRUPO_DIGITOS = re.compile(r'\d+')
+
+
+def normalizar_proceso(anio: str, consecutivo: str) -> str:
+    """
+    Normaliza un número corto de proceso a la forma AAAA-NNNNN.
+    
+    Args:
+        anio: Año del proceso
+        consecutivo: Consecutivo del proceso
+    
+    Returns:
+        Número de proceso normalizado
+    """
+    return f"{anio}-{int(consecutivo):05d}"
+
+
+def extraer_tokens(texto: str) -> Set[str]:
+    """
+    Extrae los radicados y números de proceso normalizados de un texto.
+    
+    Los radicados de 23 dígitos se normalizan a solo dígitos, aunque vengan
+    con guiones, espacios o saltos de línea entre ellos; de cada radicado se
+    deriva también su número corto de proceso. Como en MatcherNormalizado,
+    un radicado se reconoce aunque la secuencia de dígitos siga con otros
+    números (una fecha, un folio): se toma cada tramo de 23 dígitos que
+    empieza y termina donde lo hace un grupo de dígitos del texto.
+    
+    Args:
+        texto: Texto de una página
+    
+    Returns:
+        Conjunto de tokens normalizados
+    """
+    tokens = set()
+    
+    for secuencia in RE_SECUENCIA_DIGITOS.finditer(texto):
+        grupos = _RE_GRUPO_DIGITOS.findall(secuencia.group())
+        digitos = ''.join(grupos)
+        if len(digitos) < LONGITUD_RADICADO:
+            continue
+        inicios = []
+        finales = set()
+        posicion = 0
+        for grupo in grupos:
+            inicios.append(posicion)
+            posicion += len(grupo)
+            finales.add(posicion)
+        for inicio in inicios:
+            if inicio + LONGITUD_RADICADO in finales:
+                radicado = digitos[inicio:inicio + LONGITUD_RADICADO]
+                tokens.add(radicado)
+                tokens.add(normalizar_proceso(radicado[12:16], radicado[16:21]))
+    
+    for proceso in _RE_PROCESO.finditer(texto):
+        tokens.add(normalizar_proceso(proceso.group(1), proceso.group(2)))
+    
+    return tokens
+
+
+def normalizar_consulta(consulta: str) -> Optional[str]:
+    """
+    Normaliza un radicado o número de proceso escrito por el usuario.
+    
+    Args:
+        consulta: Radicado o número de proceso
+    
+    Returns:
+        Token normalizado o None si no tiene un formato reconocible
+    """
+    digitos = re.sub(r'\D', '', consulta)
+    if len(digitos) == LONGITUD_RADICADO:
+        return digitos
+    
+    proceso = _RE_PROCESO.search(consulta)
+    if proceso:
+        return normalizar_proceso(proceso.group(1), proceso.group(2))
+    
+    return None
+
+
+class IndiceRadicados:
+    """
+    Índice invertido persistente de radicados y números de proceso.
+    
+    Relaciona cada token normalizado con los pares (juzgado, pdf, página)
+    donde aparece. Se actualiza por documento: un PDF solo se vuelve a
+    indexar si cambió el hash de su contenido.
+    """
+    
+    # Se incrementa cuando cambia la forma de extraer los tokens
+    VERSION = 1
+    
+    def __init__(self, ruta_db: str):
+        """
+        Inicializa el índice.
+        
+        Args:
+            ruta_db: Ruta del archivo SQLite del índice
+        """
+        self.ruta_db = ruta_db
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta_db, check_same_thread=False)
+        self._crear_tablas()
+    
+    def _crear_tablas(self) -> None:
+        """Crea las tablas del índice, descartando lo indexado por versiones anteriores."""
+        with self._lock, self._conexion:
+            version = self._conexion.execute('PRAGMA user_version').fetchone()[0]
+            if version != self.VERSION:
+                self._conexion.execute('DROP TABLE IF EXISTS postings')
+                self._conexion.execute('DROP TABLE IF EXISTS documentos')
+                self._conexion.execute(f'PRAGMA user_version = {self.VERSION:d}')
+            self._conexion.executescript('''
+                CREATE TABLE IF NOT EXISTS documentos (
+                    id INTEGER PRIMARY KEY,
+                    juzgado TEXT NOT NULL,
+                    pdf TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    UNIQUE (juzgado, pdf)
+                );
+                CREATE TABLE IF NOT EXISTS postings (
+                    token TEXT NOT NULL,
+                    documento INTEGER NOT NULL,
+                    pagina INTEGER NOT NULL,
+                    PRIMARY KEY (token, documento, pagina)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_postings_documento ON postings (documento);
+            ''')
+    
+    def esta_indexado(self, juzgado: str, pdf: str, hash_contenido: str) -> bool:
+        """
+        Indica si un PDF ya está indexado con su contenido actual.
+        
+        Args:
+            juzgado: Nombre del juzgado
+            pdf: Nombre del PDF
+            hash_contenido: Hash del contenido actual del PDF
+        
+        Returns:
+            True si no hace falta volver a indexarlo
+        """
+        with self._lock:
+            fila = self._conexion.execute(
+                'SELECT hash FROM documentos WHERE juzgado = ? AND pdf = ?', (juzgado, pdf)
+            ).fetchone()
+        return fila is not None and fila[0] == hash_contenido
+    
+    def indexar_documento(self, juzgado: str, pdf: str, hash_contenido: str,
+                          paginas: List[str]) -> int:
+        """
+        Indexa (o reindexa) las páginas de un PDF.
+        
+        Args:
+            juzgado: Nombre del juzgado
+            pdf: Nombre del PDF
+            hash_contenido: Hash del contenido del PDF
+            paginas: Texto de cada página; la posición 0 es la página 1
+        
+        Returns:
+            Número de postings registrados
+        """
+        postings = [
+            (token, numero_pagina)
+            for numero_pagina, texto in enumerate(paginas, 1)
+            for token in extraer_tokens(texto)
+        ]
+        
+        with self._lock, self._conexion:
+            fila = self._conexion.execute(
+                'SELECT id FROM documentos WHERE juzgado = ? AND pdf = ?', (juzgado, pdf)
+            ).fetchone()
+            if fila is None:
+                documento = self._conexion.execute(
+                    'INSERT INTO documentos (juzgado, pdf, hash) VALUES (?, ?, ?)',
+                    (juzgado, pdf, hash_contenido)
+                ).lastrowid
+            else:
+                documento = fila[0]
+                self._conexion.execute('DELETE FROM postings WHERE documento = ?', (documento,))
+                self._conexion.execute(
+                    'UPDATE documentos SET hash = ? WHERE id = ?', (hash_contenido, documento)
+                )
+            
+            self._conexion.executemany(
+                'INSERT OR IGNORE INTO postings (token, documento, pagina) VALUES (?, ?, ?)',
+                [(token, documento, pagina) for token, pagina in postings]
+            )
+        
+        logger.debug(f"Indexado {juzgado}/{pdf}: {len(postings)} postings")
+        return len(postings)
+    
+    def eliminar_ausentes(self, juzgado: str, pdfs_presentes: Iterable[str]) -> None:
+        """
+        Elimina del índice los PDFs de un juzgado que ya no existen.
+        
+        Args:
+            juzgado: Nombre del juzgado
+            pdfs_presentes: PDFs que siguen en la carpeta del juzgado
+        """
+        presentes = set(pdfs_presentes)
+        with self._lock, self._conexion:
+            filas = self._conexion.execute(
+                'SELECT id, pdf FROM documentos WHERE juzgado = ?', (juzgado,)
+            ).fetchall()
+            for documento, pdf in filas:
+                if pdf not in presentes:
+                    self._conexion.execute('DELETE FROM postings WHERE documento = ?', (documento,))
+                    self._conexion.execute('DELETE FROM documentos WHERE id = ?', (documento,))
+    
+    def buscar(self, consulta: str) -> List[Tuple[str, str, int]]:
+        """
+        Busca dónde ha aparecido un radicado o número de proceso.
+        
+        Args:
+            consulta: Radicado o número de proceso, con o sin separadores
+        
+        Returns:
+            Lista de tuplas (juzgado, pdf, página) ordenada
+        """
+        token = normalizar_consulta(consulta)
+        if token is None:
+            return []
+        
+        with self._lock:
+            return self._conexion.execute(
+                'SELECT d.juzgado, d.pdf, p.pagina FROM postings p '
+                'JOIN documentos d ON d.id = p.documento '
+                'WHERE p.token = ? ORDER BY d.juzgado, d.pdf, p.pagina',
+                (token,)
+            ).fetchall()
+    
+    def cerrar(self) -> None:
+        """Cierra la conexión con el índice."""
+        with self._lock:
+            self._conexion.close()
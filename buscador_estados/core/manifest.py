@@ -0,0 +1,207 @@
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Set
+from .text_cache import TextCache
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+NOMBRE_ARCHIVO_MANIFEST = '.manifest_revision.json'
+
+
+class ManifestRevision:
+    """
+    Registro de los PDFs ya procesados de un juzgado.
+    
+    Guarda la huella de cada PDF (tamaño, fecha de modificación y hash del
+    contenido), los textos de búsqueda encontrados en él con sus páginas y
+    el conjunto de textos con el que se calculó, para que una ejecución solo
+    tenga que buscar en los PDFs nuevos o modificados y, en los demás, solo
+    los textos agregados desde la última revisión. Las coincidencias solo
+    valen para el backend de extracción con el que se obtuvieron.
+    """
+    
+    # Se incrementa cuando cambia cómo se buscan los textos (3: radicados
+    # normalizados), para que las coincidencias guardadas se recalculen
+    VERSION = 3
+    
+    def __init__(self, ruta: str, extractor: str = 'pdfplumber'):
+        """
+        Inicializa el manifest vacío.
+        
+        Args:
+            ruta: Ruta del archivo JSON del manifest
+            extractor: Backend de extracción con el que se registran los PDFs
+        """
+        self.ruta = ruta
+        self.extractor = extractor
+        self.textos: Set[str] = set()
+        self.archivos: Dict[str, dict] = {}
+    
+    @classmethod
+    def cargar(cls, ruta: str, extractor: str = 'pdfplumber') -> 'ManifestRevision':
+        """
+        Carga el manifest desde disco.
+        
+        Args:
+            ruta: Ruta del archivo JSON del manifest
+            extractor: Backend de extracción de la ejecución actual
+        
+        Returns:
+            Manifest cargado, o vacío si no existe, no es válido o se
+            generó con otro backend
+        """
+        manifest = cls(ruta, extractor)
+        if not os.path.exists(ruta):
+            return manifest
+        
+        try:
+            with open(ruta, 'r', encoding='utf-8') as archivo:
+                datos = json.load(archivo)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Manifest inválido en {ruta}, se reconstruirá: {e}")
+            return manifest
+        
+        if datos.get('version') != cls.VERSION:
+            logger.info(f"Manifest con versión distinta en {ruta}, se reconstruirá")
+            return manifest
+        
+        if datos.get('extractor', 'pdfplumber') != extractor:
+            logger.info(f"Manifest generado con el backend {datos.get('extractor')} en {ruta}, "
+                        f"se reconstruirá con {extractor}")
+            return manifest
+        
+        manifest.textos = set(datos.get('textos', []))
+        manifest.archivos = datos.get('archivos', {})
+        return manifest
+    
+    def guardar(self) -> None:
+        """Guarda el manifest en disco de forma atómica."""
+        datos = {
+            'version': self.VERSION,
+            'extractor': self.extractor,
+            'textos': sorted(self.textos),
+            'archivos': self.archivos,
+        }
+        temporal = f"{self.ruta}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(datos, archivo, ensure_ascii=False)
+        os.replace(temporal, self.ruta)
+    
+    def esta_vigente(self, nombre_archivo: str, ruta_archivo: str) -> bool:
+        """
+        Indica si un PDF no ha cambiado desde que se registró.
+        
+        Si cambió el tamaño o la fecha pero no el contenido, actualiza la
+        huella y lo considera vigente.
+        
+        Args:
+            nombre_archivo: Nombre del PDF
+            ruta_archivo: Ruta completa del PDF
+        
+        Returns:
+            True si el PDF ya fue procesado con su contenido actual
+        """
+        entrada = self.archivos.get(nombre_archivo)
+        if entrada is None:
+            return False
+        
+        try:
+            estado = os.stat(ruta_archivo)
+            if entrada['tamano'] == estado.st_size and entrada['mtime_ns'] == estado.st_mtime_ns:
+                return True
+            if entrada['tamano'] != estado.st_size:
+                return False
+            if TextCache.calcular_hash(ruta_archivo) != entrada['hash']:
+                return False
+        except OSError:
+            return False
+        
+        entrada['mtime_ns'] = estado.st_mtime_ns
+        return True
+    
+    def registrar_archivo(self, nombre_archivo: str, ruta_archivo: str,
+                          coincidencias: Dict[str, List[int]],
+                          hash_contenido: Optional[str] = None) -> None:
+        """
+        Registra un PDF recién procesado con los textos encontrados en él.
+        
+        Args:
+            nombre_archivo: Nombre del PDF
+            ruta_archivo: Ruta completa del PDF
+            coincidencias: Diccionario {texto_busqueda: [páginas]} encontrado
+            hash_contenido: Hash del contenido ya calculado al extraerlo (ver
+                TextCache.hash_vigente). Si es None, se lee el PDF para calcularlo.
+        """
+        estado = os.stat(ruta_archivo)
+        self.archivos[nombre_archivo] = {
+            'tamano': estado.st_size,
+            'mtime_ns': estado.st_mtime_ns,
+            'hash': hash_contenido or TextCache.calcular_hash(ruta_archivo),
+            'coincidencias': dict(coincidencias),
+        }
+    
+    def agregar_coincidencias(self, nombre_archivo: str, coincidencias: Dict[str, List[int]]) -> None:
+        """
+        Agrega textos encontrados a un PDF ya registrado.
+        
+        Args:
+            nombre_archivo: Nombre del PDF
+            coincidencias: Diccionario {texto_busqueda: [páginas]} encontrado
+        """
+        self.archivos[nombre_archivo]['coincidencias'].update(coincidencias)
+    
+    def olvidar_archivo(self, nombre_archivo: str) -> None:
+        """Elimina un PDF del manifest para que se procese de nuevo."""
+        self.archivos.pop(nombre_archivo, None)
+    
+    def sincronizar(self, archivos: List[str], textos_busqueda: Iterable[str]) -> Set[str]:
+        """
+        Elimina los PDFs que ya no existen y actualiza el conjunto de textos.
+        
+        Args:
+            archivos: PDFs presentes actualmente en la carpeta
+            textos_busqueda: Textos que se buscan en esta ejecución
+        
+        Returns:
+            Textos nuevos que no se habían buscado en los PDFs registrados
+        """
+        presentes = set(archivos)
+        for nombre_archivo in list(self.archivos):
+            if nombre_archivo not in presentes:
+                del self.archivos[nombre_archivo]
+        
+        textos = set(textos_busqueda)
+        nuevos = textos - self.textos
+        retirados = self.textos - textos
+        if retirados:
+            for entrada in self.archivos.values():
+                for texto in retirados:
+                    entrada['coincidencias'].pop(texto, None)
+        
+        self.textos = textos
+        return nuevos
+    
+    def coincidencias(self, archivos: List[str],
+                      textos: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Obtiene los archivos y páginas donde aparece cada texto, en el orden indicado.
+        
+        Args:
+            archivos: PDFs en el orden en que se deben reportar
+            textos: Textos a reportar. Si es None, los del manifest.
+        
+        Returns:
+            Diccionario {texto_busqueda: {archivo: [páginas]}}
+        """
+        if textos is None:
+            textos = self.textos
+        encontrados: Dict[str, Dict[str, List[int]]] = {texto: {} for texto in textos}
+        for nombre_archivo in archivos:
+            entrada: Optional[dict] = self.archivos.get(nombre_archivo)
+            if entrada is None:
+                continue
+            for texto, paginas in entrada['coincidencias'].items():
+                if texto in encontrados:
+                    encontrados[texto][nombre_archivo] = paginas
+        return encontrados
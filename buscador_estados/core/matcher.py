@@ -0,0 +1,363 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from .normalizacion import SombraDigitos, normalizar_radicado
+
+# Texto en str o bytes UTF-8 (bytes, bytearray, memoryview o mmap)
+Texto = Union[str, bytes, bytearray, memoryview]
+
+# Cambios posteriores a la construcción (patrones agregados aparte o
+# retirados) que se toleran antes de reconstruir el autómata completo:
+# el mayor entre este mínimo y esta fracción de los patrones
+MIN_CAMBIOS_COMPACTACION = 1000
+FRACCION_COMPACTACION = 0.125
+
+
+class AhoCorasickMatcher:
+    """
+    Buscador multipatrón basado en un autómata Aho-Corasick.
+    
+    Permite encontrar todos los números de estado de un juzgado en una sola
+    pasada sobre el texto de cada PDF, en lugar de recorrer el texto una vez
+    por número.
+    
+    Construir el autómata de decenas de miles de patrones toma segundos, así
+    que una vez construido los cambios no lo reconstruyen: los patrones
+    agregados van a un autómata aparte, pequeño, que se recorre después, y
+    los retirados se filtran de las coincidencias. Cuando esos cambios
+    acumulados superan MIN_CAMBIOS_COMPACTACION y FRACCION_COMPACTACION de
+    los patrones, se reconstruye todo en la siguiente búsqueda.
+    """
+    
+    def __init__(self, patrones: Iterable[str] = ()):
+        """
+        Inicializa el autómata con los patrones indicados.
+        
+        Args:
+            patrones: Textos a buscar. Los vacíos se ignoran.
+        """
+        self._vaciar()
+        for patron in patrones:
+            self.agregar_patron(patron)
+    
+    def _vaciar(self) -> None:
+        """Deja el autómata sin patrones."""
+        self._transiciones: List[Dict[str, int]] = [{}]
+        self._fallos: List[int] = [0]
+        self._propios: List[List[str]] = [[]]
+        self._salidas: List[List[str]] = [[]]
+        self._patrones: Set[str] = set()
+        self._alfabeto: Set[str] = set()
+        self._retirados: Set[str] = set()
+        self._agregados: Optional[AhoCorasickMatcher] = None
+        self._segmento_regex = None
+        self._segmento_regex_bytes = None
+        self._construido = False
+    
+    def __len__(self) -> int:
+        return len(self._patrones)
+    
+    def __contains__(self, patron: str) -> bool:
+        return patron in self._patrones
+    
+    @property
+    def patrones(self) -> Set[str]:
+        """Patrones registrados en el autómata."""
+        return set(self._patrones)
+    
+    def agregar_patron(self, patron: str) -> None:
+        """
+        Agrega un patrón al autómata.
+        
+        Args:
+            patron: Texto a buscar
+        """
+        if not patron or patron in self._patrones:
+            return
+        self._patrones.add(patron)
+        
+        if patron in self._retirados:
+            # Sigue en las salidas del autómata construido; basta con no filtrarlo
+            self._retirados.discard(patron)
+            self._propios[self._nodo(patron)].append(patron)
+            return
+        if self._construido:
+            # Agregarlo al trie obligaría a recalcular todos los enlaces de fallo
+            if self._agregados is None:
+                self._agregados = AhoCorasickMatcher()
+            self._agregados.agregar_patron(patron)
+            self._compactar_si_conviene()
+            return
+        
+        nodo = 0
+        for caracter in patron:
+            siguiente = self._transiciones[nodo].get(caracter)
+            if siguiente is None:
+                siguiente = len(self._transiciones)
+                self._transiciones.append({})
+                self._fallos.append(0)
+                self._propios.append([])
+                self._transiciones[nodo][caracter] = siguiente
+            nodo = siguiente
+        
+        self._propios[nodo].append(patron)
+        self._alfabeto.update(patron)
+        self._construido = False
+    
+    def quitar_patron(self, patron: str) -> None:
+        """
+        Retira un patrón del autómata.
+        
+        Args:
+            patron: Texto que se deja de buscar
+        """
+        if patron not in self._patrones:
+            return
+        self._patrones.discard(patron)
+        
+        if self._agregados is not None and patron in self._agregados:
+            self._agregados.quitar_patron(patron)
+            return
+        self._propios[self._nodo(patron)].remove(patron)
+        if self._construido:
+            self._retirados.add(patron)
+            self._compactar_si_conviene()
+    
+    def _nodo(self, patron: str) -> int:
+        """Nodo del trie donde termina un patrón ya insertado."""
+        nodo = 0
+        for caracter in patron:
+            nodo = self._transiciones[nodo][caracter]
+        return nodo
+    
+    def _compactar_si_conviene(self) -> None:
+        """Reinicia el autómata con los patrones vigentes si acumuló demasiados cambios."""
+        cambios = len(self._retirados) + (len(self._agregados) if self._agregados is not None else 0)
+        if cambios > max(MIN_CAMBIOS_COMPACTACION, len(self._patrones) * FRACCION_COMPACTACION):
+            patrones = self._patrones
+            self._vaciar()
+            for patron in patrones:
+                self.agregar_patron(patron)
+    
+    def _construir(self) -> None:
+        """Calcula los enlaces de fallo y las salidas de cada nodo (BFS)."""
+        self._salidas = [list(propios) for propios in self._propios]
+        self._retirados.clear()
+        self._fallos = [0] * len(self._transiciones)
+        
+        cola = deque()
+        for hijo in self._transiciones[0].values():
+            cola.append(hijo)
+        
+        while cola:
+            nodo = cola.popleft()
+            for caracter, hijo in self._transiciones[nodo].items():
+                cola.append(hijo)
+                
+                fallo = self._fallos[nodo]
+                while fallo and caracter not in self._transiciones[fallo]:
+                    fallo = self._fallos[fallo]
+                destino = self._transiciones[fallo].get(caracter, 0)
+                self._fallos[hijo] = destino if destino != hijo else 0
+                
+                if self._salidas[self._fallos[hijo]]:
+                    self._salidas[hijo] = self._salidas[hijo] + self._salidas[self._fallos[hijo]]
+        
+        # Los caracteres fuera del alfabeto siempre regresan a la raíz, así que
+        # solo se recorren los segmentos formados por caracteres del alfabeto.
+        clase = ''.join(re.escape(c) for c in sorted(self._alfabeto))
+        self._segmento_regex = re.compile(f'[{clase}]+') if clase else None
+        # Para textos en UTF-8 se usan los bytes de esos caracteres. Un segmento
+        # puede incluir bytes de caracteres ajenos que comparten bytes de
+        # continuación; al decodificarlo quedan fuera del alfabeto y el
+        # autómata regresa a la raíz igual que con el texto en str.
+        bytes_alfabeto = sorted({byte for caracter in self._alfabeto for byte in caracter.encode('utf-8')})
+        clase_bytes = b''.join(re.escape(bytes([byte])) for byte in bytes_alfabeto)
+        self._segmento_regex_bytes = re.compile(b'[' + clase_bytes + b']+') if clase_bytes else None
+        self._construido = True
+    
+    def iter_coincidencias(self, texto: Texto, inicio: int = 0,
+                           fin: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """
+        Recorre el texto una sola vez y genera cada coincidencia.
+        
+        Args:
+            texto: Texto donde buscar, en str o en bytes UTF-8 (por ejemplo un
+                mmap, que se recorre sin copiarlo completo)
+            inicio: Posición desde donde buscar
+            fin: Posición final exclusiva. Si es None, hasta el final.
+        
+        Yields:
+            Tuplas (posición final exclusiva, patrón encontrado). En textos en
+            bytes la posición se cuenta en bytes hasta el inicio del segmento
+            y en caracteres dentro de él. Los patrones agregados después de
+            construir el autómata se entregan al final.
+        """
+        if not self._construido:
+            self._construir()
+        
+        es_str = isinstance(texto, str)
+        regex = self._segmento_regex if es_str else self._segmento_regex_bytes
+        if fin is None:
+            fin = len(texto)
+        
+        transiciones = self._transiciones
+        fallos = self._fallos
+        salidas = self._salidas
+        retirados = self._retirados
+        
+        for segmento in regex.finditer(texto, inicio, fin) if regex is not None else ():
+            nodo = 0
+            caracteres = segmento.group() if es_str else segmento.group().decode('utf-8', 'replace')
+            for indice, caracter in enumerate(caracteres, segmento.start() + 1):
+                while nodo and caracter not in transiciones[nodo]:
+                    nodo = fallos[nodo]
+                nodo = transiciones[nodo].get(caracter, 0)
+                for patron in salidas[nodo]:
+                    if patron not in retirados:
+                        yield indice, patron
+        
+        if self._agregados is not None and len(self._agregados):
+            yield from self._agregados.iter_coincidencias(texto, inicio, fin)
+    
+    def buscar(self, texto: Texto, inicio: int = 0, fin: Optional[int] = None) -> Set[str]:
+        """
+        Obtiene los patrones que aparecen en el texto.
+        
+        Args:
+            texto: Texto donde buscar, en str o en bytes UTF-8
+            inicio: Posición desde donde buscar
+            fin: Posición final exclusiva. Si es None, hasta el final.
+        
+        Returns:
+            Conjunto de patrones encontrados
+        """
+        encontrados = set()
+        for _, patron in self.iter_coincidencias(texto, inicio, fin):
+            encontrados.add(patron)
+            if len(encontrados) == len(self._patrones):
+                break
+        return encontrados
+
+
+class MatcherNormalizado:
+    """
+    Buscador que tolera el formato con el que las gacetas imprimen los radicados.
+    
+    Los textos que son radicados (23 dígitos con o sin separadores) se buscan
+    con un autómata sobre la SombraDigitos de cada texto, así que se
+    encuentran aunque aparezcan con guiones, espacios o saltos de línea
+    distintos; el resto se busca literalmente. Cada recorrido es de una sola
+    pasada y se entregan los textos tal como se registraron.
+    """
+    
+    def __init__(self, patrones: Iterable[str] = ()):
+        """
+        Inicializa el buscador con los patrones indicados.
+        
+        Args:
+            patrones: Textos a buscar. Los vacíos se ignoran.
+        """
+        self._literal = AhoCorasickMatcher()
+        self._radicados = AhoCorasickMatcher()
+        self._originales: Dict[str, List[str]] = {}
+        
+        for patron in patrones:
+            self.agregar_patron(patron)
+    
+    def __len__(self) -> int:
+        return len(self._literal) + sum(len(originales) for originales in self._originales.values())
+    
+    def __contains__(self, patron: str) -> bool:
+        digitos = normalizar_radicado(patron) if patron else None
+        if digitos is None:
+            return patron in self._literal
+        return patron in self._originales.get(digitos, ())
+    
+    @property
+    def patrones(self) -> Set[str]:
+        """Patrones registrados, tal como se agregaron."""
+        patrones = self._literal.patrones
+        for originales in self._originales.values():
+            patrones.update(originales)
+        return patrones
+    
+    def agregar_patron(self, patron: str) -> None:
+        """
+        Agrega un patrón; los radicados se registran normalizados a sus dígitos.
+        
+        Args:
+            patron: Texto a buscar
+        """
+        if not patron:
+            return
+        digitos = normalizar_radicado(patron)
+        if digitos is None:
+            self._literal.agregar_patron(patron)
+            return
+        originales = self._originales.setdefault(digitos, [])
+        if patron not in originales:
+            originales.append(patron)
+        self._radicados.agregar_patron(digitos)
+    
+    def quitar_patron(self, patron: str) -> None:
+        """
+        Retira un patrón; un radicado se deja de buscar cuando no queda
+        ninguna de sus formas registradas.
+        
+        Args:
+            patron: Texto que se deja de buscar
+        """
+        digitos = normalizar_radicado(patron) if patron else None
+        if digitos is None:
+            self._literal.quitar_patron(patron)
+            return
+        originales = self._originales.get(digitos)
+        if not originales or patron not in originales:
+            return
+        originales.remove(patron)
+        if not originales:
+            del self._originales[digitos]
+            self._radicados.quitar_patron(digitos)
+    
+    def buscar(self, texto: Texto, inicio: int = 0, fin: Optional[int] = None) -> Set[str]:
+        """
+        Obtiene los patrones que aparecen en el texto.
+        
+        Args:
+            texto: Texto donde buscar, en str o en bytes UTF-8
+            inicio: Posición desde donde buscar
+            fin: Posición final exclusiva. Si es None, hasta el final.
+        
+        Returns:
+            Conjunto de patrones encontrados, tal como se agregaron
+        """
+        encontrados = self._literal.buscar(texto, inicio, fin) if len(self._literal) else set()
+        if self._originales:
+            sombra = SombraDigitos(texto, inicio, fin)
+            for digitos in self._radicados.buscar(sombra.texto):
+                encontrados.update(self._originales[digitos])
+        return encontrados
+    
+    def fragmentos(self, texto: Texto, inicio: int = 0, fin: Optional[int] = None) -> Dict[str, str]:
+        """
+        Obtiene el texto original donde aparece cada radicado encontrado.
+        
+        Args:
+            texto: Texto donde buscar, en str o en bytes UTF-8
+            inicio: Posición desde donde buscar
+            fin: Posición final exclusiva. Si es None, hasta el final.
+        
+        Returns:
+            Diccionario {patrón: texto como aparece impreso} con la primera
+            aparición de cada radicado
+        """
+        fragmentos: Dict[str, str] = {}
+        if not self._originales:
+            return fragmentos
+        sombra = SombraDigitos(texto, inicio, fin)
+        for posicion, digitos in self._radicados.iter_coincidencias(sombra.texto):
+            for patron in self._originales[digitos]:
+                if patron not in fragmentos:
+                    fragmentos[patron] = sombra.fragmento_original(posicion, len(digitos))
+        return fragmentos
@@ -1,9 +1,10 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 from datetime import date
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EstadoProcesal:
     """Modelo para representar un estado procesal."""
     numero: str
@@ -11,28 +12,201 @@ class EstadoProcesal:
     id: Optional[str] = None
 
 
-@dataclass
+class EstadoSet(Sequence[EstadoProcesal]):
+    """
+    Colección compacta e inmutable de estados procesales.
+    
+    Los textos de todos los estados se guardan concatenados en un solo str
+    y sus límites en un array de enteros, así que decenas de miles de
+    estados ocupan unos pocos objetos en lugar de cuatro por estado. Cada
+    EstadoProcesal se crea al accederlo.
+    """
+    
+    __slots__ = ('_texto', '_limites', '_con_id')
+    
+    def __init__(self, estados: Iterable[EstadoProcesal] = ()):
+        """
+        Inicializa la colección.
+        
+        Args:
+            estados: Estados a guardar, en orden
+        """
+        partes: List[str] = []
+        limites = array('q', [0])
+        con_id = bytearray()
+        for estado in estados:
+            for valor in (estado.numero, estado.radicado, estado.id or ''):
+                partes.append(valor)
+                limites.append(limites[-1] + len(valor))
+            con_id.append(estado.id is not None)
+        self._texto = ''.join(partes)
+        self._limites = limites
+        self._con_id = bytes(con_id)
+    
+    def __len__(self) -> int:
+        return len(self._con_id)
+    
+    def __getitem__(self, indice: Union[int, slice]) -> Union[EstadoProcesal, List[EstadoProcesal]]:
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError('índice fuera de rango')
+        
+        texto = self._texto
+        limites = self._limites
+        base = indice * 3
+        return EstadoProcesal(
+            numero=texto[limites[base]:limites[base + 1]],
+            radicado=texto[limites[base + 1]:limites[base + 2]],
+            id=texto[limites[base + 2]:limites[base + 3]] if self._con_id[indice] else None
+        )
+    
+    def __iter__(self) -> Iterator[EstadoProcesal]:
+        for indice in range(len(self)):
+            yield self[indice]
+    
+    def __repr__(self) -> str:
+        return f"EstadoSet({len(self)} estados)"
+
+
+class TablaArchivos:
+    """
+    Tabla de los archivos de una ejecución, cada uno con un identificador entero.
+    
+    Los resultados de búsqueda guardan esos identificadores en lugar de
+    listas con los nombres de archivo.
+    """
+    
+    __slots__ = ('_nombres', '_ids')
+    
+    def __init__(self):
+        self._nombres: List[str] = []
+        self._ids: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self._nombres)
+    
+    def id_archivo(self, nombre: str) -> int:
+        """
+        Obtiene el identificador de un archivo, registrándolo si es nuevo.
+        
+        Args:
+            nombre: Nombre del archivo
+        
+        Returns:
+            Identificador entero del archivo en esta tabla
+        """
+        identificador = self._ids.get(nombre)
+        if identificador is None:
+            identificador = self._ids[nombre] = len(self._nombres)
+            self._nombres.append(nombre)
+        return identificador
+    
+    def nombre(self, identificador: int) -> str:
+        """Nombre del archivo con ese identificador."""
+        return self._nombres[identificador]
+
+
+@dataclass(frozen=True, slots=True, init=False)
 class ResultadoBusqueda:
-    """Modelo para representar el resultado de una búsqueda."""
+    """
+    Modelo para representar el resultado de una búsqueda.
+    
+    Los archivos se guardan como identificadores de una TablaArchivos
+    compartida por todos los resultados de la ejecución, con las páginas de
+    cada uno en el mismo orden. El constructor recibe los nombres de los
+    archivos, como antes de usar la tabla.
+    
+    Si el estado se encontró por su radicado, fragmento guarda cómo aparece
+    impreso en la gaceta (con sus guiones, espacios o saltos de línea).
+    """
     estado: EstadoProcesal
-    archivos_encontrados: List[str]
     fecha_busqueda: date
+    tabla_archivos: TablaArchivos = field(repr=False, compare=False)
+    ids_archivos: Tuple[int, ...]
+    paginas_archivos: Tuple[Tuple[int, ...], ...]
+    fragmento: Optional[str]
+    
+    def __init__(self, estado: EstadoProcesal, archivos_encontrados: Iterable[str], fecha_busqueda: date,
+                 paginas: Optional[Dict[str, List[int]]] = None,
+                 tabla_archivos: Optional[TablaArchivos] = None,
+                 fragmento: Optional[str] = None):
+        """
+        Crea un resultado a partir de los nombres de archivo.
+        
+        Args:
+            estado: Estado procesal buscado
+            archivos_encontrados: Archivos donde se encontró
+            fecha_busqueda: Fecha de la búsqueda
+            paginas: Páginas donde se encontró en cada archivo, si se conocen
+            tabla_archivos: Tabla de la ejecución. Si es None, se crea una
+                solo para este resultado.
+            fragmento: Texto original donde se encontró el radicado
+        """
+        if tabla_archivos is None:
+            tabla_archivos = TablaArchivos()
+        paginas = paginas or {}
+        archivos = list(archivos_encontrados)
+        # Es inmutable: los campos se asignan sin pasar por __setattr__
+        object.__setattr__(self, 'estado', estado)
+        object.__setattr__(self, 'fecha_busqueda', fecha_busqueda)
+        object.__setattr__(self, 'tabla_archivos', tabla_archivos)
+        object.__setattr__(self, 'ids_archivos',
+                           tuple(tabla_archivos.id_archivo(archivo) for archivo in archivos))
+        object.__setattr__(self, 'paginas_archivos',
+                           tuple(tuple(paginas.get(archivo, ())) for archivo in archivos))
+        object.__setattr__(self, 'fragmento', fragmento)
+    
+    @property
+    def archivos_encontrados(self) -> List[str]:
+        """Nombres de los archivos donde se encontró el estado."""
+        return [self.tabla_archivos.nombre(identificador) for identificador in self.ids_archivos]
+    
+    @property
+    def paginas(self) -> Dict[str, List[int]]:
+        """Páginas donde se encontró el estado, por archivo (solo las conocidas)."""
+        return {
+            archivo: list(paginas)
+            for archivo, paginas in self.iter_archivos() if paginas
+        }
+    
+    def iter_archivos(self) -> Iterator[Tuple[str, Tuple[int, ...]]]:
+        """
+        Recorre los archivos donde se encontró el estado.
+        
+        Yields:
+            Tuplas (nombre del archivo, páginas; vacía si no se conocen)
+        """
+        for identificador, paginas in zip(self.ids_archivos, self.paginas_archivos):
+            yield self.tabla_archivos.nombre(identificador), paginas
     
     @property
     def encontrado(self) -> bool:
         """Indica si se encontró el estado en algún archivo."""
-        return len(self.archivos_encontrados) > 0
+        return len(self.ids_archivos) > 0
     
     def __str__(self) -> str:
         """Representación en string del resultado."""
         if self.encontrado:
-            archivos = ", ".join(self.archivos_encontrados)
+            archivos = ", ".join(
+                self._describir_archivo(archivo, paginas) for archivo, paginas in self.iter_archivos()
+            )
             return (f"Se encontró el numero {self.estado.numero} "
                    f"con radicado {self.estado.radicado} "
                    f"en los archivos: {archivos}")
         else:
             return (f"No se encontró el número {self.estado.numero} "
                    f"con radicado {self.estado.radicado} en ningún archivo.")
+    
+    @staticmethod
+    def _describir_archivo(archivo: str, paginas: Sequence[int]) -> str:
+        """Nombre del archivo seguido de las páginas donde se encontró, si se conocen."""
+        if not paginas:
+            return archivo
+        etiqueta = "pág." if len(paginas) == 1 else "págs."
+        return f"{archivo} ({etiqueta} {', '.join(str(p) for p in paginas)})"
 
 
 @dataclass
@@ -0,0 +1,122 @@
+import re
+from array import array
+from bisect import bisect_right
+from typing import Optional, Union
+
+LONGITUD_RADICADO = 23
+
+# Secuencias de dígitos que pueden traer separadores de formato entre ellos
+RE_SECUENCIA_DIGITOS = re.compile(r'\d(?:[\s\-–—.]{0,3}\d)*')
+# La misma secuencia sobre texto en UTF-8 (guiones largos y espacio de no separación)
+_RE_SECUENCIA_DIGITOS_BYTES = re.compile(
+    rb'\d(?:(?:[\s\-.]|\xe2\x80[\x93\x94]|\xc2\xa0){0,3}\d)*'
+)
+_RE_NO_DIGITO = re.compile(r'\D')
+_RE_NO_DIGITO_BYTES = re.compile(rb'\D')
+_RE_SOLO_FORMATO = re.compile(r'[\d\s\-–—.]+')
+
+# Separa en la sombra las secuencias que no son contiguas en el texto
+SEPARADOR_SOMBRA = '|'
+
+
+def normalizar_radicado(texto: str) -> Optional[str]:
+    """
+    Normaliza un radicado a sus 23 dígitos.
+    
+    Args:
+        texto: Radicado con o sin separadores (guiones, espacios, puntos)
+    
+    Returns:
+        Los 23 dígitos del radicado, o None si el texto no es un radicado
+    """
+    if not _RE_SOLO_FORMATO.fullmatch(texto):
+        return None
+    digitos = _RE_NO_DIGITO.sub('', texto)
+    return digitos if len(digitos) == LONGITUD_RADICADO else None
+
+
+class SombraDigitos:
+    """
+    Versión de solo dígitos de un texto, con el mapa de regreso al original.
+    
+    Cada secuencia de dígitos del texto, con los separadores de formato que
+    traiga (guiones, espacios, saltos de línea), se reduce a sus dígitos; las
+    secuencias se unen con SEPARADOR_SOMBRA. Así un radicado impreso como
+    "52001-31-03-001-2025 - 00042-00", o partido por un salto de línea,
+    aparece en la sombra como sus 23 dígitos seguidos y se puede buscar en
+    una sola pasada.
+    """
+    
+    __slots__ = ('texto', 'origen', '_inicios_sombra', '_inicios', '_finales')
+    
+    def __init__(self, texto: Union[str, bytes, bytearray, memoryview], inicio: int = 0,
+                 fin: Optional[int] = None, min_digitos: int = LONGITUD_RADICADO):
+        """
+        Construye la sombra de un texto.
+        
+        Args:
+            texto: Texto original, en str o en bytes UTF-8 (por ejemplo un mmap)
+            inicio: Posición desde donde se toma el texto
+            fin: Posición final exclusiva. Si es None, hasta el final.
+            min_digitos: Las secuencias con menos dígitos no pueden contener
+                los patrones buscados y se omiten
+        """
+        es_str = isinstance(texto, str)
+        regex = RE_SECUENCIA_DIGITOS if es_str else _RE_SECUENCIA_DIGITOS_BYTES
+        no_digito = _RE_NO_DIGITO if es_str else _RE_NO_DIGITO_BYTES
+        vacio = '' if es_str else b''
+        if fin is None:
+            fin = len(texto)
+        
+        partes = []
+        inicios_sombra = array('q')
+        inicios = array('q')
+        finales = array('q')
+        longitud = 0
+        for secuencia in regex.finditer(texto, inicio, fin):
+            digitos = no_digito.sub(vacio, secuencia.group())
+            if len(digitos) < min_digitos:
+                continue
+            if not es_str:
+                digitos = digitos.decode('ascii')
+            inicios_sombra.append(longitud)
+            inicios.append(secuencia.start())
+            finales.append(secuencia.end())
+            partes.append(digitos)
+            longitud += len(digitos) + 1
+        
+        self.texto = SEPARADOR_SOMBRA.join(partes)
+        self.origen = texto
+        self._inicios_sombra = inicios_sombra
+        self._inicios = inicios
+        self._finales = finales
+    
+    def fragmento_original(self, fin_sombra: int, longitud: int) -> str:
+        """
+        Obtiene el texto original que corresponde a una coincidencia en la sombra.
+        
+        Args:
+            fin_sombra: Posición final exclusiva de la coincidencia en la sombra
+            longitud: Número de dígitos de la coincidencia
+        
+        Returns:
+            Texto original desde el primer hasta el último dígito de la coincidencia
+        """
+        secuencia = bisect_right(self._inicios_sombra, fin_sombra - longitud) - 1
+        primero = fin_sombra - longitud - self._inicios_sombra[secuencia]
+        texto = self.origen[self._inicios[secuencia]:self._finales[secuencia]]
+        if not isinstance(texto, str):
+            texto = bytes(texto).decode('utf-8', 'replace')
+        
+        # Se recorre la secuencia original contando dígitos hasta cubrir la coincidencia
+        inicio_original = None
+        vistos = 0
+        for posicion, caracter in enumerate(texto):
+            if not caracter.isdecimal():
+                continue
+            if vistos == primero:
+                inicio_original = posicion
+            vistos += 1
+            if vistos == primero + longitud:
+                return texto[inicio_original:posicion + 1]
+        return texto[inicio_original or 0:]
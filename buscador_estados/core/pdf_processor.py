@@ -1,22 +1,270 @@
+import multiprocessing
 import os
-import pdfplumber
-from typing import List, Optional
+import re
+import time
+from concurrent.futures import Executor, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from .manifest import ManifestRevision
+from .matcher import AhoCorasickMatcher, MatcherNormalizado
+from .pdf_raw import extraer_paginas as _extraer_paginas_flujos
+from .text_cache import SEPARADOR_PAGINA, FragmentoCorpus, TextCache
 from ..utils.logger import get_logger
+from ..utils.metricas import Metricas
 
 logger = get_logger(__name__)
 
+# Texto de un PDF como str o como fragmento del corpus de la caché
+TextoPDF = Union[str, FragmentoCorpus]
+
+Matcher = Union[AhoCorasickMatcher, MatcherNormalizado]
+
+_SEPARADOR_PAGINA_BYTES = SEPARADOR_PAGINA.encode('utf-8')
+
+_RE_DIGITO = re.compile(r'\d')
+
+
+def dividir_paginas(contenido: str) -> List[str]:
+    """
+    Divide el texto extraído de un PDF en el texto de cada página.
+    
+    Args:
+        contenido: Texto extraído con extract_text_from_pdf
+        
+    Returns:
+        Lista con el texto de cada página; la posición 0 es la página 1
+    """
+    return contenido.split(SEPARADOR_PAGINA)
+
+
+def rangos_paginas(fragmento: FragmentoCorpus) -> Iterator[Tuple[int, int, int]]:
+    """
+    Ubica cada página de un fragmento del corpus sin decodificarlo.
+    
+    Args:
+        fragmento: Texto de un PDF en el corpus de la caché
+        
+    Yields:
+        Tuplas (número de página desde 1, byte inicial, byte final exclusivo)
+    """
+    datos, posicion, fin = fragmento.datos, fragmento.inicio, fragmento.fin
+    for numero_pagina in range(1, fragmento.paginas + 1):
+        final_pagina = datos.find(_SEPARADOR_PAGINA_BYTES, posicion, fin)
+        if final_pagina == -1:
+            final_pagina = fin
+        yield numero_pagina, posicion, final_pagina
+        posicion = final_pagina + 1
+
+
+def buscar_por_pagina(matcher: Matcher, contenido: TextoPDF) -> Dict[str, List[int]]:
+    """
+    Busca los patrones de un matcher en cada página de un texto extraído.
+    
+    Args:
+        matcher: Matcher con los textos a buscar
+        contenido: Texto extraído con extract_text_from_pdf, o su fragmento
+            del corpus de la caché, que se recorre sin decodificarlo
+        
+    Returns:
+        Diccionario {texto_busqueda: [páginas donde aparece]}
+    """
+    paginas: Dict[str, List[int]] = {}
+    if isinstance(contenido, FragmentoCorpus):
+        for numero_pagina, inicio, fin in rangos_paginas(contenido):
+            for texto_busqueda in matcher.buscar(contenido.datos, inicio, fin):
+                paginas.setdefault(texto_busqueda, []).append(numero_pagina)
+        return paginas
+    
+    for numero_pagina, texto_pagina in enumerate(dividir_paginas(contenido), 1):
+        for texto_busqueda in matcher.buscar(texto_pagina):
+            paginas.setdefault(texto_busqueda, []).append(numero_pagina)
+    return paginas
+
+
+class ExtractorTexto:
+    """
+    Interfaz de los backends de extracción de texto de PDFs.
+    
+    Cada backend entrega el texto página por página; extraer_texto lo une
+    con SEPARADOR_PAGINA en el formato que usan la caché y la búsqueda.
+    """
+    
+    nombre = ''
+    
+    def extraer_paginas(self, ruta_archivo: str) -> Iterator[str]:
+        """
+        Extrae el texto de cada página de un PDF a medida que se pide.
+        
+        Args:
+            ruta_archivo: Ruta completa del PDF
+            
+        Yields:
+            Texto de cada página en orden
+        """
+        raise NotImplementedError
+    
+    def extraer_texto(self, ruta_archivo: str) -> str:
+        """
+        Extrae todo el texto de un PDF.
+        
+        Args:
+            ruta_archivo: Ruta completa del PDF
+            
+        Returns:
+            Texto extraído del PDF, con las páginas unidas por SEPARADOR_PAGINA
+        """
+        return SEPARADOR_PAGINA.join(texto + "\n" for texto in self.extraer_paginas(ruta_archivo))
+
+
+class ExtractorPdfplumber(ExtractorTexto):
+    """Extracción con pdfplumber, que reconstruye el texto a partir de cada carácter."""
+    
+    nombre = 'pdfplumber'
+    
+    def extraer_paginas(self, ruta_archivo: str) -> Iterator[str]:
+        # pdfplumber tarda en importarse; solo se carga al extraer con este backend
+        import pdfplumber
+        
+        with pdfplumber.open(ruta_archivo) as pdf:
+            for pagina in pdf.pages:
+                yield pagina.extract_text() or ""
+
+
+class ExtractorFlujos(ExtractorTexto):
+    """
+    Extracción rápida que lee directamente los content streams del PDF.
+    
+    No calcula la geometría de cada carácter, así que es varias veces más
+    rápida que pdfplumber, pero no entiende fuentes sin ToUnicode con
+    codificaciones propias ni PDFs escaneados.
+    """
+    
+    nombre = 'flujos'
+    
+    def extraer_paginas(self, ruta_archivo: str) -> Iterator[str]:
+        return _extraer_paginas_flujos(ruta_archivo)
+
+
+class ExtractorAutomatico(ExtractorTexto):
+    """
+    Usa la extracción rápida y recurre a pdfplumber por archivo cuando el
+    resultado no contiene ningún dígito (o falla), ya que los textos que se
+    buscan son números de proceso.
+    """
+    
+    nombre = 'auto'
+    
+    def __init__(self):
+        self.rapido = ExtractorFlujos()
+        self.respaldo = ExtractorPdfplumber()
+    
+    def extraer_paginas(self, ruta_archivo: str) -> Iterator[str]:
+        try:
+            paginas = list(self.rapido.extraer_paginas(ruta_archivo))
+        except Exception as e:
+            logger.debug(f"Extracción rápida fallida en {os.path.basename(ruta_archivo)}: {e}")
+            paginas = []
+        
+        if any(_RE_DIGITO.search(pagina) for pagina in paginas):
+            return iter(paginas)
+        
+        logger.debug(f"Usando pdfplumber para {os.path.basename(ruta_archivo)}")
+        return self.respaldo.extraer_paginas(ruta_archivo)
+
+
+EXTRACTORES = {
+    ExtractorPdfplumber.nombre: ExtractorPdfplumber,
+    ExtractorFlujos.nombre: ExtractorFlujos,
+    ExtractorAutomatico.nombre: ExtractorAutomatico,
+}
+
+
+def obtener_extractor(nombre: str) -> ExtractorTexto:
+    """
+    Crea el backend de extracción con el nombre indicado.
+    
+    Args:
+        nombre: Nombre del backend (pdfplumber, flujos o auto)
+        
+    Returns:
+        Instancia del backend
+    """
+    if nombre not in EXTRACTORES:
+        raise ValueError(f"Backend de extracción desconocido: {nombre}. "
+                         f"Opciones: {', '.join(sorted(EXTRACTORES))}")
+    return EXTRACTORES[nombre]()
+
+
+def _extraer_texto(ruta_archivo: str,
+                   nombre_extractor: str = ExtractorPdfplumber.nombre) -> Tuple[str, float]:
+    """
+    Extrae todo el texto de un PDF con el backend indicado.
+    
+    Es una función de módulo para poder ejecutarse en procesos de trabajo;
+    devuelve también la duración medida en el proceso que extrajo el PDF.
+    El texto vuelve completo al proceso principal, que es el único que
+    escribe el corpus de la caché (ver TextCache): anexar desde los
+    procesos de trabajo exigiría coordinar entre procesos la tabla de
+    desplazamientos, el desalojo y la compactación. Como mucho hay
+    2 * workers textos en tránsito (ver _extraer_en_paralelo).
+    
+    Args:
+        ruta_archivo: Ruta completa del PDF
+        nombre_extractor: Nombre del backend de extracción
+        
+    Returns:
+        Tupla (texto extraído con las páginas unidas por SEPARADOR_PAGINA,
+        segundos de extracción)
+    """
+    inicio = time.perf_counter()
+    contenido = obtener_extractor(nombre_extractor).extraer_texto(ruta_archivo)
+    return contenido, time.perf_counter() - inicio
+
+
+def crear_pool_extraccion(workers: int) -> ProcessPoolExecutor:
+    """
+    Crea un pool de procesos para extraer PDFs.
+    
+    Los procesos se crean a demanda, cuando ya corren otros hilos (la
+    precarga de estados, los demás juzgados); con fork un proceso podría
+    heredar un lock tomado, como el del logging, y quedarse bloqueado. Por
+    eso se usa forkserver donde existe y spawn en los demás sistemas.
+    
+    Args:
+        workers: Número de procesos
+    
+    Returns:
+        Pool de procesos
+    """
+    metodo = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(metodo))
+
 
 class PDFProcessor:
     """Procesador de archivos PDF para búsqueda de texto."""
     
-    def __init__(self, carpeta_pdf: str):
+    def __init__(self, carpeta_pdf: str, cache: Optional[TextCache] = None,
+                 workers: int = 1, executor: Optional[Executor] = None,
+                 extractor: str = ExtractorPdfplumber.nombre,
+                 metricas: Optional[Metricas] = None):
         """
         Inicializa el procesador con la carpeta de PDFs.
         
         Args:
             carpeta_pdf: Ruta a la carpeta que contiene los PDFs
+            cache: Caché opcional del texto extraído de los PDFs
+            workers: Número de procesos para extraer PDFs en paralelo
+            executor: Executor compartido para la extracción. Si se indica,
+                se usa en lugar de crear un pool propio.
+            extractor: Nombre del backend de extracción de texto
+            metricas: Métricas donde registrar los tiempos de listado,
+                extracción y búsqueda
         """
         self.carpeta_pdf = carpeta_pdf
+        self.extractor = obtener_extractor(extractor)
+        self.metricas = metricas or Metricas(os.path.basename(os.path.dirname(carpeta_pdf)))
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.executor = executor
         self._validar_carpeta()
     
     def _validar_carpeta(self) -> None:
@@ -35,42 +283,300 @@ class PDFProcessor:
             Lista de nombres de archivos PDF
         """
         try:
-            archivos = [
-                archivo for archivo in os.listdir(self.carpeta_pdf)
-                if archivo.lower().endswith('.pdf')
-            ]
+            with self.metricas.medir('listar_pdfs'):
+                archivos = [
+                    archivo for archivo in os.listdir(self.carpeta_pdf)
+                    if archivo.lower().endswith('.pdf')
+                ]
             logger.info(f"Encontrados {len(archivos)} archivos PDF en {self.carpeta_pdf}")
             return archivos
         except Exception as e:
             logger.error(f"Error listando archivos PDF: {e}")
             return []
     
-    def extract_text_from_pdf(self, nombre_archivo: str) -> Optional[str]:
+    def _obtener_de_cache(self, nombre_archivo: str, fragmento: bool = False,
+                          registrar: bool = True) -> Optional[TextoPDF]:
+        """
+        Obtiene el texto de un PDF desde la caché y registra el acierto.
+        
+        Con fragmento=True se entrega su ubicación en el corpus mapeado en
+        memoria en lugar del texto decodificado; con registrar=False el
+        acierto no se cuenta en las métricas.
+        """
+        if self.cache is None:
+            return None
+        
+        ruta_archivo = os.path.join(self.carpeta_pdf, nombre_archivo)
+        inicio = time.perf_counter()
+        encontrado = self.cache.obtener_fragmento(ruta_archivo, self.extractor.nombre)
+        if encontrado is None:
+            return None
+        contenido = encontrado if fragmento else encontrado.texto()
+        if not registrar:
+            return contenido
+        self.metricas.registrar_archivo(
+            nombre_archivo, self._tamano_archivo(ruta_archivo),
+            encontrado.paginas, time.perf_counter() - inicio, 'cache'
+        )
+        return contenido
+    
+    def _registrar_extraccion(self, nombre_archivo: str, contenido: str, segundos: float) -> None:
+        """Registra en las métricas un PDF extraído."""
+        paginas = contenido.count(SEPARADOR_PAGINA) + 1 if contenido else 0
+        ruta_archivo = os.path.join(self.carpeta_pdf, nombre_archivo)
+        self.metricas.registrar_archivo(
+            nombre_archivo, self._tamano_archivo(ruta_archivo), paginas, segundos, 'extraccion'
+        )
+    
+    def hash_contenido(self, nombre_archivo: str) -> Optional[str]:
+        """
+        Hash del contenido actual de un PDF tomado de la caché, que ya lo
+        calculó al extraerlo; None si no hay caché o no se puede leer.
+        """
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.hash_vigente(os.path.join(self.carpeta_pdf, nombre_archivo))
+        except OSError:
+            return None
+    
+    @staticmethod
+    def _tamano_archivo(ruta_archivo: str) -> int:
+        """Tamaño de un archivo, 0 si no se puede leer."""
+        try:
+            return os.path.getsize(ruta_archivo)
+        except OSError:
+            return 0
+    
+    def _buscar(self, matcher: Matcher, contenido: TextoPDF) -> Dict[str, List[int]]:
+        """Busca por página midiendo el tiempo de la búsqueda."""
+        with self.metricas.medir('busqueda'):
+            return buscar_por_pagina(matcher, contenido)
+    
+    def fragmento_original(self, nombre_archivo: str, pagina: int, texto_busqueda: str) -> Optional[str]:
+        """
+        Obtiene cómo aparece impreso un radicado en una página, desde la caché.
+        
+        Args:
+            nombre_archivo: Nombre del archivo PDF
+            pagina: Número de página desde 1 donde se encontró
+            texto_busqueda: Radicado buscado
+            
+        Returns:
+            Texto original del radicado en la página, o None si el PDF no
+            está en la caché o el texto buscado no es un radicado
+        """
+        if self.cache is None:
+            return None
+        fragmento = self.cache.obtener_fragmento(
+            os.path.join(self.carpeta_pdf, nombre_archivo), self.extractor.nombre
+        )
+        if fragmento is None:
+            return None
+        
+        for numero_pagina, inicio, fin in rangos_paginas(fragmento):
+            if numero_pagina == pagina:
+                matcher = MatcherNormalizado([texto_busqueda])
+                return matcher.fragmentos(fragmento.datos, inicio, fin).get(texto_busqueda)
+        return None
+    
+    def extract_text_from_pdf(self, nombre_archivo: str, registrar: bool = True) -> Optional[str]:
         """
         Extrae todo el texto de un archivo PDF.
         
         Args:
             nombre_archivo: Nombre del archivo PDF
+            registrar: Si es False, la extracción no se cuenta en las métricas
             
         Returns:
-            Texto extraído del PDF o None si hay error
+            Texto extraído del PDF, con las páginas separadas por
+            SEPARADOR_PAGINA, o None si hay error
         """
         ruta_archivo = os.path.join(self.carpeta_pdf, nombre_archivo)
         
+        contenido = self._obtener_de_cache(nombre_archivo, registrar=registrar)
+        if contenido is not None:
+            return contenido
+        
+        inicio = time.perf_counter()
+        try:
+            contenido = self.extractor.extraer_texto(ruta_archivo)
+            logger.debug(f"Texto extraído de {nombre_archivo}: {len(contenido)} caracteres")
+        except Exception as e:
+            logger.error(f"Error extrayendo texto de {nombre_archivo}: {e}")
+            if registrar:
+                self.metricas.incrementar('pdfs_con_error')
+            return None
+        if registrar:
+            self._registrar_extraccion(nombre_archivo, contenido, time.perf_counter() - inicio)
+        
+        if self.cache is not None:
+            self.cache.guardar(ruta_archivo, contenido, self.extractor.nombre)
+        return contenido
+    
+    def iter_texts(self, archivos: Optional[Iterable[str]] = None, fragmentos: bool = False,
+                   registrar: bool = True) -> Iterator[Tuple[str, Optional[TextoPDF]]]:
+        """
+        Extrae el texto de varios PDFs y lo entrega a medida que está listo.
+        
+        Los textos en caché se entregan primero. El resto se extrae en
+        paralelo cuando hay más de un worker o un executor compartido,
+        manteniendo como máximo dos archivos en vuelo por worker para
+        acotar la memoria, y se entregan en orden de finalización.
+        
+        Args:
+            archivos: Nombres de los PDFs. Si es None, todos los de la carpeta.
+            fragmentos: Si es True, los textos en caché se entregan como
+                FragmentoCorpus (para buscar_por_pagina) sin decodificarlos
+            registrar: Si es False, los PDFs no se cuentan en las métricas,
+                por ejemplo al releerlos para el índice tras la búsqueda
+            
+        Yields:
+            Tuplas (nombre_archivo, texto o None si hubo error)
+        """
+        if archivos is None:
+            archivos = self.get_pdf_files()
+        
+        pendientes = []
+        for archivo in archivos:
+            contenido = self._obtener_de_cache(archivo, fragmentos, registrar)
+            if contenido is not None:
+                yield archivo, contenido
+            else:
+                pendientes.append(archivo)
+        
+        if not pendientes:
+            return
+        
+        if self.executor is None and self.workers <= 1:
+            for archivo in pendientes:
+                yield archivo, self.extract_text_from_pdf(archivo, registrar)
+            return
+        
+        executor = self.executor or crear_pool_extraccion(self.workers)
         try:
-            with pdfplumber.open(ruta_archivo) as pdf:
-                contenido = ""
-                for pagina in pdf.pages:
-                    texto_pagina = pagina.extract_text()
-                    if texto_pagina:
-                        contenido += texto_pagina + "\n"
+            yield from self._extraer_en_paralelo(executor, pendientes, registrar)
+        finally:
+            if executor is not self.executor:
+                executor.shutdown(cancel_futures=True)
+    
+    def _extraer_en_paralelo(self, executor: Executor, archivos: List[str],
+                             registrar: bool = True) -> Iterator[Tuple[str, Optional[str]]]:
+        """Extrae los PDFs en el executor con un número acotado de tareas en vuelo."""
+        max_en_vuelo = self.workers * 2
+        restantes = iter(archivos)
+        en_vuelo = {}
+        
+        def enviar_siguiente() -> None:
+            archivo = next(restantes, None)
+            if archivo is not None:
+                ruta_archivo = os.path.join(self.carpeta_pdf, archivo)
+                futuro = executor.submit(_extraer_texto, ruta_archivo, self.extractor.nombre)
+                en_vuelo[futuro] = archivo
+        
+        for _ in range(max_en_vuelo):
+            enviar_siguiente()
+        
+        while en_vuelo:
+            terminados, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                archivo = en_vuelo.pop(futuro)
+                enviar_siguiente()
                 
-                logger.debug(f"Texto extraído de {nombre_archivo}: {len(contenido)} caracteres")
-                return contenido
+                try:
+                    contenido, segundos = futuro.result()
+                    logger.debug(f"Texto extraído de {archivo}: {len(contenido)} caracteres")
+                except Exception as e:
+                    logger.error(f"Error extrayendo texto de {archivo}: {e}")
+                    if registrar:
+                        self.metricas.incrementar('pdfs_con_error')
+                    yield archivo, None
+                    continue
+                if registrar:
+                    self._registrar_extraccion(archivo, contenido, segundos)
                 
+                if self.cache is not None:
+                    self.cache.guardar(os.path.join(self.carpeta_pdf, archivo), contenido,
+                                       self.extractor.nombre)
+                yield archivo, contenido
+    
+    def iter_pages(self, nombre_archivo: str) -> Iterator[Tuple[int, str]]:
+        """
+        Entrega el texto de un PDF página por página, extrayéndolas a medida
+        que se piden.
+        
+        Si quien consume el iterador se detiene antes de la última página, el
+        resto del PDF no se procesa. Solo un PDF leído completo se guarda en
+        la caché.
+        
+        Args:
+            nombre_archivo: Nombre del archivo PDF
+            
+        Yields:
+            Tuplas (número de página desde 1, texto de la página)
+        """
+        ruta_archivo = os.path.join(self.carpeta_pdf, nombre_archivo)
+        
+        contenido = self._obtener_de_cache(nombre_archivo)
+        if contenido is not None:
+            yield from enumerate(dividir_paginas(contenido), 1)
+            return
+        
+        paginas = []
+        segundos = 0.0
+        try:
+            iterador = self.extractor.extraer_paginas(ruta_archivo)
+            while True:
+                # Solo se mide la extracción, no el tiempo de quien consume las páginas
+                inicio = time.perf_counter()
+                texto = next(iterador, None)
+                segundos += time.perf_counter() - inicio
+                if texto is None:
+                    break
+                texto_pagina = texto + "\n"
+                paginas.append(texto_pagina)
+                yield len(paginas), texto_pagina
         except Exception as e:
             logger.error(f"Error extrayendo texto de {nombre_archivo}: {e}")
-            return None
+            self.metricas.incrementar('pdfs_con_error')
+            return
+        finally:
+            self._registrar_extraccion(nombre_archivo, SEPARADOR_PAGINA.join(paginas), segundos)
+        
+        if self.cache is not None:
+            self.cache.guardar(ruta_archivo, SEPARADOR_PAGINA.join(paginas), self.extractor.nombre)
+    
+    def search_texts_in_pdf(self, nombre_archivo: str, textos_busqueda: List[str]) -> Dict[str, List[int]]:
+        """
+        Busca varios textos en un PDF página por página.
+        
+        La extracción se detiene en cuanto todos los textos se han encontrado
+        al menos una vez, así que las páginas posteriores no se reportan.
+        
+        Args:
+            nombre_archivo: Nombre del archivo PDF
+            textos_busqueda: Textos a buscar
+            
+        Returns:
+            Diccionario {texto_busqueda: [páginas donde se encontró]} con los
+            textos encontrados
+        """
+        matcher = MatcherNormalizado(textos_busqueda)
+        pendientes = matcher.patrones
+        paginas: Dict[str, List[int]] = {}
+        
+        for numero_pagina, texto_pagina in self.iter_pages(nombre_archivo):
+            with self.metricas.medir('busqueda'):
+                encontrados = matcher.buscar(texto_pagina)
+            for texto_busqueda in encontrados:
+                paginas.setdefault(texto_busqueda, []).append(numero_pagina)
+                pendientes.discard(texto_busqueda)
+            if not pendientes:
+                logger.debug(f"Todos los textos encontrados en {nombre_archivo} "
+                             f"en la página {numero_pagina}")
+                break
+        
+        return paginas
     
     def search_text_in_pdf(self, nombre_archivo: str, texto_busqueda: str) -> bool:
         """
@@ -83,12 +589,7 @@ class PDFProcessor:
         Returns:
             True si se encuentra el texto, False en caso contrario
         """
-        contenido = self.extract_text_from_pdf(nombre_archivo)
-        
-        if contenido is None:
-            return False
-        
-        encontrado = texto_busqueda in contenido
+        encontrado = texto_busqueda in self.search_texts_in_pdf(nombre_archivo, [texto_busqueda])
         logger.debug(f"Búsqueda de '{texto_busqueda}' en {nombre_archivo}: {'encontrado' if encontrado else 'no encontrado'}")
         
         return encontrado
@@ -114,3 +615,147 @@ class PDFProcessor:
         
         logger.info(f"Texto encontrado en {len(archivos_encontrados)} archivos")
         return archivos_encontrados
+    
+    def extract_all_texts(self) -> Dict[str, str]:
+        """
+        Extrae el texto de todos los archivos PDF de la carpeta una sola vez.
+        
+        Returns:
+            Diccionario {nombre_archivo: texto} con los PDFs legibles
+        """
+        archivos_pdf = self.get_pdf_files()
+        textos = {}
+        
+        for archivo, contenido in self.iter_texts(archivos_pdf):
+            if contenido is not None:
+                textos[archivo] = contenido
+        
+        logger.info(f"Texto extraído de {len(textos)} de {len(archivos_pdf)} archivos PDF")
+        return textos
+    
+    def clasificar_pdfs(self, manifest: Optional[ManifestRevision] = None) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Lista los PDFs y separa los que hay que extraer y buscar por completo.
+        
+        No depende de los textos de búsqueda, así que se puede hacer (y
+        empezar la extracción) antes de tenerlos.
+        
+        Args:
+            manifest: Manifest de la revisión anterior. Si es None, todos los
+                PDFs se consideran cambiados.
+            
+        Returns:
+            Tupla (todos los PDFs, PDFs nuevos o modificados, PDFs sin cambios)
+        """
+        archivos_pdf = self.get_pdf_files()
+        if manifest is None:
+            return archivos_pdf, list(archivos_pdf), []
+        
+        cambiados = []
+        vigentes = []
+        for archivo in archivos_pdf:
+            if manifest.esta_vigente(archivo, os.path.join(self.carpeta_pdf, archivo)):
+                vigentes.append(archivo)
+            else:
+                cambiados.append(archivo)
+        return archivos_pdf, cambiados, vigentes
+    
+    def search_texts_in_all_pdfs(self, textos_busqueda: List[str],
+                                 archivos_pdf: Optional[List[str]] = None,
+                                 textos_pdf: Optional[Iterable[Tuple[str, Optional[TextoPDF]]]] = None
+                                 ) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Busca varios textos en todos los archivos PDF extrayendo cada PDF una sola vez
+        y recorriendo su texto una sola vez con un autómata Aho-Corasick.
+        Los radicados se comparan normalizados a sus dígitos (ver MatcherNormalizado).
+        
+        Args:
+            textos_busqueda: Textos a buscar
+            archivos_pdf: PDFs de la carpeta. Si es None, se listan.
+            textos_pdf: Textos de esos PDFs ya en extracción, como los entrega
+                iter_texts. Si es None, se extraen aquí.
+            
+        Returns:
+            Diccionario {texto_busqueda: {archivo: [páginas donde se encontró]}}
+        """
+        if archivos_pdf is None:
+            archivos_pdf = self.get_pdf_files()
+        if textos_pdf is None:
+            textos_pdf = self.iter_texts(archivos_pdf, fragmentos=True)
+        matcher = MatcherNormalizado(textos_busqueda)
+        encontrados: Dict[str, Dict[str, List[int]]] = {texto: {} for texto in textos_busqueda}
+        
+        logger.info(f"Buscando {len(encontrados)} textos en {len(archivos_pdf)} archivos PDF")
+        
+        # Cada texto se descarta apenas se busca en él, así la memoria no
+        # crece con el número de PDFs aunque se extraigan en paralelo.
+        for archivo, contenido in textos_pdf:
+            if contenido is None:
+                continue
+            for texto_busqueda, paginas in self._buscar(matcher, contenido).items():
+                encontrados[texto_busqueda][archivo] = paginas
+        
+        # Los archivos llegan en orden de finalización; se reporta en el orden de la carpeta
+        orden = {archivo: indice for indice, archivo in enumerate(archivos_pdf)}
+        return {
+            texto: dict(sorted(archivos.items(), key=lambda item: orden[item[0]]))
+            for texto, archivos in encontrados.items()
+        }
+    
+    def search_texts_incremental(self, textos_busqueda: List[str], manifest: ManifestRevision,
+                                 clasificacion: Optional[Tuple[List[str], List[str], List[str]]] = None,
+                                 textos_cambiados: Optional[Iterable[Tuple[str, Optional[TextoPDF]]]] = None
+                                 ) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Busca varios textos en todos los PDFs reutilizando una revisión anterior.
+        
+        Solo se extraen y buscan por completo los PDFs nuevos o modificados
+        desde la última ejecución; en los demás solo se buscan los textos
+        agregados desde entonces. El resultado siempre cubre todos los PDFs.
+        
+        Args:
+            textos_busqueda: Textos a buscar
+            manifest: Manifest de la revisión anterior, que se actualiza y guarda
+            clasificacion: Resultado de clasificar_pdfs con este manifest. Si
+                es None, se calcula aquí.
+            textos_cambiados: Textos de los PDFs cambiados ya en extracción,
+                como los entrega iter_texts. Si es None, se extraen aquí.
+            
+        Returns:
+            Diccionario {texto_busqueda: {archivo: [páginas donde se encontró]}}
+        """
+        if clasificacion is None:
+            clasificacion = self.clasificar_pdfs(manifest)
+        archivos_pdf, cambiados, vigentes = clasificacion
+        if textos_cambiados is None:
+            textos_cambiados = self.iter_texts(cambiados, fragmentos=True)
+        textos_nuevos = manifest.sincronizar(archivos_pdf, textos_busqueda)
+        
+        logger.info(f"{len(cambiados)} PDFs nuevos o modificados, {len(vigentes)} sin cambios, "
+                    f"{len(textos_nuevos)} textos nuevos")
+        
+        if cambiados:
+            matcher = MatcherNormalizado(textos_busqueda)
+            for archivo, contenido in textos_cambiados:
+                if contenido is None:
+                    manifest.olvidar_archivo(archivo)
+                    continue
+                manifest.registrar_archivo(
+                    archivo,
+                    os.path.join(self.carpeta_pdf, archivo),
+                    self._buscar(matcher, contenido),
+                    hash_contenido=self.hash_contenido(archivo)
+                )
+        
+        if vigentes and textos_nuevos:
+            matcher = MatcherNormalizado(textos_nuevos)
+            for archivo, contenido in self.iter_texts(vigentes, fragmentos=True):
+                if contenido is None:
+                    manifest.olvidar_archivo(archivo)
+                    continue
+                manifest.agregar_coincidencias(archivo, self._buscar(matcher, contenido))
+        
+        manifest.guardar()
+        
+        coincidencias = manifest.coincidencias(archivos_pdf)
+        return {texto: dict(coincidencias.get(texto, {})) for texto in textos_busqueda}
@@ -0,0 +1,757 @@
+"""
+Lectura mínima de PDFs para extraer texto directamente de los content streams.
+
+Solo implementa lo necesario para buscar números en gacetas: objetos
+directos y en object streams (sin depender de la tabla xref), filtros
+FlateDecode, ASCIIHexDecode, ASCII85Decode y LZWDecode, árbol de páginas,
+fuentes simples (WinAnsi/MacRoman), fuentes Type0 con ToUnicode y anchos
+de glifo para reconstruir espacios y líneas de forma similar a pdfplumber.
+"""
+
+import base64
+import re
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Tolerancias en puntos, iguales a las de pdfplumber por defecto
+TOLERANCIA_X = 3
+TOLERANCIA_Y = 3
+
+_RE_OBJETO = re.compile(rb'(\d+)\s+(\d+)\s+obj\b')
+_RE_REFERENCIA = re.compile(rb'\s*(\d+)\s+(\d+)\s+R\b')
+_RE_NUMERO = re.compile(rb'[+-]?(?:\d+\.?\d*|\.\d+)')
+_RE_NOMBRE = re.compile(rb'/[^\s/\[\]()<>{}%]*')
+_RE_PALABRA = re.compile(rb'[^\s/\[\]()<>{}%]+')
+_RE_ESPACIOS = re.compile(rb'(?:\s|%[^\r\n]*)*')
+_RE_HEX_CMAP = re.compile(rb'<([0-9A-Fa-f\s]*)>')
+_RE_BLANCOS = re.compile(r'\s+')
+
+_ESCAPES = {
+    ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t', ord('b'): b'\b', ord('f'): b'\f',
+    ord('('): b'(', ord(')'): b')', ord('\\'): b'\\',
+}
+
+
+class ErrorPDFCrudo(Exception):
+    """Error al leer un PDF sin pdfplumber."""
+
+
+def _decodificar_flate(datos: bytes) -> bytes:
+    """Descomprime un stream FlateDecode."""
+    try:
+        return zlib.decompress(datos)
+    except zlib.error:
+        # Streams truncados o con basura al final
+        return zlib.decompressobj().decompress(datos)
+
+
+def _decodificar_ascii_hex(datos: bytes) -> bytes:
+    """Decodifica un stream ASCIIHexDecode (termina en '>')."""
+    digitos = re.sub(rb'\s', b'', datos.split(b'>', 1)[0])
+    if len(digitos) % 2:
+        digitos += b'0'
+    return bytes.fromhex(digitos.decode('ascii'))
+
+
+def _decodificar_ascii85(datos: bytes) -> bytes:
+    """Decodifica un stream ASCII85Decode (termina en '~>')."""
+    datos = re.sub(rb'\s', b'', datos.split(b'~>', 1)[0])
+    if datos.startswith(b'<~'):
+        datos = datos[2:]
+    return base64.a85decode(datos)
+
+
+def _decodificar_lzw(datos: bytes) -> bytes:
+    """Decodifica un stream LZWDecode con EarlyChange 1 (el valor por defecto)."""
+    salida = bytearray()
+    tabla: List[bytes] = []
+    anterior = b''
+    ancho = 9
+    acumulado = 0
+    bits = 0
+    for byte in datos:
+        acumulado = (acumulado << 8) | byte
+        bits += 8
+        while bits >= ancho:
+            bits -= ancho
+            codigo = (acumulado >> bits) & ((1 << ancho) - 1)
+            if codigo == 256:
+                tabla = [bytes([i]) for i in range(256)] + [b'', b'']
+                anterior = b''
+                ancho = 9
+                continue
+            if codigo == 257:
+                return bytes(salida)
+            if not tabla:
+                tabla = [bytes([i]) for i in range(256)] + [b'', b'']
+            if codigo < len(tabla):
+                entrada = tabla[codigo]
+                if anterior:
+                    tabla.append(anterior + entrada[:1])
+            elif codigo == len(tabla) and anterior:
+                entrada = anterior + anterior[:1]
+                tabla.append(entrada)
+            else:
+                raise ErrorPDFCrudo(f"Código LZW inválido: {codigo}")
+            salida += entrada
+            anterior = entrada
+            if len(tabla) + 1 >= (1 << ancho) and ancho < 12:
+                ancho += 1
+    return bytes(salida)
+
+
+# Filtros de stream soportados, con sus abreviaturas de imágenes inline
+_FILTROS = {
+    'FlateDecode': _decodificar_flate, 'Fl': _decodificar_flate,
+    'ASCIIHexDecode': _decodificar_ascii_hex, 'AHx': _decodificar_ascii_hex,
+    'ASCII85Decode': _decodificar_ascii85, 'A85': _decodificar_ascii85,
+    'LZWDecode': _decodificar_lzw, 'LZW': _decodificar_lzw,
+}
+
+
+class Referencia:
+    """Referencia indirecta a un objeto del PDF."""
+    
+    __slots__ = ('numero',)
+    
+    def __init__(self, numero: int):
+        self.numero = numero
+
+
+class Nombre(str):
+    """Nombre PDF (/Nombre) sin la barra inicial."""
+
+
+def _leer_literal(datos: bytes, pos: int) -> Tuple[bytes, int]:
+    """Lee un string literal (...) que empieza en pos, con paréntesis anidados."""
+    salida = bytearray()
+    nivel = 1
+    i = pos + 1
+    largo = len(datos)
+    while i < largo:
+        c = datos[i]
+        if c == 0x5C:  # barra invertida
+            i += 1
+            if i >= largo:
+                break
+            c = datos[i]
+            if c in _ESCAPES:
+                salida += _ESCAPES[c]
+            elif 0x30 <= c <= 0x37:
+                fin = i
+                while fin < largo and fin < i + 3 and 0x30 <= datos[fin] <= 0x37:
+                    fin += 1
+                salida.append(int(datos[i:fin], 8) & 0xFF)
+                i = fin - 1
+            elif c in (0x0A, 0x0D):
+                if c == 0x0D and i + 1 < largo and datos[i + 1] == 0x0A:
+                    i += 1
+            else:
+                salida.append(c)
+        elif c == 0x28:
+            nivel += 1
+            salida.append(c)
+        elif c == 0x29:
+            nivel -= 1
+            if nivel == 0:
+                return bytes(salida), i + 1
+            salida.append(c)
+        else:
+            salida.append(c)
+        i += 1
+    return bytes(salida), i
+
+
+def _leer_hex(datos: bytes, pos: int) -> Tuple[bytes, int]:
+    """Lee un string hexadecimal <...> que empieza en pos."""
+    fin = datos.find(b'>', pos)
+    if fin < 0:
+        fin = len(datos)
+    digitos = re.sub(rb'\s', b'', datos[pos + 1:fin])
+    if len(digitos) % 2:
+        digitos += b'0'
+    try:
+        return bytes.fromhex(digitos.decode('ascii')), fin + 1
+    except ValueError:
+        return b'', fin + 1
+
+
+def parsear_objeto(datos: bytes, pos: int = 0):
+    """
+    Interpreta un objeto PDF (diccionario, arreglo, número, nombre, string o
+    referencia) a partir de una posición.
+    
+    Returns:
+        Tupla (valor, posición siguiente)
+    """
+    pos = _RE_ESPACIOS.match(datos, pos).end()
+    if pos >= len(datos):
+        return None, pos
+    
+    inicio = datos[pos:pos + 2]
+    if inicio == b'<<':
+        resultado = {}
+        pos += 2
+        while True:
+            pos = _RE_ESPACIOS.match(datos, pos).end()
+            if pos >= len(datos) or datos[pos:pos + 2] == b'>>':
+                return resultado, pos + 2
+            clave, pos = parsear_objeto(datos, pos)
+            valor, pos = parsear_objeto(datos, pos)
+            if isinstance(clave, Nombre):
+                resultado[str(clave)] = valor
+            elif clave is None:
+                return resultado, pos
+    if inicio[:1] == b'[':
+        resultado = []
+        pos += 1
+        while True:
+            pos = _RE_ESPACIOS.match(datos, pos).end()
+            if pos >= len(datos) or datos[pos:pos + 1] == b']':
+                return resultado, pos + 1
+            valor, nueva_pos = parsear_objeto(datos, pos)
+            if nueva_pos <= pos:
+                return resultado, pos + 1
+            resultado.append(valor)
+            pos = nueva_pos
+    if inicio[:1] == b'(':
+        return _leer_literal(datos, pos)
+    if inicio[:1] == b'<':
+        return _leer_hex(datos, pos)
+    if inicio[:1] == b'/':
+        nombre = _RE_NOMBRE.match(datos, pos)
+        return Nombre(nombre.group()[1:].decode('latin-1')), nombre.end()
+    
+    referencia = _RE_REFERENCIA.match(datos, pos)
+    if referencia:
+        return Referencia(int(referencia.group(1))), referencia.end()
+    
+    numero = _RE_NUMERO.match(datos, pos)
+    if numero:
+        texto = numero.group()
+        return (float(texto) if b'.' in texto else int(texto)), numero.end()
+    
+    palabra = _RE_PALABRA.match(datos, pos)
+    if palabra:
+        valor = palabra.group()
+        return {b'true': True, b'false': False}.get(valor), palabra.end()
+    return None, pos + 1
+
+
+class DocumentoCrudo:
+    """Acceso de solo lectura a los objetos y páginas de un PDF."""
+    
+    def __init__(self, datos: bytes):
+        """
+        Indexa los objetos del PDF.
+        
+        Args:
+            datos: Contenido binario del PDF
+        """
+        if not datos.startswith(b'%PDF'):
+            raise ErrorPDFCrudo("El archivo no es un PDF")
+        
+        self._datos = datos
+        self._cuerpos: Dict[int, bytes] = {}
+        self._flujos: Dict[int, Tuple[int, int]] = {}
+        self._cache: Dict[int, object] = {}
+        self._indexar_objetos()
+        self._indexar_object_streams()
+    
+    def _indexar_objetos(self) -> None:
+        """Ubica el cuerpo y el stream de cada objeto directo."""
+        datos = self._datos
+        cursor = 0
+        while True:
+            encabezado = _RE_OBJETO.search(datos, cursor)
+            if encabezado is None:
+                break
+            
+            numero = int(encabezado.group(1))
+            inicio = encabezado.end()
+            fin_objeto = datos.find(b'endobj', inicio)
+            if fin_objeto < 0:
+                fin_objeto = len(datos)
+            
+            inicio_stream = datos.find(b'stream', inicio, fin_objeto)
+            if inicio_stream < 0:
+                self._cuerpos[numero] = datos[inicio:fin_objeto]
+                cursor = fin_objeto + 6
+                continue
+            
+            cuerpo = datos[inicio:inicio_stream]
+            self._cuerpos[numero] = cuerpo
+            inicio_datos = inicio_stream + 6
+            if datos[inicio_datos:inicio_datos + 2] == b'\r\n':
+                inicio_datos += 2
+            elif datos[inicio_datos:inicio_datos + 1] in (b'\n', b'\r'):
+                inicio_datos += 1
+            
+            diccionario, _ = parsear_objeto(cuerpo)
+            longitud = diccionario.get('Length') if isinstance(diccionario, dict) else None
+            if isinstance(longitud, int) and datos[inicio_datos + longitud:
+                                                   inicio_datos + longitud + 12].lstrip().startswith(b'endstream'):
+                fin_datos = inicio_datos + longitud
+            else:
+                fin_datos = datos.find(b'endstream', inicio_datos)
+                if fin_datos < 0:
+                    fin_datos = len(datos)
+            
+            self._flujos[numero] = (inicio_datos, fin_datos)
+            fin_objeto = datos.find(b'endobj', fin_datos)
+            cursor = (fin_objeto if fin_objeto >= 0 else fin_datos) + 6
+    
+    def _indexar_object_streams(self) -> None:
+        """Agrega los objetos comprimidos dentro de object streams (PDF 1.5+)."""
+        for numero in list(self._flujos):
+            diccionario = self.objeto(numero)
+            if not isinstance(diccionario, dict) or diccionario.get('Type') != 'ObjStm':
+                continue
+            
+            contenido = self.flujo(numero)
+            if contenido is None:
+                continue
+            
+            total = diccionario.get('N', 0)
+            primero = diccionario.get('First', 0)
+            encabezado = [int(valor) for valor in contenido[:primero].split()]
+            pares = list(zip(encabezado[0:total * 2:2], encabezado[1:total * 2:2]))
+            for indice, (numero_objeto, desplazamiento) in enumerate(pares):
+                fin = pares[indice + 1][1] if indice + 1 < len(pares) else len(contenido) - primero
+                if numero_objeto not in self._cuerpos:
+                    self._cuerpos[numero_objeto] = contenido[primero + desplazamiento:primero + fin]
+    
+    def objeto(self, numero: int):
+        """
+        Obtiene un objeto interpretado por su número.
+        
+        Args:
+            numero: Número del objeto
+        
+        Returns:
+            Valor del objeto o None si no existe
+        """
+        if numero not in self._cache:
+            cuerpo = self._cuerpos.get(numero)
+            self._cache[numero] = parsear_objeto(cuerpo)[0] if cuerpo is not None else None
+        return self._cache[numero]
+    
+    def resolver(self, valor):
+        """Sigue las referencias indirectas hasta obtener el valor."""
+        vistos = 0
+        while isinstance(valor, Referencia) and vistos < 32:
+            valor = self.objeto(valor.numero)
+            vistos += 1
+        return valor
+    
+    def flujo(self, numero: int) -> Optional[bytes]:
+        """
+        Obtiene los datos decodificados del stream de un objeto.
+        
+        Args:
+            numero: Número del objeto
+        
+        Returns:
+            Datos del stream o None si usa un filtro o predictor no soportado
+            o está dañado
+        """
+        posiciones = self._flujos.get(numero)
+        if posiciones is None:
+            return None
+        
+        datos = self._datos[posiciones[0]:posiciones[1]]
+        diccionario = self.objeto(numero)
+        if not isinstance(diccionario, dict):
+            diccionario = {}
+        filtros = self.resolver(diccionario.get('Filter'))
+        parametros = self.resolver(diccionario.get('DecodeParms'))
+        if filtros is None:
+            filtros = []
+        elif not isinstance(filtros, list):
+            filtros = [filtros]
+        if not isinstance(parametros, list):
+            parametros = [parametros] * len(filtros)
+        
+        for filtro, parametro in zip(filtros, parametros):
+            decodificar = _FILTROS.get(self.resolver(filtro))
+            parametro = self.resolver(parametro)
+            if decodificar is None:
+                return None
+            # Los predictores solo aparecen en imágenes y streams de xref
+            if isinstance(parametro, dict) and parametro.get('Predictor', 1) > 1:
+                return None
+            if isinstance(parametro, dict) and parametro.get('EarlyChange', 1) != 1:
+                return None
+            try:
+                datos = decodificar(datos)
+            except (ValueError, ErrorPDFCrudo):
+                return None
+        return datos
+    
+    def paginas(self) -> List[dict]:
+        """
+        Obtiene los diccionarios de página en orden, recorriendo el árbol de páginas.
+        
+        Returns:
+            Lista de diccionarios de página con 'Resources' heredado resuelto
+        """
+        raices = [
+            numero for numero in self._cuerpos
+            if b'/Pages' in self._cuerpos[numero] and isinstance(self.objeto(numero), dict)
+            and self.objeto(numero).get('Type') == 'Pages' and 'Parent' not in self.objeto(numero)
+        ]
+        if not raices:
+            raise ErrorPDFCrudo("No se encontró el árbol de páginas")
+        
+        paginas = []
+        pendientes = [(self.objeto(raices[0]), None)]
+        visitados = set()
+        while pendientes:
+            nodo, recursos = pendientes.pop()
+            if not isinstance(nodo, dict) or id(nodo) in visitados:
+                continue
+            visitados.add(id(nodo))
+            recursos = nodo.get('Resources', recursos)
+            if nodo.get('Type') == 'Pages' or 'Kids' in nodo:
+                hijos = self.resolver(nodo.get('Kids')) or []
+                for hijo in reversed(hijos):
+                    pendientes.append((self.resolver(hijo), recursos))
+            else:
+                pagina = dict(nodo)
+                pagina['Resources'] = recursos
+                paginas.append(pagina)
+        return paginas
+    
+    def contenido_pagina(self, pagina: dict) -> bytes:
+        """Concatena los content streams de una página."""
+        contenidos = self.resolver(pagina.get('Contents'))
+        if contenidos is None:
+            return b''
+        if not isinstance(contenidos, list):
+            contenidos = [pagina.get('Contents')]
+        
+        partes = []
+        for contenido in contenidos:
+            if isinstance(contenido, Referencia):
+                datos = self.flujo(contenido.numero)
+                if datos:
+                    partes.append(datos)
+        return b'\n'.join(partes)
+
+
+class Fuente:
+    """Decodificación y anchos de una fuente para la extracción de texto."""
+    
+    def __init__(self, documento: DocumentoCrudo, diccionario: dict):
+        self.bytes_por_codigo = 1
+        self.unicode: Dict[int, str] = {}
+        self.anchos: Dict[int, float] = {}
+        self.ancho_defecto = 500.0
+        self.codificacion = 'cp1252'
+        
+        subtipo = diccionario.get('Subtype')
+        codificacion = documento.resolver(diccionario.get('Encoding'))
+        if isinstance(codificacion, dict):
+            codificacion = codificacion.get('BaseEncoding')
+        if codificacion == 'MacRomanEncoding':
+            self.codificacion = 'mac_roman'
+        elif codificacion == 'StandardEncoding':
+            self.codificacion = 'latin-1'
+        
+        if subtipo == 'Type0':
+            self.bytes_por_codigo = 2
+            self.ancho_defecto = 1000.0
+            descendientes = documento.resolver(diccionario.get('DescendantFonts')) or []
+            descendiente = documento.resolver(descendientes[0]) if descendientes else None
+            if isinstance(descendiente, dict):
+                self.ancho_defecto = float(descendiente.get('DW', 1000))
+                self._leer_anchos_cid(documento.resolver(descendiente.get('W')) or [], documento)
+        else:
+            primero = documento.resolver(diccionario.get('FirstChar')) or 0
+            anchos = documento.resolver(diccionario.get('Widths')) or []
+            for indice, ancho in enumerate(anchos):
+                ancho = documento.resolver(ancho)
+                if isinstance(ancho, (int, float)):
+                    self.anchos[primero + indice] = float(ancho)
+        
+        to_unicode = diccionario.get('ToUnicode')
+        if isinstance(to_unicode, Referencia):
+            cmap = documento.flujo(to_unicode.numero)
+            if cmap:
+                self._leer_cmap(cmap)
+    
+    def _leer_anchos_cid(self, anchos: list, documento: DocumentoCrudo) -> None:
+        """Interpreta el arreglo W de una fuente CID."""
+        i = 0
+        while i < len(anchos):
+            inicio = documento.resolver(anchos[i])
+            siguiente = documento.resolver(anchos[i + 1]) if i + 1 < len(anchos) else None
+            if isinstance(siguiente, list):
+                for desplazamiento, ancho in enumerate(siguiente):
+                    if isinstance(ancho, (int, float)):
+                        self.anchos[inicio + desplazamiento] = float(ancho)
+                i += 2
+            elif i + 2 < len(anchos):
+                fin = siguiente
+                ancho = documento.resolver(anchos[i + 2])
+                if isinstance(inicio, int) and isinstance(fin, int) and fin - inicio < 65536:
+                    for codigo in range(inicio, fin + 1):
+                        self.anchos[codigo] = float(ancho)
+                i += 3
+            else:
+                break
+    
+    def _leer_cmap(self, cmap: bytes) -> None:
+        """Interpreta los bloques bfchar y bfrange de un CMap ToUnicode."""
+        espacio = re.search(rb'begincodespacerange\s*<([0-9A-Fa-f]+)>', cmap)
+        if espacio:
+            self.bytes_por_codigo = max(1, len(espacio.group(1)) // 2)
+        
+        for bloque in re.finditer(rb'beginbfchar(.*?)endbfchar', cmap, re.S):
+            valores = _RE_HEX_CMAP.findall(bloque.group(1))
+            for origen, destino in zip(valores[0::2], valores[1::2]):
+                self.unicode[int(origen, 16)] = _utf16(destino)
+        
+        for bloque in re.finditer(rb'beginbfrange(.*?)endbfrange', cmap, re.S):
+            for rango in re.finditer(rb'<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>\s*(<[0-9A-Fa-f]+>|\[[^\]]*\])',
+                                     bloque.group(1)):
+                inicio, fin = int(rango.group(1), 16), int(rango.group(2), 16)
+                destino = rango.group(3)
+                if destino.startswith(b'['):
+                    for desplazamiento, valor in enumerate(_RE_HEX_CMAP.findall(destino)):
+                        self.unicode[inicio + desplazamiento] = _utf16(valor)
+                elif fin - inicio < 65536:
+                    base = bytes.fromhex(destino[1:-1].decode('ascii'))
+                    for desplazamiento in range(fin - inicio + 1):
+                        valor = base[:-1] + bytes([(base[-1] + desplazamiento) & 0xFF]) if base else b''
+                        self.unicode[inicio + desplazamiento] = valor.decode('utf-16-be', 'ignore')
+    
+    def decodificar(self, datos: bytes) -> Iterator[Tuple[str, float, bool]]:
+        """
+        Decodifica un string de un content stream.
+        
+        Yields:
+            Tuplas (texto del código, ancho en milésimas de em, es espacio simple)
+        """
+        paso = self.bytes_por_codigo
+        for i in range(0, len(datos) - paso + 1, paso):
+            codigo = int.from_bytes(datos[i:i + paso], 'big')
+            texto = self.unicode.get(codigo)
+            if texto is None:
+                texto = datos[i:i + paso].decode(self.codificacion, 'replace') if paso == 1 else ''
+            yield texto, self.anchos.get(codigo, self.ancho_defecto), paso == 1 and codigo == 32
+
+
+def _utf16(hexadecimal: bytes) -> str:
+    """Convierte un destino hexadecimal UTF-16BE de un CMap a texto."""
+    digitos = re.sub(rb'\s', b'', hexadecimal)
+    try:
+        return bytes.fromhex(digitos.decode('ascii')).decode('utf-16-be', 'ignore')
+    except ValueError:
+        return ''
+
+
+def _tokens_contenido(datos: bytes) -> Iterator[Tuple[str, object]]:
+    """Divide un content stream en operandos y operadores."""
+    pos = 0
+    largo = len(datos)
+    while pos < largo:
+        pos = _RE_ESPACIOS.match(datos, pos).end()
+        if pos >= largo:
+            return
+        c = datos[pos:pos + 1]
+        if c == b'(':
+            valor, pos = _leer_literal(datos, pos)
+            yield 'string', valor
+        elif c == b'<' and datos[pos:pos + 2] != b'<<':
+            valor, pos = _leer_hex(datos, pos)
+            yield 'string', valor
+        elif c == b'[':
+            yield 'abre', None
+            pos += 1
+        elif c == b']':
+            yield 'cierra', None
+            pos += 1
+        elif c in (b'<', b'>'):
+            # Diccionarios inline (por ejemplo en BDC); no aportan texto
+            valor, pos = parsear_objeto(datos, pos) if c == b'<' else (None, pos + 2)
+            yield 'otro', valor
+        elif c == b'/':
+            nombre = _RE_NOMBRE.match(datos, pos)
+            pos = nombre.end()
+            yield 'nombre', nombre.group()[1:].decode('latin-1')
+        else:
+            numero = _RE_NUMERO.match(datos, pos)
+            if numero:
+                pos = numero.end()
+                yield 'numero', float(numero.group())
+                continue
+            palabra = _RE_PALABRA.match(datos, pos)
+            if palabra is None:
+                pos += 1
+                continue
+            pos = palabra.end()
+            operador = palabra.group()
+            if operador == b'ID':
+                # Imagen inline: se salta hasta EI
+                fin = re.compile(rb'\sEI(?=\s|$)').search(datos, pos)
+                pos = fin.end() if fin else largo
+                continue
+            yield 'operador', operador.decode('latin-1')
+
+
+def extraer_texto_pagina(documento: DocumentoCrudo, pagina: dict) -> str:
+    """
+    Extrae el texto de una página agrupando los fragmentos por línea.
+    
+    Args:
+        documento: Documento al que pertenece la página
+        pagina: Diccionario de la página
+    
+    Returns:
+        Texto de la página con una línea por renglón
+    """
+    recursos = documento.resolver(pagina.get('Resources')) or {}
+    fuentes_pagina = documento.resolver(recursos.get('Font')) or {}
+    fuentes: Dict[str, Fuente] = {}
+    
+    fragmentos: List[Tuple[float, float, float, str]] = []
+    fuente: Optional[Fuente] = None
+    tamano = 0.0
+    espaciado_caracter = espaciado_palabra = 0.0
+    escala_horizontal = 1.0
+    interlineado = 0.0
+    texto_x = texto_y = linea_x = linea_y = 0.0
+    escala_x = escala_y = 1.0
+    operandos: list = []
+    arreglo: Optional[list] = None
+    
+    def mostrar(datos: bytes) -> None:
+        nonlocal texto_x
+        if fuente is None:
+            return
+        inicio = texto_x
+        partes = []
+        for texto, ancho, es_espacio in fuente.decodificar(datos):
+            avance = ancho / 1000.0 * tamano + espaciado_caracter
+            if es_espacio:
+                avance += espaciado_palabra
+            texto_x += avance * escala_horizontal * escala_x
+            partes.append(texto)
+        if partes:
+            fragmentos.append((texto_y, inicio, texto_x, ''.join(partes)))
+    
+    def nueva_linea(tx: float, ty: float) -> None:
+        nonlocal texto_x, texto_y, linea_x, linea_y
+        linea_x += tx * escala_x
+        linea_y += ty * escala_y
+        texto_x, texto_y = linea_x, linea_y
+    
+    for tipo, valor in _tokens_contenido(documento.contenido_pagina(pagina)):
+        if tipo == 'abre':
+            arreglo = []
+            continue
+        if tipo == 'cierra':
+            operandos.append(arreglo if arreglo is not None else [])
+            arreglo = None
+            continue
+        if tipo != 'operador':
+            (arreglo if arreglo is not None else operandos).append(valor)
+            continue
+        
+        operador = valor
+        try:
+            if operador == 'BT':
+                texto_x = texto_y = linea_x = linea_y = 0.0
+                escala_x = escala_y = 1.0
+            elif operador == 'Tf' and len(operandos) >= 2:
+                nombre_fuente, tamano = operandos[-2], float(operandos[-1])
+                if nombre_fuente not in fuentes:
+                    diccionario = documento.resolver(fuentes_pagina.get(nombre_fuente))
+                    fuentes[nombre_fuente] = Fuente(documento, diccionario) if isinstance(diccionario, dict) else None
+                fuente = fuentes[nombre_fuente]
+            elif operador == 'Tm' and len(operandos) >= 6:
+                a, _, _, d, e, f = (float(x) for x in operandos[-6:])
+                escala_x, escala_y = abs(a) or 1.0, abs(d) or 1.0
+                linea_x, linea_y = e, f
+                texto_x, texto_y = e, f
+            elif operador in ('Td', 'TD') and len(operandos) >= 2:
+                tx, ty = float(operandos[-2]), float(operandos[-1])
+                if operador == 'TD':
+                    interlineado = -ty
+                nueva_linea(tx, ty)
+            elif operador == 'T*':
+                nueva_linea(0.0, -interlineado)
+            elif operador == 'TL' and operandos:
+                interlineado = float(operandos[-1])
+            elif operador == 'Tc' and operandos:
+                espaciado_caracter = float(operandos[-1])
+            elif operador == 'Tw' and operandos:
+                espaciado_palabra = float(operandos[-1])
+            elif operador == 'Tz' and operandos:
+                escala_horizontal = float(operandos[-1]) / 100.0
+            elif operador == 'Tj' and operandos:
+                mostrar(operandos[-1])
+            elif operador == "'" and operandos:
+                nueva_linea(0.0, -interlineado)
+                mostrar(operandos[-1])
+            elif operador == '"' and len(operandos) >= 3:
+                espaciado_palabra, espaciado_caracter = float(operandos[-3]), float(operandos[-2])
+                nueva_linea(0.0, -interlineado)
+                mostrar(operandos[-1])
+            elif operador == 'TJ' and operandos and isinstance(operandos[-1], list):
+                for elemento in operandos[-1]:
+                    if isinstance(elemento, bytes):
+                        mostrar(elemento)
+                    elif isinstance(elemento, float):
+                        texto_x -= elemento / 1000.0 * tamano * escala_horizontal * escala_x
+        except (TypeError, ValueError):
+            pass
+        operandos = []
+    
+    return _componer_lineas(fragmentos)
+
+
+def _componer_lineas(fragmentos: List[Tuple[float, float, float, str]]) -> str:
+    """Agrupa los fragmentos por renglón (de arriba abajo) y los une por posición."""
+    if not fragmentos:
+        return ''
+    
+    fragmentos.sort(key=lambda fragmento: -fragmento[0])
+    lineas: List[List[Tuple[float, float, float, str]]] = []
+    for fragmento in fragmentos:
+        if lineas and abs(lineas[-1][0][0] - fragmento[0]) <= TOLERANCIA_Y:
+            lineas[-1].append(fragmento)
+        else:
+            lineas.append([fragmento])
+    
+    textos = []
+    for linea in lineas:
+        linea.sort(key=lambda fragmento: fragmento[1])
+        partes = []
+        fin_anterior = None
+        for _, inicio, fin, texto in linea:
+            if fin_anterior is not None and inicio - fin_anterior > TOLERANCIA_X:
+                partes.append(' ')
+            partes.append(texto)
+            fin_anterior = fin
+        texto_linea = _RE_BLANCOS.sub(' ', ''.join(partes)).strip()
+        if texto_linea:
+            textos.append(texto_linea)
+    return '\n'.join(textos)
+
+
+def extraer_paginas(ruta_archivo: str) -> Iterator[str]:
+    """
+    Extrae el texto de cada página de un PDF leyendo sus content streams.
+    
+    Args:
+        ruta_archivo: Ruta del PDF
+    
+    Yields:
+        Texto de cada página en orden
+    """
+    with open(ruta_archivo, 'rb') as archivo:
+        documento = DocumentoCrudo(archivo.read())
+    for pagina in documento.paginas():
+        yield extraer_texto_pagina(documento, pagina)
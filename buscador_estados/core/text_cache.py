@@ -0,0 +1,424 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Optional
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+NOMBRE_ARCHIVO_CACHE = '.cache_textos.sqlite3'
+
+# Separa las páginas dentro del texto extraído de un PDF
+SEPARADOR_PAGINA = "\f"
+
+# Desperdicio mínimo del corpus (bytes de entradas eliminadas) antes de compactarlo
+MIN_BYTES_COMPACTACION = 16 * 1024 * 1024
+
+
+class FragmentoCorpus(NamedTuple):
+    """
+    Texto de un PDF dentro del corpus mapeado en memoria.
+    
+    datos es el mmap de solo lectura de todo el corpus; el texto, en UTF-8,
+    ocupa los bytes [inicio, fin). Buscar sobre datos con pos/endpos no
+    copia el texto: el sistema operativo carga y libera sus páginas.
+    """
+    datos: mmap.mmap
+    inicio: int
+    fin: int
+    paginas: int
+    
+    def texto(self) -> str:
+        """Decodifica el texto completo del fragmento."""
+        return self.datos[self.inicio:self.fin].decode('utf-8')
+
+
+class TextCache:
+    """
+    Caché persistente del texto extraído de los PDFs.
+    
+    Cada archivo se identifica por su tamaño y fecha de modificación; si
+    alguno cambia se recalcula el hash del contenido y solo se considera
+    vigente la entrada cuyo hash coincida. El texto se guarda por hash y
+    backend de extracción, de modo que un PDF renombrado o duplicado
+    reutiliza la misma entrada y cambiar de backend no mezcla sus textos.
+    
+    Los textos se agregan en UTF-8 a un corpus de solo anexado junto a la
+    base SQLite, que guarda la tabla de desplazamientos. Las búsquedas
+    recorren el corpus mapeado en memoria (ver obtener_fragmento), así que
+    el texto de miles de PDFs no se mantiene como objetos str y cualquier
+    proceso puede abrirlo con la ruta y los desplazamientos. Un solo
+    proceso debe escribir la caché de un juzgado a la vez.
+    """
+    
+    # Se incrementa cuando cambia la forma de extraer el texto o el esquema
+    VERSION = 4
+    
+    def __init__(self, ruta_db: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Inicializa la caché.
+        
+        Args:
+            ruta_db: Ruta del archivo SQLite de la caché
+            max_bytes: Tamaño máximo del texto almacenado antes de desalojar
+                las entradas usadas hace más tiempo
+        """
+        self.ruta_db = ruta_db
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta_db, check_same_thread=False)
+        self._mapa: Optional[mmap.mmap] = None
+        self._escritura = None
+        self._crear_tablas()
+        self._eliminar_corpus_huerfanos()
+    
+    def _crear_tablas(self) -> None:
+        """Crea las tablas de la caché, descartando los textos de versiones anteriores."""
+        with self._lock, self._conexion:
+            version = self._conexion.execute('PRAGMA user_version').fetchone()[0]
+            if version != self.VERSION:
+                self._conexion.execute('DROP TABLE IF EXISTS textos')
+                self._conexion.execute('DROP TABLE IF EXISTS corpus')
+                self._conexion.execute(f'PRAGMA user_version = {self.VERSION:d}')
+            self._conexion.executescript('''
+                CREATE TABLE IF NOT EXISTS archivos (
+                    ruta TEXT PRIMARY KEY,
+                    tamano INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    hash TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS textos (
+                    hash TEXT NOT NULL,
+                    extractor TEXT NOT NULL,
+                    desplazamiento INTEGER NOT NULL,
+                    bytes INTEGER NOT NULL,
+                    paginas INTEGER NOT NULL,
+                    ultimo_acceso REAL NOT NULL,
+                    PRIMARY KEY (hash, extractor)
+                );
+                CREATE INDEX IF NOT EXISTS idx_textos_acceso ON textos (ultimo_acceso);
+                CREATE TABLE IF NOT EXISTS corpus (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    generacion INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO corpus (id, generacion) VALUES (1, 0);
+            ''')
+            self.generacion = self._conexion.execute(
+                'SELECT generacion FROM corpus WHERE id = 1'
+            ).fetchone()[0]
+    
+    def ruta_corpus(self, generacion: Optional[int] = None) -> str:
+        """
+        Ruta del archivo de corpus de una generación.
+        
+        Cada compactación escribe una generación nueva, de modo que la tabla
+        de desplazamientos y el corpus cambian juntos en una transacción.
+        
+        Args:
+            generacion: Generación del corpus. Si es None, la vigente.
+        
+        Returns:
+            Ruta del corpus, junto a la base SQLite
+        """
+        if generacion is None:
+            generacion = self.generacion
+        return f"{os.path.splitext(self.ruta_db)[0]}.{generacion}.corpus"
+    
+    def _eliminar_corpus_huerfanos(self) -> None:
+        """Elimina los corpus de generaciones que ya no usa la tabla de desplazamientos."""
+        carpeta = os.path.dirname(os.path.abspath(self.ruta_db))
+        prefijo = os.path.basename(os.path.splitext(self.ruta_db)[0]) + '.'
+        vigente = os.path.basename(self.ruta_corpus())
+        with self._lock:
+            for nombre in os.listdir(carpeta):
+                if nombre.startswith(prefijo) and nombre.endswith('.corpus') and nombre != vigente:
+                    try:
+                        os.remove(os.path.join(carpeta, nombre))
+                    except OSError as e:
+                        logger.warning(f"No se pudo eliminar el corpus anterior {nombre}: {e}")
+            
+            total = self._conexion.execute(
+                'SELECT COALESCE(MAX(desplazamiento + bytes), 0) FROM textos'
+            ).fetchone()[0]
+        # Sin corpus no hay textos; un corpus más corto que la tabla está dañado
+        try:
+            tamano = os.path.getsize(self.ruta_corpus())
+        except OSError:
+            tamano = 0
+        if tamano < total:
+            logger.warning(f"Corpus de textos incompleto en {self.ruta_corpus()}, se descarta la caché")
+            with self._lock, self._conexion:
+                self._conexion.execute('DELETE FROM textos')
+    
+    def _archivo_escritura(self):
+        """Archivo del corpus abierto para anexar (requiere el lock)."""
+        if self._escritura is None:
+            self._escritura = open(self.ruta_corpus(), 'ab')
+        return self._escritura
+    
+    def _mapa_corpus(self, fin: int) -> Optional[mmap.mmap]:
+        """
+        Mapa de solo lectura del corpus que cubre al menos hasta fin (requiere el lock).
+        
+        Si el corpus creció desde el último mapeo se crea uno nuevo; los
+        fragmentos entregados antes conservan el suyo.
+        """
+        if self._mapa is not None and len(self._mapa) >= fin:
+            return self._mapa
+        if self._escritura is not None:
+            self._escritura.flush()
+        try:
+            with open(self.ruta_corpus(), 'rb') as archivo:
+                if os.fstat(archivo.fileno()).st_size < fin or fin == 0:
+                    return None
+                self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            logger.warning(f"No se pudo mapear el corpus de textos: {e}")
+            return None
+        return self._mapa
+    
+    @staticmethod
+    def calcular_hash(ruta_archivo: str) -> str:
+        """
+        Calcula el hash SHA-256 del contenido de un archivo.
+        
+        Args:
+            ruta_archivo: Ruta del archivo
+        
+        Returns:
+            Hash hexadecimal del contenido
+        """
+        sha = hashlib.sha256()
+        with open(ruta_archivo, 'rb') as archivo:
+            for bloque in iter(lambda: archivo.read(1024 * 1024), b''):
+                sha.update(bloque)
+        return sha.hexdigest()
+    
+    def hash_vigente(self, ruta_archivo: str) -> str:
+        """
+        Obtiene el hash del contenido actual del archivo, recalculándolo solo
+        si cambió su tamaño o fecha de modificación.
+        
+        Args:
+            ruta_archivo: Ruta del archivo
+            
+        Returns:
+            Hash hexadecimal del contenido
+        """
+        estado = os.stat(ruta_archivo)
+        clave = os.path.abspath(ruta_archivo)
+        
+        with self._lock:
+            fila = self._conexion.execute(
+                'SELECT tamano, mtime_ns, hash FROM archivos WHERE ruta = ?', (clave,)
+            ).fetchone()
+        
+        if fila and fila[0] == estado.st_size and fila[1] == estado.st_mtime_ns:
+            return fila[2]
+        
+        hash_contenido = self.calcular_hash(ruta_archivo)
+        with self._lock, self._conexion:
+            self._conexion.execute(
+                'INSERT OR REPLACE INTO archivos (ruta, tamano, mtime_ns, hash) VALUES (?, ?, ?, ?)',
+                (clave, estado.st_size, estado.st_mtime_ns, hash_contenido)
+            )
+        return hash_contenido
+    
+    def es_vigente(self, ruta_archivo: str, extractor: str = 'pdfplumber') -> bool:
+        """
+        Indica si hay texto en caché para el contenido actual del archivo.
+        
+        Args:
+            ruta_archivo: Ruta del PDF
+            extractor: Nombre del backend con el que se extrajo el texto
+        
+        Returns:
+            True si la entrada existe y corresponde al contenido actual
+        """
+        try:
+            hash_contenido = self.hash_vigente(ruta_archivo)
+        except OSError:
+            return False
+        
+        with self._lock:
+            fila = self._conexion.execute(
+                'SELECT 1 FROM textos WHERE hash = ? AND extractor = ?',
+                (hash_contenido, extractor)
+            ).fetchone()
+        return fila is not None
+    
+    def obtener(self, ruta_archivo: str, extractor: str = 'pdfplumber') -> Optional[str]:
+        """
+        Obtiene el texto en caché de un PDF.
+        
+        Args:
+            ruta_archivo: Ruta del PDF
+            extractor: Nombre del backend con el que se extrajo el texto
+        
+        Returns:
+            Texto extraído o None si no hay una entrada vigente
+        """
+        fragmento = self.obtener_fragmento(ruta_archivo, extractor)
+        return fragmento.texto() if fragmento is not None else None
+    
+    def obtener_fragmento(self, ruta_archivo: str, extractor: str = 'pdfplumber') -> Optional[FragmentoCorpus]:
+        """
+        Obtiene la ubicación en el corpus mapeado del texto en caché de un PDF,
+        sin decodificarlo.
+        
+        Args:
+            ruta_archivo: Ruta del PDF
+            extractor: Nombre del backend con el que se extrajo el texto
+        
+        Returns:
+            Fragmento del corpus o None si no hay una entrada vigente
+        """
+        try:
+            hash_contenido = self.hash_vigente(ruta_archivo)
+        except OSError as e:
+            logger.warning(f"No se pudo leer {ruta_archivo} para la caché: {e}")
+            return None
+        
+        with self._lock, self._conexion:
+            fila = self._conexion.execute(
+                'SELECT desplazamiento, bytes, paginas FROM textos WHERE hash = ? AND extractor = ?',
+                (hash_contenido, extractor)
+            ).fetchone()
+            if fila is None:
+                return None
+            desplazamiento, tamano, paginas = fila
+            mapa = self._mapa_corpus(desplazamiento + tamano)
+            if mapa is None:
+                self._conexion.execute(
+                    'DELETE FROM textos WHERE hash = ? AND extractor = ?', (hash_contenido, extractor)
+                )
+                return None
+            self._conexion.execute(
+                'UPDATE textos SET ultimo_acceso = ? WHERE hash = ? AND extractor = ?',
+                (time.time(), hash_contenido, extractor)
+            )
+        
+        logger.debug(f"Texto en caché para {os.path.basename(ruta_archivo)}")
+        return FragmentoCorpus(mapa, desplazamiento, desplazamiento + tamano, paginas)
+    
+    def guardar(self, ruta_archivo: str, texto: str, extractor: str = 'pdfplumber') -> None:
+        """
+        Guarda el texto extraído de un PDF.
+        
+        Args:
+            ruta_archivo: Ruta del PDF
+            texto: Texto extraído
+            extractor: Nombre del backend con el que se extrajo el texto
+        """
+        try:
+            hash_contenido = self.hash_vigente(ruta_archivo)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar {ruta_archivo} en la caché: {e}")
+            return
+        
+        datos = texto.encode('utf-8')
+        with self._lock, self._conexion:
+            # El texto queda en disco antes de registrar su desplazamiento
+            archivo = self._archivo_escritura()
+            archivo.seek(0, os.SEEK_END)
+            desplazamiento = archivo.tell()
+            archivo.write(datos)
+            archivo.flush()
+            self._conexion.execute(
+                'INSERT OR REPLACE INTO textos (hash, extractor, desplazamiento, bytes, paginas, '
+                'ultimo_acceso) VALUES (?, ?, ?, ?, ?, ?)',
+                (hash_contenido, extractor, desplazamiento, len(datos),
+                 texto.count(SEPARADOR_PAGINA) + 1, time.time())
+            )
+        self._desalojar()
+    
+    def _desalojar(self) -> None:
+        """Elimina las entradas usadas hace más tiempo hasta respetar max_bytes."""
+        with self._lock, self._conexion:
+            total = self._conexion.execute(
+                'SELECT COALESCE(SUM(bytes), 0) FROM textos'
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            
+            filas = self._conexion.execute(
+                'SELECT hash, extractor, bytes FROM textos ORDER BY ultimo_acceso ASC'
+            ).fetchall()
+            eliminados = 0
+            for hash_contenido, extractor, tamano in filas:
+                if total <= self.max_bytes:
+                    break
+                self._conexion.execute(
+                    'DELETE FROM textos WHERE hash = ? AND extractor = ?', (hash_contenido, extractor)
+                )
+                total -= tamano
+                eliminados += 1
+        
+        logger.debug(f"Desalojadas {eliminados} entradas de la caché de textos")
+        self._compactar_si_conviene()
+    
+    def _compactar_si_conviene(self) -> None:
+        """Compacta el corpus cuando los bytes eliminados superan a los vigentes."""
+        with self._lock:
+            vivos = self._conexion.execute(
+                'SELECT COALESCE(SUM(bytes), 0) FROM textos'
+            ).fetchone()[0]
+        try:
+            desperdicio = os.path.getsize(self.ruta_corpus()) - vivos
+        except OSError:
+            return
+        if desperdicio > max(vivos, MIN_BYTES_COMPACTACION):
+            self.compactar()
+    
+    def compactar(self) -> None:
+        """
+        Reescribe el corpus solo con las entradas vigentes.
+        
+        Los textos se copian a una generación nueva del corpus y la tabla de
+        desplazamientos se actualiza en la misma transacción que la
+        generación, así que una interrupción deja la caché consistente.
+        """
+        with self._lock:
+            filas = self._conexion.execute(
+                'SELECT hash, extractor, desplazamiento, bytes FROM textos ORDER BY desplazamiento'
+            ).fetchall()
+            if self._escritura is not None:
+                self._escritura.close()
+                self._escritura = None
+            
+            anterior = self.ruta_corpus()
+            nueva = self.generacion + 1
+            nuevos_desplazamientos = []
+            with open(anterior, 'rb') as origen, open(self.ruta_corpus(nueva), 'wb') as destino:
+                for hash_contenido, extractor, desplazamiento, tamano in filas:
+                    origen.seek(desplazamiento)
+                    nuevos_desplazamientos.append((destino.tell(), hash_contenido, extractor))
+                    destino.write(origen.read(tamano))
+            
+            with self._conexion:
+                self._conexion.executemany(
+                    'UPDATE textos SET desplazamiento = ? WHERE hash = ? AND extractor = ?',
+                    nuevos_desplazamientos
+                )
+                self._conexion.execute('UPDATE corpus SET generacion = ? WHERE id = 1', (nueva,))
+            self.generacion = nueva
+            # Los fragmentos ya entregados conservan el mapa del corpus anterior
+            self._mapa = None
+            try:
+                os.remove(anterior)
+            except OSError as e:
+                logger.warning(f"No se pudo eliminar el corpus anterior {anterior}: {e}")
+        
+        logger.debug(f"Corpus de textos compactado: {len(filas)} entradas")
+    
+    def cerrar(self) -> None:
+        """Cierra la conexión con la caché."""
+        with self._lock:
+            self._conexion.close()
+            if self._escritura is not None:
+                self._escritura.close()
+                self._escritura = None
+            self._mapa = None
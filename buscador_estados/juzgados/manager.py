@@ -1,12 +1,26 @@
+import asyncio
 import os
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import nullcontext
 from datetime import date
-from typing import List, Optional
-from ..core.models import ConfiguracionJuzgado, EstadoProcesal, ResultadoBusqueda
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from ..core.models import ConfiguracionJuzgado, EstadoProcesal, EstadoSet, ResultadoBusqueda, TablaArchivos
 from ..core.database import DatabaseManager
-from ..core.pdf_processor import PDFProcessor
+from ..core.estados_cache import CacheEstados, CambiosEstados, NOMBRE_ARCHIVO_CACHE_ESTADOS
+from ..core.historial import HistorialRevisiones
+from ..core.indice import IndiceRadicados
+from ..core.matcher import MatcherNormalizado
+from ..core.pdf_processor import PDFProcessor, TextoPDF, buscar_por_pagina, dividir_paginas
+from ..core.text_cache import TextCache, NOMBRE_ARCHIVO_CACHE
 from ..core.file_manager import FileManager
+from ..core.manifest import ManifestRevision, NOMBRE_ARCHIVO_MANIFEST
 from ..config.settings import settings
 from ..utils.logger import get_logger
+from ..utils.metricas import Metricas
+from .scheduler import JuzgadoScheduler
 
 logger = get_logger(__name__)
 
@@ -14,17 +28,54 @@ logger = get_logger(__name__)
 class JuzgadoManager:
     """Gestor principal para operaciones de un juzgado específico."""
     
-    def __init__(self, nombre_juzgado: str):
+    def __init__(self, nombre_juzgado: str, workers: Optional[int] = None,
+                 executor: Optional[Executor] = None,
+                 semaforo_db: Optional[threading.Semaphore] = None,
+                 incremental: bool = True,
+                 indice: Optional[IndiceRadicados] = None,
+                 extractor: Optional[str] = None,
+                 historial: Optional[HistorialRevisiones] = None):
         """
         Inicializa el gestor para un juzgado específico.
         
         Args:
             nombre_juzgado: Nombre del juzgado
+            workers: Procesos para extraer PDFs en paralelo. Si es None, se usa
+                el valor de la configuración.
+            executor: Pool de procesos compartido con otros juzgados
+            semaforo_db: Semáforo compartido que limita las consultas a MongoDB
+            incremental: Si es True, solo se revisan los PDFs nuevos o
+                modificados desde la última ejecución
+            indice: Índice invertido compartido. Si es None, se abre el de la configuración.
+            extractor: Backend de extracción de texto. Si es None, se usa el
+                valor de la configuración.
+            historial: Historial de revisiones compartido. Si es None, se abre
+                el de la configuración.
         """
         self.nombre_juzgado = nombre_juzgado
+        self.semaforo_db = semaforo_db
+        self.incremental = incremental
+        self.indice = indice
+        self.historial = historial
+        self.metricas = Metricas(nombre_juzgado)
         self.config = self._crear_configuracion()
-        self.pdf_processor = PDFProcessor(self.config.carpeta_pdf)
-        self.file_manager = FileManager(self.config.carpeta_revision)
+        self.pdf_processor = PDFProcessor(
+            self.config.carpeta_pdf,
+            workers=workers if workers is not None else settings.pdf_workers,
+            executor=executor,
+            extractor=extractor or settings.pdf_backend,
+            metricas=self.metricas
+        )
+        self.file_manager = FileManager(self.config.carpeta_revision, juzgado=self.nombre_juzgado)
+        self.text_cache = TextCache(
+            os.path.join(self.config.carpeta_revision, NOMBRE_ARCHIVO_CACHE),
+            max_bytes=settings.cache_textos_max_bytes
+        )
+        self.pdf_processor.cache = self.text_cache
+        self._cache_estados: Optional[CacheEstados] = None
+        # El índice y el historial compartidos los cierra quien los abrió
+        self._indice_propio = indice is None
+        self._historial_propio = historial is None
         
     def _crear_configuracion(self) -> ConfiguracionJuzgado:
         """Crea la configuración del juzgado."""
@@ -70,18 +121,56 @@ class JuzgadoManager:
         logger.info(f"Estructura válida para {self.nombre_juzgado}")
         return True
     
-    def obtener_estados_procesales(self) -> List[EstadoProcesal]:
+    def obtener_estados_procesales(self) -> Sequence[EstadoProcesal]:
         """
         Obtiene los estados procesales desde la base de datos.
         
+        Con settings.cache_estados solo se piden los cambios desde la última
+        consulta (ver sincronizar_estados).
+        
         Returns:
-            Lista de estados procesales
+            Estados procesales, en un EstadoSet
         """
-        with DatabaseManager() as db:
+        if settings.cache_estados:
+            estados, _ = self.sincronizar_estados()
+            return estados
+        
+        with self.semaforo_db or nullcontext(), DatabaseManager(self.metricas) as db:
             estados = db.get_estados_procesales(self.config.coleccion_db)
             logger.info(f"Obtenidos {len(estados)} estados para {self.nombre_juzgado}")
             return estados
     
+    def sincronizar_estados(self, reconciliar_sin_flujo: float = 0.0
+                            ) -> Tuple[EstadoSet, CambiosEstados]:
+        """
+        Actualiza la caché local de estados con los cambios de MongoDB.
+        
+        Si MongoDB no responde se propaga el error: la caché puede no tener
+        las ediciones ni los borrados recientes, así que no se usa en su lugar.
+        
+        Args:
+            reconciliar_sin_flujo: Segundos entre lecturas completas de la
+                colección si MongoDB no admite flujos de cambios; 0 la lee
+                en cada llamada (ver DatabaseManager.sincronizar_estados)
+        
+        Returns:
+            Tupla (todos los estados, estados agregados y eliminados en esta sincronización)
+        """
+        if self._cache_estados is None:
+            self._cache_estados = CacheEstados(
+                os.path.join(self.config.carpeta_revision, NOMBRE_ARCHIVO_CACHE_ESTADOS)
+            )
+        cache = self._cache_estados
+        
+        with self.semaforo_db or nullcontext(), DatabaseManager(self.metricas) as db:
+            cambios = db.sincronizar_estados(self.config.coleccion_db, cache, reconciliar_sin_flujo)
+        
+        with self.metricas.medir('lectura_cache_estados'):
+            estados = cache.estados()
+        logger.info(f"Obtenidos {len(estados)} estados para {self.nombre_juzgado} "
+                    f"({len(cambios.agregados)} agregados, {len(cambios.eliminados)} eliminados)")
+        return estados, cambios
+    
     def procesar_estado(self, estado: EstadoProcesal) -> ResultadoBusqueda:
         """
         Procesa un estado procesal específico.
@@ -103,73 +192,560 @@ class JuzgadoManager:
         logger.debug(f"Procesado estado {estado.numero}: {len(archivos_encontrados)} archivos")
         return resultado
     
-    def procesar_todos_los_estados(self) -> List[ResultadoBusqueda]:
+    def procesar_estados(self, estados: Sequence[EstadoProcesal],
+                         incluir_radicado: bool = False) -> List[ResultadoBusqueda]:
+        """
+        Procesa varios estados procesales extrayendo cada PDF una sola vez.
+        
+        Args:
+            estados: Estados procesales a procesar
+            incluir_radicado: Si es True, también se busca el radicado de cada estado
+            
+        Returns:
+            Lista de resultados de búsqueda, en el mismo orden que los estados
+        """
+        return list(self.iter_resultados(estados, incluir_radicado))
+    
+    def iter_resultados(self, estados: Sequence[EstadoProcesal],
+                        incluir_radicado: bool = False) -> Iterator[ResultadoBusqueda]:
+        """
+        Genera los resultados de búsqueda uno a uno, sin acumularlos.
+        
+        La búsqueda en los PDFs se hace completa al pedir el primer resultado;
+        después cada ResultadoBusqueda se construye a medida que se consume.
+        Un error de la búsqueda se propaga en lugar de reportar todos los
+        estados como no encontrados.
+        
+        Args:
+            estados: Estados procesales a procesar
+            incluir_radicado: Si es True, también se busca el radicado de cada estado
+            
+        Yields:
+            Resultados de búsqueda, en el mismo orden que los estados
+        """
+        textos_busqueda = self._textos_busqueda(estados, incluir_radicado)
+        
+        if self.incremental:
+            coincidencias = self.pdf_processor.search_texts_incremental(
+                textos_busqueda, self._cargar_manifest()
+            )
+        else:
+            coincidencias = self.pdf_processor.search_texts_in_all_pdfs(textos_busqueda)
+        
+        yield from self._construir_resultados(estados, coincidencias, incluir_radicado)
+    
+    def _textos_busqueda(self, estados: Sequence[EstadoProcesal], incluir_radicado: bool) -> List[str]:
+        """Textos que se buscan en los PDFs para unos estados."""
+        textos_busqueda = [estado.numero for estado in estados]
+        if incluir_radicado:
+            textos_busqueda.extend(estado.radicado for estado in estados if estado.radicado)
+        self.metricas.incrementar('estados', len(estados))
+        self.metricas.incrementar('textos_busqueda', len(textos_busqueda))
+        return textos_busqueda
+    
+    def _cargar_manifest(self) -> ManifestRevision:
+        """Carga el manifest de la revisión anterior para el backend actual."""
+        return ManifestRevision.cargar(
+            os.path.join(self.config.carpeta_revision, NOMBRE_ARCHIVO_MANIFEST),
+            extractor=self.pdf_processor.extractor.nombre
+        )
+    
+    def _construir_resultados(self, estados: Sequence[EstadoProcesal],
+                              coincidencias: Dict[str, Dict[str, List[int]]],
+                              incluir_radicado: bool) -> Iterator[ResultadoBusqueda]:
+        """Genera el ResultadoBusqueda de cada estado a partir de las coincidencias."""
+        fecha_busqueda = date.today()
+        tabla_archivos = TablaArchivos()
+        for estado in estados:
+            paginas = {
+                archivo: list(paginas_archivo)
+                for archivo, paginas_archivo in coincidencias.get(estado.numero, {}).items()
+            }
+            fragmento = None
+            if incluir_radicado and estado.radicado:
+                por_radicado = coincidencias.get(estado.radicado, {})
+                for archivo, paginas_archivo in por_radicado.items():
+                    paginas[archivo] = sorted(set(paginas.get(archivo, [])).union(paginas_archivo))
+                fragmento = self._fragmento_radicado(estado.radicado, por_radicado)
+            archivos_encontrados = list(paginas)
+            if archivos_encontrados:
+                self.metricas.incrementar('estados_encontrados')
+            logger.debug(f"Procesado estado {estado.numero}: {len(archivos_encontrados)} archivos")
+            yield ResultadoBusqueda(
+                estado=estado,
+                archivos_encontrados=archivos_encontrados,
+                fecha_busqueda=fecha_busqueda,
+                paginas=paginas,
+                tabla_archivos=tabla_archivos,
+                fragmento=fragmento
+            )
+    
+    def _fragmento_radicado(self, radicado: str, por_radicado: Dict[str, List[int]]) -> Optional[str]:
+        """Texto original de la primera aparición de un radicado encontrado."""
+        for archivo, paginas_archivo in por_radicado.items():
+            if paginas_archivo:
+                try:
+                    return self.pdf_processor.fragmento_original(archivo, paginas_archivo[0], radicado)
+                except Exception as e:
+                    logger.debug(f"No se pudo leer el texto original de {radicado} en {archivo}: {e}")
+                    return None
+        return None
+    
+    def procesar_todos_los_estados(self, incluir_radicado: bool = False,
+                                   estados: Optional[Sequence[EstadoProcesal]] = None) -> List[ResultadoBusqueda]:
         """
         Procesa todos los estados procesales del juzgado.
         
+        Args:
+            incluir_radicado: Si es True, también se busca el radicado de cada estado
+            estados: Estados ya obtenidos de la base de datos. Si es None, se consultan.
+            
         Returns:
             Lista de resultados de búsqueda
         """
+        estados = self._estados_a_procesar(estados)
+        if not estados:
+            return []
+        
+        resultados = self.procesar_estados(estados, incluir_radicado)
+        
+        logger.info(f"Procesamiento completo para {self.nombre_juzgado}: {len(resultados)} resultados")
+        return resultados
+    
+    def buscar_en_pipeline(self, estados: Union[Sequence[EstadoProcesal], Future, None] = None,
+                           incluir_radicado: bool = False
+                           ) -> Tuple[Sequence[EstadoProcesal], Dict[str, Dict[str, List[int]]]]:
+        """
+        Obtiene los estados y busca en los PDFs solapando ambas etapas.
+        
+        Ver _pipeline. Se ejecuta en su propio bucle de asyncio, por lo que
+        se puede llamar desde cualquier hilo sin bucle activo.
+        
+        Args:
+            estados: Estados ya obtenidos, un Future que los entregará (None
+                si hay que consultarlos) o None para consultarlos aquí
+            incluir_radicado: Si es True, también se busca el radicado de cada estado
+            
+        Returns:
+            Tupla (estados procesados, {texto_busqueda: {archivo: [páginas]}})
+        """
+        return asyncio.run(self._pipeline(estados, incluir_radicado))
+    
+    async def _pipeline(self, estados: Union[Sequence[EstadoProcesal], Future, None],
+                        incluir_radicado: bool
+                        ) -> Tuple[Sequence[EstadoProcesal], Dict[str, Dict[str, List[int]]]]:
+        """
+        Pipeline de la revisión con etapas concurrentes.
+        
+        La consulta a MongoDB (o la espera de la precarga) corre en un hilo
+        mientras otro lista los PDFs, los clasifica con el manifest y extrae
+        los nuevos o modificados, que no dependen de los estados. Los textos
+        extraídos pasan a la búsqueda por una cola acotada
+        (settings.pipeline_cola_textos), de modo que la latencia de la base
+        de datos queda oculta tras la extracción sin acumular textos sin límite.
+        Un error de la extracción o de la búsqueda se propaga: reportar todos
+        los estados como no encontrados reemplazaría una revisión válida.
+        """
+        logger.info(f"Iniciando procesamiento para {self.nombre_juzgado}")
+        tarea_estados = asyncio.ensure_future(self._esperar_estados(estados))
+        
+        try:
+            valida = await asyncio.to_thread(self.validar_estructura)
+            if not valida:
+                raise RuntimeError(f"Estructura inválida para {self.nombre_juzgado}")
+            
+            manifest = self._cargar_manifest() if self.incremental else None
+            clasificacion = await asyncio.to_thread(self.pdf_processor.clasificar_pdfs, manifest)
+        except BaseException:
+            # Se espera la consulta en curso para no dejar el hilo huérfano
+            await asyncio.gather(tarea_estados, return_exceptions=True)
+            raise
+        archivos_pdf, cambiados, _ = clasificacion
+        
+        cola = queue.Queue(maxsize=settings.pipeline_cola_textos)
+        cancelado = threading.Event()
+        productor = asyncio.ensure_future(
+            asyncio.to_thread(self._producir_textos, cambiados, cola, cancelado)
+        )
+        
+        try:
+            with self.metricas.medir('espera_estados'):
+                estados = await tarea_estados
+            if not estados:
+                logger.warning(f"No se encontraron estados para procesar en {self.nombre_juzgado}")
+                return [], {}
+            
+            textos_busqueda = self._textos_busqueda(estados, incluir_radicado)
+            textos_pdf = self._leer_cola(cola)
+            if manifest is not None:
+                coincidencias = await asyncio.to_thread(
+                    self.pdf_processor.search_texts_incremental,
+                    textos_busqueda, manifest, clasificacion, textos_pdf
+                )
+            else:
+                coincidencias = await asyncio.to_thread(
+                    self.pdf_processor.search_texts_in_all_pdfs,
+                    textos_busqueda, archivos_pdf, textos_pdf
+                )
+            # Un error de la extracción invalida la búsqueda aunque esta terminara
+            await productor
+            return estados, coincidencias
+        finally:
+            cancelado.set()
+            while not productor.done():
+                # Libera al productor si quedó bloqueado en una cola llena
+                self._vaciar_cola(cola)
+                await asyncio.sleep(0.01)
+            # Marca como consultado un error del productor si la búsqueda no llegó a esperarlo
+            productor.exception()
+    
+    async def _esperar_estados(self, estados: Union[Sequence[EstadoProcesal], Future, None]
+                               ) -> Sequence[EstadoProcesal]:
+        """Entrega los estados ya obtenidos, los de la precarga o los de la base de datos."""
+        if isinstance(estados, Future):
+            estados = await asyncio.wrap_future(estados)
+        if estados is None:
+            estados = await asyncio.to_thread(self.obtener_estados_procesales)
+        return estados
+    
+    def _producir_textos(self, archivos: List[str], cola: queue.Queue,
+                         cancelado: threading.Event) -> None:
+        """Extrae los PDFs y pone sus textos en la cola; al final pone None."""
+        textos = self.pdf_processor.iter_texts(archivos, fragmentos=True)
+        try:
+            for elemento in textos:
+                cola.put(elemento)
+                if cancelado.is_set():
+                    break
+        finally:
+            textos.close()
+            cola.put(None)
+    
+    @staticmethod
+    def _leer_cola(cola: queue.Queue) -> Iterator[Tuple[str, Optional[TextoPDF]]]:
+        """Entrega los textos de la cola hasta encontrar el None final."""
+        while True:
+            elemento = cola.get()
+            if elemento is None:
+                return
+            yield elemento
+    
+    @staticmethod
+    def _vaciar_cola(cola: queue.Queue) -> None:
+        """Descarta los elementos pendientes de la cola."""
+        while True:
+            try:
+                cola.get_nowait()
+            except queue.Empty:
+                return
+    
+    def _estados_a_procesar(self, estados: Optional[Sequence[EstadoProcesal]]) -> Sequence[EstadoProcesal]:
+        """
+        Valida la estructura del juzgado y obtiene los estados a procesar.
+        
+        Args:
+            estados: Estados ya obtenidos de la base de datos. Si es None, se consultan.
+            
+        Returns:
+            Estados a procesar; lista vacía si no hay ninguno
+        """
         logger.info(f"Iniciando procesamiento para {self.nombre_juzgado}")
         
         if not self.validar_estructura():
             raise RuntimeError(f"Estructura inválida para {self.nombre_juzgado}")
         
-        estados = self.obtener_estados_procesales()
+        if estados is None:
+            estados = self.obtener_estados_procesales()
         if not estados:
             logger.warning(f"No se encontraron estados para procesar en {self.nombre_juzgado}")
             return []
-        
-        resultados = []
-        for estado in estados:
+        return estados
+    
+    def cerrar(self) -> None:
+        """
+        Cierra las bases SQLite que abrió el gestor: la caché de textos, la
+        de estados y, si no son compartidos, el índice y el historial.
+        """
+        self.text_cache.cerrar()
+        if self._cache_estados is not None:
+            self._cache_estados.cerrar()
+            self._cache_estados = None
+        if self.indice is not None and self._indice_propio:
+            self.indice.cerrar()
+            self.indice = None
+        if self.historial is not None and self._historial_propio:
+            self.historial.cerrar()
+            self.historial = None
+    
+    def _abrir_historial(self) -> Optional[HistorialRevisiones]:
+        """Abre el historial de revisiones si aún no está abierto; None si no se puede."""
+        if self.historial is None:
             try:
-                resultado = self.procesar_estado(estado)
-                resultados.append(resultado)
+                self.historial = HistorialRevisiones(settings.historial_revisiones_ruta)
             except Exception as e:
-                logger.error(f"Error procesando estado {estado.numero}: {e}")
-                # Crear resultado con error
-                resultado = ResultadoBusqueda(
-                    estado=estado,
-                    archivos_encontrados=[],
-                    fecha_busqueda=date.today()
+                logger.warning(f"No se pudo abrir el historial de revisiones: {e}")
+        return self.historial
+    
+    def importar_historial(self, reemplazar: bool = False) -> int:
+        """
+        Carga en el historial los reportes de revisión existentes del juzgado.
+        
+        Args:
+            reemplazar: Si es True, también se vuelven a cargar las fechas ya registradas
+            
+        Returns:
+            Número de reportes importados
+        """
+        if self.historial is None:
+            self.historial = HistorialRevisiones(settings.historial_revisiones_ruta)
+        return self.historial.importar_reportes(
+            self.nombre_juzgado, self.config.carpeta_revision, reemplazar=reemplazar
+        )
+    
+    def actualizar_indice(self) -> int:
+        """
+        Actualiza el índice invertido con los PDFs nuevos o modificados del juzgado.
+        
+        Returns:
+            Número de PDFs indexados
+        """
+        if self.indice is None:
+            self.indice = IndiceRadicados(settings.indice_radicados_ruta)
+        
+        archivos_pdf = self.pdf_processor.get_pdf_files()
+        self.indice.eliminar_ausentes(self.nombre_juzgado, archivos_pdf)
+        
+        pendientes = {}
+        for archivo in archivos_pdf:
+            hash_contenido = self.text_cache.hash_vigente(os.path.join(self.config.carpeta_pdf, archivo))
+            if not self.indice.esta_indexado(self.nombre_juzgado, archivo, hash_contenido):
+                pendientes[archivo] = hash_contenido
+        
+        indexados = 0
+        # Los PDFs ya se contaron en las métricas al buscarlos
+        for archivo, contenido in self.pdf_processor.iter_texts(list(pendientes), registrar=False):
+            if contenido is None:
+                continue
+            with self.metricas.medir('indexacion'):
+                self.indice.indexar_documento(
+                    self.nombre_juzgado, archivo, pendientes[archivo], dividir_paginas(contenido)
                 )
-                resultados.append(resultado)
+            indexados += 1
+        self.metricas.incrementar('pdfs_indexados', indexados)
         
-        logger.info(f"Procesamiento completo para {self.nombre_juzgado}: {len(resultados)} resultados")
-        return resultados
+        logger.info(f"Índice actualizado para {self.nombre_juzgado}: {indexados} PDFs indexados")
+        return indexados
     
-    def ejecutar_revision_completa(self) -> None:
-        """Ejecuta una revisión completa y guarda los resultados."""
+    def ejecutar_revision_completa(self, estados: Union[Sequence[EstadoProcesal], Future, None] = None) -> None:
+        """
+        Ejecuta una revisión completa y guarda los resultados.
+        
+        La consulta de los estados se solapa con la extracción de los PDFs
+        (ver buscar_en_pipeline). Los estados encontrados se escriben a
+        medida que se producen (ver EscritorRevision), de modo que la memoria
+        no crece con el número de estados y una interrupción conserva lo ya
+        encontrado. Junto al archivo de revisión se guarda
+        {fecha}_metricas.json con los tiempos y contadores de cada etapa,
+        también si la revisión falla.
+        
+        Args:
+            estados: Estados ya obtenidos de la base de datos, un Future que
+                los entregará (None si hay que consultarlos) o None para consultarlos.
+        """
+        estado_revision = 'error'
+        inicio = time.perf_counter()
         try:
-            resultados = self.procesar_todos_los_estados()
+            incluir_radicado = settings.buscar_radicado
+            estados, coincidencias = self.buscar_en_pipeline(estados, incluir_radicado)
             
-            if resultados:
-                self.file_manager.escribir_resultados(resultados)
+            if estados:
+                with self.file_manager.abrir_escritor(historial=self._abrir_historial()) as escritor:
+                    for resultado in self._construir_resultados(estados, coincidencias, incluir_radicado):
+                        with self.metricas.medir('escritura'):
+                            escritor.agregar(resultado)
+                        
+                        # Mostrar los estados encontrados a medida que aparecen
+                        if resultado.encontrado:
+                            if escritor.estados_encontrados == 1:
+                                logger.info(f"✅ Estados encontrados en PDFs:")
+                            archivos = ", ".join(resultado.archivos_encontrados)
+                            logger.info(f"   • {resultado.estado.numero} ({resultado.estado.radicado}) → {archivos}")
+                    
+                    with self.metricas.medir('escritura'):
+                        escritor.finalizar()
                 
                 # Estadísticas detalladas
-                encontrados = sum(1 for r in resultados if r.encontrado)
-                total = len(resultados)
+                encontrados = escritor.estados_encontrados
+                total = escritor.total_estados
                 porcentaje = (encontrados / total * 100) if total > 0 else 0
                 
+                if encontrados == 0:
+                    logger.info("❌ No se encontraron estados en los archivos PDF")
                 logger.info(f"Revisión completa para {self.nombre_juzgado}: "
                           f"{encontrados}/{total} estados encontrados ({porcentaje:.1f}%)")
-                
-                # Mostrar resumen de estados encontrados
-                if encontrados > 0:
-                    logger.info(f"✅ Estados encontrados en PDFs:")
-                    for resultado in resultados:
-                        if resultado.encontrado:
-                            archivos = ", ".join(resultado.archivos_encontrados)
-                            logger.info(f"   • {resultado.estado.numero} ({resultado.estado.radicado}) → {archivos}")
-                else:
-                    logger.info("❌ No se encontraron estados en los archivos PDF")
                     
             else:
                 logger.warning(f"No se generaron resultados para {self.nombre_juzgado}")
+            
+            try:
+                self.actualizar_indice()
+            except Exception as e:
+                logger.warning(f"No se pudo actualizar el índice de {self.nombre_juzgado}: {e}")
+            
+            estado_revision = 'ok'
                 
         except Exception as e:
             logger.error(f"Error en revisión completa para {self.nombre_juzgado}: {e}")
             raise
+        finally:
+            self.metricas.registrar_tiempo('revision_total', time.perf_counter() - inicio)
+            self.file_manager.escribir_metricas(self.metricas, extra={'estado': estado_revision})
+
+    def crear_matcher(self, estados: Sequence[EstadoProcesal],
+                      incluir_radicado: bool = False) -> MatcherNormalizado:
+        """
+        Construye el buscador de los textos de unos estados, para reutilizarlo
+        en varias llamadas a revisar_archivos.
+        
+        Args:
+            estados: Estados procesales del juzgado
+            incluir_radicado: Si es True, también se busca el radicado de cada estado
+            
+        Returns:
+            Buscador con el número (y el radicado) de cada estado
+        """
+        return MatcherNormalizado(self._textos_busqueda(estados, incluir_radicado))
+    
+    def revisar_archivos(self, archivos: Iterable[str], estados: Sequence[EstadoProcesal],
+                         incluir_radicado: bool = False,
+                         matcher: Optional[MatcherNormalizado] = None) -> List[ResultadoBusqueda]:
+        """
+        Revisa solo unos PDFs recién llegados y agrega lo encontrado a la
+        revisión del día.
+        
+        Los PDFs que el manifest ya tiene registrados con su contenido actual
+        se omiten. Los demás se extraen, se buscan y se registran en el
+        manifest, así la siguiente revisión completa no los vuelve a
+        procesar. Cada estado encontrado se reporta con todos los PDFs del
+        manifest donde aparece, no solo con los nuevos.
+        
+        Args:
+            archivos: Nombres de los PDFs a revisar
+            estados: Estados procesales del juzgado
+            incluir_radicado: Si es True, también se busca el radicado de cada estado
+            matcher: Buscador de esos estados (ver crear_matcher). Si es
+                None, se construye aquí.
+        
+        Returns:
+            Resultados de los estados encontrados en los PDFs revisados
+        """
+        manifest = self._cargar_manifest()
+        nuevos = []
+        for archivo in dict.fromkeys(archivos):
+            ruta_archivo = os.path.join(self.config.carpeta_pdf, archivo)
+            if (archivo.lower().endswith('.pdf') and os.path.isfile(ruta_archivo)
+                    and not manifest.esta_vigente(archivo, ruta_archivo)):
+                nuevos.append(archivo)
+        if not nuevos:
+            return []
+        
+        if matcher is None:
+            matcher = self.crear_matcher(estados, incluir_radicado)
+        # Textos de la última revisión que estos estados ya no incluyen: se
+        # buscan también para que el manifest siga valiendo para ella
+        faltantes = [texto for texto in manifest.textos if texto not in matcher]
+        matcher_faltantes = MatcherNormalizado(faltantes) if faltantes else None
+        
+        afectados = set()
+        revisados = []
+        for archivo, contenido in self.pdf_processor.iter_texts(nuevos, fragmentos=True):
+            if contenido is None:
+                continue
+            with self.metricas.medir('busqueda'):
+                encontrados = buscar_por_pagina(matcher, contenido)
+                if matcher_faltantes is not None:
+                    encontrados.update(buscar_por_pagina(matcher_faltantes, contenido))
+            manifest.registrar_archivo(archivo, os.path.join(self.config.carpeta_pdf, archivo),
+                                       encontrados, self.pdf_processor.hash_contenido(archivo))
+            afectados.update(encontrados)
+            revisados.append(archivo)
+        if not revisados:
+            return []
+        manifest.guardar()
+        
+        estados_afectados = [
+            estado for estado in estados
+            if estado.numero in afectados or (incluir_radicado and estado.radicado in afectados)
+        ]
+        coincidencias = manifest.coincidencias(self.pdf_processor.get_pdf_files(), afectados)
+        resultados = list(self._construir_resultados(estados_afectados, coincidencias, incluir_radicado))
+        self.file_manager.agregar_a_revision(resultados, ', '.join(revisados),
+                                             historial=self._abrir_historial(), total=len(estados))
+        
+        logger.info(f"{self.nombre_juzgado}: {len(resultados)} estados encontrados en "
+                    f"{len(revisados)} PDFs nuevos")
+        return resultados
+    
+    def buscar_estados_nuevos(self, estados: Sequence[EstadoProcesal],
+                              incluir_radicado: bool = False,
+                              total: Optional[int] = None) -> List[ResultadoBusqueda]:
+        """
+        Busca unos estados recién agregados en los PDFs ya revisados y agrega
+        los encontrados a la revisión del día.
+        
+        Solo se buscan los textos que el manifest aún no tiene, sobre el
+        texto ya extraído de los PDFs que siguen vigentes en el manifest (la
+        caché de textos evita volver a extraerlos). Los PDFs nuevos o
+        modificados quedan para revisar_archivos.
+        
+        Args:
+            estados: Estados agregados desde la última consulta
+            incluir_radicado: Si es True, también se busca el radicado de cada estado
+            total: Estados del juzgado, para las estadísticas de la revisión
+                del día. Si es None, se conservan las que tenga.
+        
+        Returns:
+            Resultados de los estados encontrados
+        """
+        manifest = self._cargar_manifest()
+        textos = [texto for texto in dict.fromkeys(self._textos_busqueda(estados, incluir_radicado))
+                  if texto not in manifest.textos]
+        if not textos:
+            return []
+        
+        vigentes = [
+            archivo for archivo in self.pdf_processor.get_pdf_files()
+            if archivo in manifest.archivos
+            and manifest.esta_vigente(archivo, os.path.join(self.config.carpeta_pdf, archivo))
+        ]
+        matcher = MatcherNormalizado(textos)
+        afectados = set()
+        for archivo, contenido in self.pdf_processor.iter_texts(vigentes, fragmentos=True):
+            if contenido is None:
+                manifest.olvidar_archivo(archivo)
+                continue
+            with self.metricas.medir('busqueda'):
+                encontrados = buscar_por_pagina(matcher, contenido)
+            manifest.agregar_coincidencias(archivo, encontrados)
+            afectados.update(encontrados)
+        # Los PDFs que no estaban vigentes se vuelven a buscar completos al revisarlos
+        manifest.textos.update(textos)
+        manifest.guardar()
+        if not afectados:
+            return []
+        
+        estados_afectados = [
+            estado for estado in estados
+            if estado.numero in afectados or (incluir_radicado and estado.radicado in afectados)
+        ]
+        coincidencias = manifest.coincidencias(self.pdf_processor.get_pdf_files(), afectados)
+        resultados = list(self._construir_resultados(estados_afectados, coincidencias, incluir_radicado))
+        self.file_manager.agregar_a_revision(resultados, f"{len(estados)} estados nuevos",
+                                             historial=self._abrir_historial(), total=total)
+        
+        logger.info(f"{self.nombre_juzgado}: {len(resultados)} de {len(estados)} estados nuevos "
+                    f"encontrados en los PDFs ya revisados")
+        return resultados
 
 
 class MultiJuzgadoManager:
@@ -186,32 +762,53 @@ class MultiJuzgadoManager:
         return list(settings.juzgados_config.keys())
     
     @staticmethod
-    def procesar_juzgado(nombre_juzgado: str) -> None:
+    def procesar_juzgado(nombre_juzgado: str, workers: Optional[int] = None,
+                         incremental: bool = True, extractor: Optional[str] = None) -> None:
         """
         Procesa un juzgado específico.
         
         Args:
             nombre_juzgado: Nombre del juzgado a procesar
+            workers: Procesos para extraer PDFs en paralelo
+            incremental: Si es False, se revisan de nuevo todos los PDFs
+            extractor: Backend de extracción de texto
         """
-        manager = JuzgadoManager(nombre_juzgado)
-        manager.ejecutar_revision_completa()
+        manager = JuzgadoManager(nombre_juzgado, workers=workers, incremental=incremental,
+                                 extractor=extractor)
+        try:
+            manager.ejecutar_revision_completa()
+        finally:
+            manager.cerrar()
     
     @staticmethod
-    def procesar_todos_los_juzgados() -> None:
-        """Procesa todos los juzgados disponibles."""
+    def procesar_todos_los_juzgados(workers: Optional[int] = None,
+                                    max_juzgados: Optional[int] = None,
+                                    incremental: bool = True,
+                                    extractor: Optional[str] = None) -> Dict[str, Optional[str]]:
+        """
+        Procesa todos los juzgados disponibles de forma concurrente.
+        
+        Args:
+            workers: Procesos totales para extraer PDFs en paralelo
+            max_juzgados: Juzgados procesados a la vez
+            incremental: Si es False, se revisan de nuevo todos los PDFs
+            extractor: Backend de extracción de texto
+            
+        Returns:
+            Diccionario {juzgado: None si fue exitoso o el mensaje de error}
+        """
         juzgados = MultiJuzgadoManager.get_juzgados_disponibles()
         logger.info(f"Procesando {len(juzgados)} juzgados")
         
-        exitosos = 0
-        fallidos = 0
+        scheduler = JuzgadoScheduler(max_juzgados=max_juzgados, workers=workers,
+                                     incremental=incremental, extractor=extractor)
+        resultados = scheduler.ejecutar(juzgados)
         
-        for juzgado in juzgados:
-            try:
-                logger.info(f"Procesando juzgado: {juzgado}")
-                MultiJuzgadoManager.procesar_juzgado(juzgado)
-                exitosos += 1
-            except Exception as e:
-                logger.error(f"Error procesando {juzgado}: {e}")
-                fallidos += 1
+        exitosos = [juzgado for juzgado, error in resultados.items() if error is None]
+        fallidos = [juzgado for juzgado, error in resultados.items() if error is not None]
         
-        logger.info(f"Procesamiento completo: {exitosos} exitosos, {fallidos} fallidos")
+        logger.info(f"Procesamiento completo: {len(exitosos)} exitosos, {len(fallidos)} fallidos")
+        for juzgado in fallidos:
+            logger.info(f"   ✗ {juzgado}: {resultados[juzgado]}")
+        
+        return resultados
@@ -0,0 +1,244 @@
+import os
+import threading
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence
+from ..core.database import DatabaseManager
+from ..core.historial import HistorialRevisiones
+from ..core.indice import IndiceRadicados
+from ..core.models import EstadoProcesal
+from ..core.pdf_processor import crear_pool_extraccion
+from ..config.settings import settings
+from ..utils.logger import get_logger
+from ..utils.metricas import Metricas
+
+logger = get_logger(__name__)
+
+
+class JuzgadoScheduler:
+    """
+    Planificador que procesa varios juzgados de forma concurrente.
+    
+    Los juzgados se ejecutan en hilos, comparten un único pool de procesos
+    para la extracción de PDFs (límite global de CPU) y un semáforo que
+    limita las consultas simultáneas a MongoDB. Los juzgados con más bytes
+    de PDF se lanzan primero para reducir el tiempo total, sin esperar a la
+    precarga de los estados: cada uno empieza a extraer sus PDFs y recibe
+    sus estados cuando la precarga termina. Con settings.cache_estados no
+    hay precarga: cada juzgado pide a MongoDB solo los cambios de su caché
+    local. Al terminar se
+    guarda un resumen de métricas de toda la ejecución en settings.metricas_dir.
+    """
+    
+    def __init__(self, max_juzgados: Optional[int] = None, workers: Optional[int] = None,
+                 max_conexiones_db: Optional[int] = None, incremental: bool = True,
+                 extractor: Optional[str] = None):
+        """
+        Inicializa el planificador.
+        
+        Args:
+            max_juzgados: Juzgados procesados a la vez
+            workers: Procesos totales para extraer PDFs
+            max_conexiones_db: Consultas simultáneas permitidas a MongoDB
+            incremental: Si es False, cada juzgado revisa de nuevo todos sus PDFs
+            extractor: Backend de extracción de texto. Si es None, se usa la configuración.
+        """
+        self.incremental = incremental
+        self.extractor = extractor
+        self.max_juzgados = max(1, max_juzgados or settings.juzgados_concurrentes)
+        self.workers = max(1, workers or settings.pdf_workers)
+        self.max_conexiones_db = max(1, max_conexiones_db or settings.mongodb_max_consultas)
+        self.metricas = Metricas('ejecucion')
+    
+    @staticmethod
+    def tamano_carpeta_pdf(nombre_juzgado: str) -> int:
+        """
+        Calcula el total de bytes de PDF de un juzgado.
+        
+        Args:
+            nombre_juzgado: Nombre del juzgado
+        
+        Returns:
+            Suma del tamaño de sus PDFs, 0 si no se puede leer la carpeta
+        """
+        carpeta_base = settings.juzgados_config.get(nombre_juzgado)
+        if carpeta_base is None:
+            return 0
+        
+        try:
+            with os.scandir(os.path.join(carpeta_base, 'pdf')) as entradas:
+                return sum(
+                    entrada.stat().st_size for entrada in entradas
+                    if entrada.is_file() and entrada.name.lower().endswith('.pdf')
+                )
+        except OSError:
+            return 0
+    
+    def ordenar_por_tamano(self, juzgados: List[str]) -> List[str]:
+        """
+        Ordena los juzgados de mayor a menor volumen de PDFs.
+        
+        Args:
+            juzgados: Nombres de los juzgados
+        
+        Returns:
+            Juzgados ordenados
+        """
+        tamanos = {juzgado: self.tamano_carpeta_pdf(juzgado) for juzgado in juzgados}
+        return sorted(juzgados, key=lambda juzgado: tamanos[juzgado], reverse=True)
+    
+    @staticmethod
+    def precargar_estados(juzgados: List[str],
+                          metricas: Optional[Metricas] = None) -> Dict[str, Sequence[EstadoProcesal]]:
+        """
+        Obtiene los estados de todos los juzgados en una sola sesión de MongoDB.
+        
+        Args:
+            juzgados: Nombres de los juzgados (y de sus colecciones)
+            metricas: Métricas opcionales donde registrar la conexión y las consultas
+            
+        Returns:
+            Diccionario {juzgado: estados}, vacío si la precarga falla y cada
+            juzgado debe consultar sus propios estados
+        """
+        try:
+            with DatabaseManager(metricas) as db:
+                estados = db.get_estados_multiples(juzgados)
+            logger.info(f"Precargados los estados de {len(estados)} juzgados")
+            return estados
+        except Exception as e:
+            logger.warning(f"No se pudieron precargar los estados: {e}")
+            return {}
+    
+    @staticmethod
+    def _abrir_historial() -> Optional[HistorialRevisiones]:
+        """Abre el historial compartido por todos los juzgados; None si no se puede."""
+        try:
+            return HistorialRevisiones(settings.historial_revisiones_ruta)
+        except Exception as e:
+            logger.warning(f"No se pudo abrir el historial de revisiones: {e}")
+            return None
+    
+    def ejecutar(self, juzgados: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Procesa los juzgados indicados aislando los fallos de cada uno.
+        
+        Args:
+            juzgados: Nombres de los juzgados a procesar
+        
+        Returns:
+            Diccionario {juzgado: None si fue exitoso o el mensaje de error}
+        """
+        # Importación local para evitar el ciclo con manager.py
+        from .manager import JuzgadoManager
+        
+        semaforo_db = threading.BoundedSemaphore(self.max_conexiones_db)
+        indice = IndiceRadicados(settings.indice_radicados_ruta)
+        historial = self._abrir_historial()
+        # Con varios juzgados a la vez el pool es el único límite global de
+        # CPU, incluso con un solo worker; sin él cada hilo extraería por su cuenta
+        pool_pdf = (crear_pool_extraccion(self.workers)
+                    if self.workers > 1 or self.max_juzgados > 1 else None)
+        resultados: Dict[str, Optional[str]] = {}
+        metricas_juzgados: Dict[str, Metricas] = {}
+        
+        def procesar(nombre_juzgado: str) -> None:
+            logger.info(f"Procesando juzgado: {nombre_juzgado}")
+            manager = JuzgadoManager(
+                nombre_juzgado,
+                workers=self.workers,
+                executor=pool_pdf,
+                semaforo_db=semaforo_db,
+                incremental=self.incremental,
+                indice=indice,
+                extractor=self.extractor,
+                historial=historial
+            )
+            metricas_juzgados[nombre_juzgado] = manager.metricas
+            try:
+                manager.ejecutar_revision_completa(estados=estados_pendientes[nombre_juzgado])
+            finally:
+                manager.cerrar()
+        
+        def precargar() -> None:
+            estados_precargados = {}
+            try:
+                if not settings.cache_estados:
+                    estados_precargados = self.precargar_estados(ordenados, self.metricas)
+            finally:
+                # Sin estados precargados (None) cada juzgado consulta los suyos
+                for juzgado, futuro in estados_pendientes.items():
+                    futuro.set_result(estados_precargados.get(juzgado))
+        
+        with self.metricas.medir('ordenar_juzgados'):
+            ordenados = self.ordenar_por_tamano(juzgados)
+        estados_pendientes: Dict[str, Future] = {juzgado: Future() for juzgado in ordenados}
+        hilo_precarga = threading.Thread(target=precargar, name='precarga-estados', daemon=True)
+        hilo_precarga.start()
+        logger.info(f"Procesando {len(ordenados)} juzgados con {self.max_juzgados} en paralelo "
+                    f"y {self.workers} procesos de extracción")
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_juzgados,
+                                    thread_name_prefix='juzgado') as hilos:
+                futuros = {hilos.submit(procesar, juzgado): juzgado for juzgado in ordenados}
+                for futuro in as_completed(futuros):
+                    juzgado = futuros[futuro]
+                    try:
+                        futuro.result()
+                        resultados[juzgado] = None
+                        logger.info(f"✓ {juzgado} procesado")
+                    except Exception as e:
+                        logger.error(f"Error procesando {juzgado}: {e}")
+                        resultados[juzgado] = str(e)
+        finally:
+            hilo_precarga.join()
+            if pool_pdf is not None:
+                pool_pdf.shutdown()
+            indice.cerrar()
+            if historial is not None:
+                historial.cerrar()
+            self.guardar_metricas(metricas_juzgados, resultados)
+        
+        return resultados
+    
+    def guardar_metricas(self, metricas_juzgados: Dict[str, Metricas],
+                         resultados: Dict[str, Optional[str]]) -> Optional[str]:
+        """
+        Guarda el resumen de métricas de la ejecución, agregando el de cada juzgado.
+        
+        Args:
+            metricas_juzgados: Métricas de cada juzgado procesado
+            resultados: Resultado de cada juzgado
+            
+        Returns:
+            Ruta del archivo escrito, o None si no se pudo escribir
+        """
+        self.metricas.combinar(metricas_juzgados.values())
+        self.metricas.incrementar('juzgados', len(resultados))
+        self.metricas.incrementar('juzgados_fallidos', sum(1 for error in resultados.values() if error))
+        
+        nombre_archivo = f"{self.metricas.inicio:%Y-%m-%d_%H%M%S}_ejecucion.json"
+        try:
+            ruta = self.metricas.guardar(
+                os.path.join(settings.metricas_dir, nombre_archivo),
+                extra={
+                    'configuracion': {
+                        'max_juzgados': self.max_juzgados,
+                        'workers': self.workers,
+                        'max_conexiones_db': self.max_conexiones_db,
+                        'incremental': self.incremental,
+                        'extractor': self.extractor or settings.pdf_backend,
+                    },
+                    'juzgados': {
+                        nombre: dict(metricas.resumen(incluir_archivos=False), error=resultados.get(nombre))
+                        for nombre, metricas in metricas_juzgados.items()
+                    },
+                    'fin': datetime.now().isoformat(timespec='seconds'),
+                }
+            )
+            logger.info(f"Métricas de la ejecución guardadas en {ruta}")
+            return ruta
+        except Exception as e:
+            logger.warning(f"No se pudieron guardar las métricas de la ejecución: {e}")
+            return None
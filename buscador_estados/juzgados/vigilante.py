@@ -0,0 +1,513 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Union
+from ..core.historial import HistorialRevisiones
+from ..core.matcher import MatcherNormalizado
+from ..core.models import EstadoProcesal
+from ..core.pdf_processor import crear_pool_extraccion
+from ..config.settings import settings
+from ..utils.logger import get_logger
+from .manager import JuzgadoManager
+
+logger = get_logger(__name__)
+
+# Constantes de <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_EVENTO_INOTIFY = struct.Struct('iIII')
+
+# Vueltas del sondeo entre dos recorridos completos de todas las carpetas
+VUELTAS_REESCANEO = 30
+# Segundos entre dos consultas de los juzgados configurados
+INTERVALO_JUZGADOS = 60.0
+# Segundos antes de reintentar la consulta de estados que falló
+REINTENTO_ESTADOS = 60.0
+
+# {carpeta: nombres de los archivos cambiados, o None para revisarla completa}
+Cambios = Dict[str, Optional[Set[str]]]
+
+
+class _EstadoCarpeta:
+    """Lo que el sondeo sabe de una carpeta entre dos vueltas."""
+    
+    __slots__ = ('mtime_ns', 'firmas', 'candidatos')
+    
+    def __init__(self, mtime_ns: Optional[int], firmas: Dict[str, tuple]):
+        self.mtime_ns = mtime_ns
+        self.firmas = firmas
+        self.candidatos: Dict[str, tuple] = {}
+    
+    def actualizar(self, actuales: Dict[str, tuple]) -> Set[str]:
+        """
+        Compara el listado actual con el anterior.
+        
+        Args:
+            actuales: Diccionario {nombre: (tamaño, mtime_ns)} de la carpeta
+        
+        Returns:
+            Archivos nuevos o modificados cuya firma no cambió desde la vuelta anterior
+        """
+        listos = set()
+        for nombre, firma in actuales.items():
+            if self.firmas.get(nombre) == firma:
+                self.candidatos.pop(nombre, None)
+            elif self.candidatos.get(nombre) == firma:
+                listos.add(nombre)
+                self.firmas[nombre] = firma
+                del self.candidatos[nombre]
+            else:
+                self.candidatos[nombre] = firma
+        
+        for registro in (self.firmas, self.candidatos):
+            for nombre in [nombre for nombre in registro if nombre not in actuales]:
+                del registro[nombre]
+        return listos
+
+
+class ObservadorSondeo:
+    """
+    Detecta PDFs nuevos o modificados sondeando las carpetas.
+    
+    En cada vuelta solo se listan las carpetas cuyo mtime cambió (al crear,
+    borrar o renombrar archivos) o que tienen archivos a medio copiar; cada
+    VUELTAS_REESCANEO vueltas se listan todas, para notar los PDFs
+    sobrescritos en su lugar. Un archivo se informa cuando su tamaño y su
+    fecha no cambian entre dos vueltas, es decir, cuando terminó de copiarse.
+    Funciona en cualquier sistema de archivos, también en los de red.
+    """
+    
+    nombre = 'sondeo'
+    
+    def __init__(self):
+        self._carpetas: Dict[str, _EstadoCarpeta] = {}
+        self._vueltas = 0
+    
+    @staticmethod
+    def _mtime(carpeta: str) -> Optional[int]:
+        """mtime de una carpeta, None si no se puede leer."""
+        try:
+            return os.stat(carpeta).st_mtime_ns
+        except OSError:
+            return None
+    
+    @staticmethod
+    def _firmas(carpeta: str) -> Dict[str, tuple]:
+        """Tamaño y mtime de cada PDF de una carpeta."""
+        firmas = {}
+        try:
+            with os.scandir(carpeta) as entradas:
+                for entrada in entradas:
+                    if not entrada.name.lower().endswith('.pdf'):
+                        continue
+                    try:
+                        estado = entrada.stat()
+                    except OSError:
+                        continue
+                    firmas[entrada.name] = (estado.st_size, estado.st_mtime_ns)
+        except OSError as e:
+            logger.warning(f"No se pudo listar {carpeta}: {e}")
+        return firmas
+    
+    def vigilar(self, carpeta: str) -> None:
+        """Empieza a vigilar una carpeta; sus archivos actuales no se informan."""
+        self._carpetas[carpeta] = _EstadoCarpeta(self._mtime(carpeta), self._firmas(carpeta))
+    
+    def dejar(self, carpeta: str) -> None:
+        """Deja de vigilar una carpeta."""
+        self._carpetas.pop(carpeta, None)
+    
+    def esperar(self, timeout: float) -> Cambios:
+        """
+        Espera una vuelta y entrega los archivos que terminaron de llegar.
+        
+        Args:
+            timeout: Segundos de espera antes de revisar las carpetas
+        
+        Returns:
+            Diccionario {carpeta: nombres de los archivos nuevos o modificados}
+        """
+        time.sleep(timeout)
+        self._vueltas += 1
+        completo = self._vueltas % VUELTAS_REESCANEO == 0
+        
+        cambios: Cambios = {}
+        for carpeta, estado in self._carpetas.items():
+            mtime_ns = self._mtime(carpeta)
+            if mtime_ns is None:
+                continue
+            if mtime_ns == estado.mtime_ns and not estado.candidatos and not completo:
+                continue
+            estado.mtime_ns = mtime_ns
+            listos = estado.actualizar(self._firmas(carpeta))
+            if listos:
+                cambios[carpeta] = listos
+        return cambios
+    
+    def cerrar(self) -> None:
+        """Libera el observador."""
+        self._carpetas.clear()
+
+
+class ObservadorInotify:
+    """
+    Detecta PDFs nuevos o modificados con inotify (Linux), sin recorrer las carpetas.
+    
+    Se informan los archivos que se terminaron de escribir (IN_CLOSE_WRITE)
+    o que se movieron a la carpeta (IN_MOVED_TO), así un PDF a medio copiar
+    nunca se procesa. Si el kernel descarta eventos por desborde de la cola,
+    se piden revisar todas las carpetas. inotify no ve los cambios hechos
+    desde otra máquina en volúmenes de red; para esos está ObservadorSondeo.
+    """
+    
+    nombre = 'inotify'
+    
+    def __init__(self):
+        """
+        Abre la instancia de inotify.
+        
+        Raises:
+            OSError: Si el sistema no tiene inotify o no se puede abrir
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._agregar_vigilancia = libc.inotify_add_watch
+        self._quitar_vigilancia = libc.inotify_rm_watch
+        descriptor = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if descriptor < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._descriptor = descriptor
+        self._carpetas: Dict[int, str] = {}
+    
+    def vigilar(self, carpeta: str) -> None:
+        """Empieza a vigilar una carpeta."""
+        vigilancia = self._agregar_vigilancia(self._descriptor, os.fsencode(carpeta),
+                                              _IN_CLOSE_WRITE | _IN_MOVED_TO)
+        if vigilancia < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), carpeta)
+        self._carpetas[vigilancia] = carpeta
+    
+    def dejar(self, carpeta: str) -> None:
+        """Deja de vigilar una carpeta."""
+        for vigilancia, vigilada in list(self._carpetas.items()):
+            if vigilada == carpeta:
+                self._quitar_vigilancia(self._descriptor, vigilancia)
+                del self._carpetas[vigilancia]
+    
+    def esperar(self, timeout: float) -> Cambios:
+        """
+        Espera eventos y entrega los archivos que terminaron de llegar.
+        
+        Args:
+            timeout: Segundos máximos de espera si no llega ningún evento
+        
+        Returns:
+            Diccionario {carpeta: nombres de los archivos nuevos o modificados,
+            o None si hay que revisarla completa}
+        """
+        listos, _, _ = select.select([self._descriptor], [], [], timeout)
+        if not listos:
+            return {}
+        
+        cambios: Dict[str, Set[str]] = {}
+        desborde = False
+        while True:
+            try:
+                datos = os.read(self._descriptor, 64 * 1024)
+            except BlockingIOError:
+                break
+            posicion = 0
+            while posicion < len(datos):
+                vigilancia, mascara, _, longitud = _EVENTO_INOTIFY.unpack_from(datos, posicion)
+                posicion += _EVENTO_INOTIFY.size
+                nombre = os.fsdecode(datos[posicion:posicion + longitud].rstrip(b'\0'))
+                posicion += longitud
+                
+                if mascara & _IN_Q_OVERFLOW:
+                    desborde = True
+                elif mascara & _IN_IGNORED:
+                    # La carpeta se borró o se desmontó
+                    self._carpetas.pop(vigilancia, None)
+                elif nombre and vigilancia in self._carpetas:
+                    cambios.setdefault(self._carpetas[vigilancia], set()).add(nombre)
+        
+        if desborde:
+            logger.warning("Se perdieron eventos de inotify; se revisan todas las carpetas")
+            return {carpeta: None for carpeta in self._carpetas.values()}
+        return cambios
+    
+    def cerrar(self) -> None:
+        """Cierra la instancia de inotify."""
+        os.close(self._descriptor)
+        self._carpetas.clear()
+
+
+Observador = Union[ObservadorInotify, ObservadorSondeo]
+
+
+def crear_observador(sondeo: bool = False) -> Observador:
+    """
+    Crea el observador de carpetas más eficiente disponible.
+    
+    Args:
+        sondeo: Si es True, se sondea aunque el sistema tenga inotify
+    
+    Returns:
+        ObservadorInotify en Linux; ObservadorSondeo si se pide o si inotify no está disponible
+    """
+    if not sondeo and sys.platform.startswith('linux'):
+        try:
+            return ObservadorInotify()
+        except (OSError, AttributeError) as e:
+            logger.warning(f"inotify no está disponible, se sondean las carpetas: {e}")
+    return ObservadorSondeo()
+
+
+class JuzgadoVigilado:
+    """Un juzgado en el modo watch, con sus estados y su buscador en memoria."""
+    
+    def __init__(self, manager: JuzgadoManager, incluir_radicado: bool = False):
+        """
+        Inicializa el juzgado vigilado; los estados se cargan con refrescar_estados.
+        
+        Args:
+            manager: Gestor del juzgado, que conserva abiertas su caché y su historial
+            incluir_radicado: Si es True, también se busca el radicado de cada estado
+        """
+        self.manager = manager
+        self.incluir_radicado = incluir_radicado
+        self.estados: Optional[Sequence[EstadoProcesal]] = None
+        self.matcher: Optional[MatcherNormalizado] = None
+        self.nuevos: List[EstadoProcesal] = []
+        self.proximo_refresco = 0.0
+    
+    @property
+    def carpeta_pdf(self) -> str:
+        """Carpeta de PDFs del juzgado."""
+        return self.manager.config.carpeta_pdf
+    
+    def refrescar_estados(self) -> None:
+        """
+        Consulta los estados en MongoDB y actualiza el buscador.
+        
+        Con settings.cache_estados solo se piden los cambios y el buscador
+        se actualiza en el lugar; sin la caché se reconstruye el buscador
+        con todos los estados. En ambos casos los estados agregados quedan
+        en self.nuevos para buscarlos en los PDFs ya revisados.
+        """
+        if not settings.cache_estados:
+            estados = self.manager.obtener_estados_procesales()
+            anteriores = set(self.estados) if self.estados is not None else set()
+            self.matcher = self.manager.crear_matcher(estados, self.incluir_radicado)
+            self.estados = estados
+            self.nuevos.extend(estado for estado in estados if estado not in anteriores)
+            return
+        
+        # Sin flujo de cambios se relee la colección tan seguido como sin la caché
+        estados, cambios = self.manager.sincronizar_estados(settings.watch_refresco_estados)
+        if self.matcher is None:
+            self.matcher = self.manager.crear_matcher(estados, self.incluir_radicado)
+        else:
+            # Un texto se deja de buscar solo si ningún estado vigente lo usa
+            quitados = {texto for estado in cambios.eliminados for texto in self._textos(estado)}
+            if quitados:
+                quitados.difference_update(texto for estado in estados for texto in self._textos(estado))
+            for texto in quitados:
+                self.matcher.quitar_patron(texto)
+            for estado in cambios.agregados:
+                for texto in self._textos(estado):
+                    self.matcher.agregar_patron(texto)
+        self.estados = estados
+        self.nuevos.extend(cambios.agregados)
+    
+    def _textos(self, estado: EstadoProcesal) -> List[str]:
+        """Textos que se buscan para un estado."""
+        if self.incluir_radicado and estado.radicado:
+            return [estado.numero, estado.radicado]
+        return [estado.numero]
+    
+    def buscar_nuevos(self) -> int:
+        """
+        Busca los estados agregados en los PDFs ya revisados.
+        
+        Returns:
+            Estados encontrados
+        """
+        if not self.nuevos:
+            return 0
+        resultados = self.manager.buscar_estados_nuevos(self.nuevos, self.incluir_radicado,
+                                                        total=len(self.estados))
+        self.nuevos = []
+        return sum(resultado.encontrado for resultado in resultados)
+    
+    def revisar(self, archivos: Optional[Iterable[str]] = None) -> int:
+        """
+        Revisa los PDFs indicados que aún no estén en el manifest.
+        
+        Args:
+            archivos: Nombres de los PDFs. Si es None, todos los de la carpeta.
+        
+        Returns:
+            Estados encontrados
+        """
+        if self.estados is None:
+            return 0
+        if archivos is None:
+            archivos = self.manager.pdf_processor.get_pdf_files()
+        resultados = self.manager.revisar_archivos(archivos, self.estados,
+                                                   self.incluir_radicado, self.matcher)
+        return sum(resultado.encontrado for resultado in resultados)
+
+
+class VigilanteJuzgados:
+    """
+    Modo watch: revisa los PDFs a medida que llegan a las carpetas pdf/.
+    
+    Es un proceso de larga duración que conserva en memoria el cliente de
+    MongoDB, los estados y el buscador de cada juzgado, la caché de textos
+    y un pool de procesos compartido. Los PDFs que llegan (ver
+    crear_observador) se extraen y se buscan solos, y lo encontrado se
+    agrega a la revisión del día (ver JuzgadoManager.revisar_archivos). Los
+    estados se vuelven a consultar cada settings.watch_refresco_estados
+    segundos, o cada settings.watch_sincronizacion_estados con la caché de
+    estados, que solo trae los cambios; tras cada consulta se revisan los
+    PDFs que llegaron mientras el proceso no estaba corriendo y los estados
+    agregados se buscan en los PDFs ya revisados. Los juzgados agregados o
+    quitados de la configuración se notan sin reiniciar.
+    """
+    
+    def __init__(self, juzgados: Optional[List[str]] = None, workers: Optional[int] = None,
+                 extractor: Optional[str] = None, intervalo: Optional[float] = None,
+                 sondeo: Optional[bool] = None):
+        """
+        Inicializa el vigilante.
+        
+        Args:
+            juzgados: Juzgados a vigilar. Si es None, todos los configurados.
+            workers: Procesos para extraer PDFs. Si es None, se usa la configuración.
+            extractor: Backend de extracción de texto. Si es None, se usa la configuración.
+            intervalo: Segundos máximos entre dos revisiones de las carpetas.
+                Si es None, se usa settings.watch_intervalo.
+            sondeo: Si es True, se sondean las carpetas en lugar de usar
+                inotify. Si es None, se usa settings.watch_sondeo.
+        """
+        self.juzgados = juzgados
+        self.workers = max(1, workers or settings.pdf_workers)
+        self.extractor = extractor
+        self.intervalo = intervalo or settings.watch_intervalo
+        self.sondeo = settings.watch_sondeo if sondeo is None else sondeo
+        self.refresco_estados = (settings.watch_sincronizacion_estados if settings.cache_estados
+                                 else settings.watch_refresco_estados)
+        self.incluir_radicado = settings.buscar_radicado
+        self.detener = threading.Event()
+        self.vigilados: Dict[str, JuzgadoVigilado] = {}
+        self._no_vigilables: Set[str] = set()
+        self._proxima_sincronizacion = 0.0
+    
+    def ejecutar(self) -> None:
+        """Vigila las carpetas hasta que se active self.detener o se interrumpa el proceso."""
+        executor: Optional[Executor] = None
+        if self.workers > 1:
+            executor = crear_pool_extraccion(self.workers)
+        historial = self._abrir_historial()
+        observador = crear_observador(self.sondeo)
+        logger.info(f"Modo watch iniciado ({observador.nombre}, intervalo {self.intervalo:g} s)")
+        
+        try:
+            while not self.detener.is_set():
+                if time.monotonic() >= self._proxima_sincronizacion:
+                    self._sincronizar_juzgados(observador, executor, historial)
+                    self._proxima_sincronizacion = time.monotonic() + INTERVALO_JUZGADOS
+                self._refrescar_estados()
+                
+                for carpeta, archivos in observador.esperar(self.intervalo).items():
+                    vigilado = self.vigilados.get(carpeta)
+                    if vigilado is not None:
+                        self._revisar(vigilado, archivos)
+        finally:
+            observador.cerrar()
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            for vigilado in self.vigilados.values():
+                vigilado.manager.cerrar()
+            if historial is not None:
+                historial.cerrar()
+            logger.info("Modo watch terminado")
+    
+    @staticmethod
+    def _abrir_historial() -> Optional[HistorialRevisiones]:
+        """Abre el historial compartido por todos los juzgados; None si no se puede."""
+        try:
+            return HistorialRevisiones(settings.historial_revisiones_ruta)
+        except Exception as e:
+            logger.warning(f"No se pudo abrir el historial de revisiones: {e}")
+            return None
+    
+    def _sincronizar_juzgados(self, observador: Observador, executor: Optional[Executor],
+                              historial: Optional[HistorialRevisiones]) -> None:
+        """Empieza a vigilar los juzgados nuevos y deja los que ya no están configurados."""
+        configurados = settings.juzgados_config
+        nombres = self.juzgados if self.juzgados is not None else list(configurados)
+        
+        for carpeta, vigilado in list(self.vigilados.items()):
+            if vigilado.manager.nombre_juzgado not in configurados:
+                logger.info(f"Se deja de vigilar {vigilado.manager.nombre_juzgado}")
+                observador.dejar(carpeta)
+                vigilado.manager.cerrar()
+                del self.vigilados[carpeta]
+        
+        vigilados = {vigilado.manager.nombre_juzgado for vigilado in self.vigilados.values()}
+        for nombre in nombres:
+            if nombre in vigilados or nombre not in configurados:
+                continue
+            try:
+                manager = JuzgadoManager(nombre, workers=self.workers, executor=executor,
+                                         extractor=self.extractor, historial=historial)
+                observador.vigilar(manager.config.carpeta_pdf)
+            except Exception as e:
+                if nombre not in self._no_vigilables:
+                    logger.warning(f"No se puede vigilar {nombre}: {e}")
+                    self._no_vigilables.add(nombre)
+                continue
+            self._no_vigilables.discard(nombre)
+            self.vigilados[manager.config.carpeta_pdf] = JuzgadoVigilado(manager, self.incluir_radicado)
+            logger.info(f"Vigilando {manager.config.carpeta_pdf}")
+    
+    def _refrescar_estados(self) -> None:
+        """Consulta los estados vencidos y revisa los PDFs que llegaron sin ser procesados."""
+        for vigilado in list(self.vigilados.values()):
+            if self.detener.is_set():
+                return
+            if time.monotonic() < vigilado.proximo_refresco:
+                continue
+            nombre = vigilado.manager.nombre_juzgado
+            try:
+                vigilado.refrescar_estados()
+            except Exception as e:
+                logger.error(f"Error consultando los estados de {nombre}: {e}")
+                vigilado.proximo_refresco = time.monotonic() + min(self.refresco_estados,
+                                                                   REINTENTO_ESTADOS)
+                continue
+            vigilado.proximo_refresco = time.monotonic() + self.refresco_estados
+            self._revisar(vigilado, None)
+            try:
+                vigilado.buscar_nuevos()
+            except Exception as e:
+                logger.error(f"Error buscando los estados nuevos de {nombre}: {e}")
+    
+    @staticmethod
+    def _revisar(vigilado: JuzgadoVigilado, archivos: Optional[Iterable[str]]) -> None:
+        """Revisa PDFs de un juzgado sin dejar que un error detenga la vigilancia."""
+        try:
+            vigilado.revisar(archivos)
+        except Exception as e:
+            logger.error(f"Error revisando PDFs nuevos de {vigilado.manager.nombre_juzgado}: {e}")
@@ -0,0 +1,172 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class Metricas:
+    """
+    Temporizadores y contadores de las etapas de una revisión.
+    
+    Cada etapa acumula su tiempo total, número de llamadas y máximo; los
+    contadores acumulan cantidades (estados, PDFs, bytes...) y cada PDF
+    extraído queda registrado con su tamaño, páginas y duración. Es seguro
+    usarlo desde varios hilos.
+    """
+    
+    def __init__(self, nombre: str):
+        """
+        Inicializa las métricas vacías.
+        
+        Args:
+            nombre: Juzgado o ejecución a la que pertenecen
+        """
+        self.nombre = nombre
+        self.inicio = datetime.now()
+        self.etapas: Dict[str, Dict[str, float]] = {}
+        self.contadores: Dict[str, float] = {}
+        self.archivos: List[dict] = []
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def medir(self, etapa: str) -> Iterator[None]:
+        """
+        Mide el tiempo de un bloque y lo suma a una etapa.
+        
+        Args:
+            etapa: Nombre de la etapa
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar_tiempo(etapa, time.perf_counter() - inicio)
+    
+    def registrar_tiempo(self, etapa: str, segundos: float, llamadas: int = 1) -> None:
+        """
+        Suma una duración a una etapa.
+        
+        Args:
+            etapa: Nombre de la etapa
+            segundos: Duración medida
+            llamadas: Número de veces que se ejecutó la etapa en esa duración
+        """
+        milisegundos = segundos * 1000
+        with self._lock:
+            datos = self.etapas.setdefault(etapa, {'total_ms': 0.0, 'llamadas': 0, 'max_ms': 0.0})
+            datos['total_ms'] += milisegundos
+            datos['llamadas'] += llamadas
+            datos['max_ms'] = max(datos['max_ms'], milisegundos / max(1, llamadas))
+    
+    def incrementar(self, contador: str, valor: float = 1) -> None:
+        """
+        Incrementa un contador.
+        
+        Args:
+            contador: Nombre del contador
+            valor: Cantidad a sumar
+        """
+        with self._lock:
+            self.contadores[contador] = self.contadores.get(contador, 0) + valor
+    
+    def registrar_archivo(self, nombre_archivo: str, bytes_archivo: int, paginas: int,
+                          segundos: float, origen: str) -> None:
+        """
+        Registra la extracción de un PDF y la suma a la etapa 'extraccion'.
+        
+        Args:
+            nombre_archivo: Nombre del PDF
+            bytes_archivo: Tamaño del PDF
+            paginas: Páginas extraídas
+            segundos: Duración de la extracción
+            origen: 'extraccion' si se leyó el PDF o 'cache' si vino de la caché
+        """
+        with self._lock:
+            self.archivos.append({
+                'archivo': nombre_archivo,
+                'bytes': bytes_archivo,
+                'paginas': paginas,
+                'ms': round(segundos * 1000, 3),
+                'origen': origen,
+            })
+        self.incrementar(f'pdfs_{origen}')
+        self.incrementar('paginas', paginas)
+        self.incrementar('bytes_pdf', bytes_archivo)
+        if origen == 'extraccion':
+            self.registrar_tiempo('extraccion', segundos)
+    
+    def combinar(self, otras: Iterable['Metricas']) -> None:
+        """
+        Agrega las etapas y contadores de otras métricas a estas.
+        
+        Args:
+            otras: Métricas a agregar, por ejemplo las de cada juzgado
+        """
+        for otra in otras:
+            with otra._lock:
+                etapas = {etapa: dict(datos) for etapa, datos in otra.etapas.items()}
+                contadores = dict(otra.contadores)
+            with self._lock:
+                for etapa, datos in etapas.items():
+                    propios = self.etapas.setdefault(etapa, {'total_ms': 0.0, 'llamadas': 0, 'max_ms': 0.0})
+                    propios['total_ms'] += datos['total_ms']
+                    propios['llamadas'] += datos['llamadas']
+                    propios['max_ms'] = max(propios['max_ms'], datos['max_ms'])
+                for contador, valor in contadores.items():
+                    self.contadores[contador] = self.contadores.get(contador, 0) + valor
+    
+    def resumen(self, incluir_archivos: bool = True) -> dict:
+        """
+        Obtiene el resumen estructurado de las métricas.
+        
+        Args:
+            incluir_archivos: Si es True, incluye el detalle de cada PDF
+        
+        Returns:
+            Diccionario serializable a JSON
+        """
+        with self._lock:
+            resumen = {
+                'nombre': self.nombre,
+                'inicio': self.inicio.isoformat(timespec='seconds'),
+                'duracion_s': round((datetime.now() - self.inicio).total_seconds(), 3),
+                'etapas': {
+                    etapa: {
+                        'total_ms': round(datos['total_ms'], 3),
+                        'llamadas': datos['llamadas'],
+                        'max_ms': round(datos['max_ms'], 3),
+                    }
+                    for etapa, datos in self.etapas.items()
+                },
+                'contadores': dict(self.contadores),
+            }
+            if incluir_archivos:
+                resumen['archivos'] = list(self.archivos)
+        return resumen
+    
+    def guardar(self, ruta: str, extra: Optional[dict] = None) -> str:
+        """
+        Guarda el resumen en JSON de forma atómica.
+        
+        Args:
+            ruta: Ruta del archivo JSON
+            extra: Campos adicionales para el resumen
+        
+        Returns:
+            Ruta del archivo guardado
+        """
+        datos = self.resumen()
+        if extra:
+            datos.update(extra)
+        
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        temporal = f"{ruta}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(datos, archivo, ensure_ascii=False, indent=2)
+        os.replace(temporal, ruta)
+        return ruta
@@ -0,0 +1,100 @@
+import cProfile
+import io
+import os
+import pstats
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+# Componentes que se reportan por separado, identificados por su módulo
+COMPONENTES = {
+    'PDFProcessor': os.path.join('core', 'pdf_processor.py'),
+    'DatabaseManager': os.path.join('core', 'database.py'),
+    'FileManager': os.path.join('core', 'file_manager.py'),
+}
+
+
+def ruta_perfil_por_defecto() -> str:
+    """Ruta del archivo .prof cuando no se indica una."""
+    return f"perfil_{datetime.now():%Y-%m-%d_%H%M%S}.prof"
+
+
+def perfilar(funcion: Callable[[], Any], ruta_prof: str, top: int = 30) -> Tuple[Any, str]:
+    """
+    Ejecuta una función bajo cProfile y guarda el perfil y su resumen.
+    
+    Args:
+        funcion: Función sin argumentos a perfilar
+        ruta_prof: Ruta del archivo .prof (se puede abrir con snakeviz o pstats)
+        top: Número de funciones a listar en el resumen
+    
+    Returns:
+        Tupla (resultado de la función, ruta del resumen en texto)
+    """
+    perfil = cProfile.Profile()
+    try:
+        resultado = perfil.runcall(funcion)
+    finally:
+        perfil.dump_stats(ruta_prof)
+        ruta_resumen = os.path.splitext(ruta_prof)[0] + '.txt'
+        with open(ruta_resumen, 'w', encoding='utf-8') as archivo:
+            archivo.write(resumir_perfil(pstats.Stats(ruta_prof), top))
+    return resultado, ruta_resumen
+
+
+def _funciones_de_componente(estadisticas: Dict, modulo: str) -> List[Tuple[str, int, float, float]]:
+    """Obtiene (función, llamadas, tiempo propio, tiempo acumulado) de un módulo."""
+    funciones = []
+    for (archivo, linea, nombre), (_, llamadas, propio, acumulado, _) in estadisticas.items():
+        if archivo.endswith(modulo):
+            funciones.append((f"{nombre}:{linea}", llamadas, propio, acumulado))
+    return sorted(funciones, key=lambda funcion: funcion[3], reverse=True)
+
+
+def resumir_perfil(stats: pstats.Stats, top: int = 30) -> str:
+    """
+    Genera el resumen de puntos calientes de un perfil.
+    
+    Incluye, para cada componente, el tiempo acumulado de su función más
+    externa (su tiempo inclusivo aproximado), el tiempo propio de sus
+    funciones y sus funciones más costosas, y al final el top global por
+    tiempo acumulado y por tiempo propio.
+    
+    Args:
+        stats: Estadísticas de cProfile
+        top: Número de funciones a listar en cada sección
+    
+    Returns:
+        Texto del resumen
+    """
+    estadisticas = stats.stats
+    salida = io.StringIO()
+    salida.write(f"=== PERFIL ({stats.total_tt:.3f} s en total) ===\n\n")
+    
+    salida.write("=== POR COMPONENTE ===\n")
+    for componente, modulo in COMPONENTES.items():
+        funciones = _funciones_de_componente(estadisticas, modulo)
+        if not funciones:
+            salida.write(f"\n{componente}: sin llamadas\n")
+            continue
+        inclusivo = funciones[0][3]
+        propio = sum(funcion[2] for funcion in funciones)
+        porcentaje = (inclusivo / stats.total_tt * 100) if stats.total_tt else 0
+        salida.write(f"\n{componente}: {inclusivo:.3f} s acumulado ({porcentaje:.1f}%), "
+                     f"{propio:.3f} s propio\n")
+        salida.write(f"  {'llamadas':>10} {'propio (s)':>11} {'acum. (s)':>10}  función\n")
+        for nombre, llamadas, tiempo_propio, acumulado in funciones[:top]:
+            salida.write(f"  {llamadas:>10} {tiempo_propio:>11.4f} {acumulado:>10.4f}  {nombre}\n")
+    
+    for titulo, orden in (('TIEMPO ACUMULADO', pstats.SortKey.CUMULATIVE),
+                          ('TIEMPO PROPIO', pstats.SortKey.TIME)):
+        texto = io.StringIO()
+        stats.stream = texto
+        stats.sort_stats(orden).print_stats(top)
+        salida.write(f"\n=== TOP {top} POR {titulo} ===\n")
+        # Se omite el encabezado de pstats con la ruta del archivo
+        lineas = texto.getvalue().splitlines()
+        inicio = next((i for i, linea in enumerate(lineas) if 'ncalls' in linea), 0)
+        salida.write('\n'.join(lineas[inicio:]).rstrip() + '\n')
+    
+    return salida.getvalue()
+
@@ -1,6 +1,5 @@
 import os
 import pymongo
-import pandas as pd
 import certifi
 from datetime import date
 import pdfplumber
@@ -19,11 +18,8 @@ def conectar_mongodb(usuario, contrasena, db_name, collection_name):
     coleccion = base_datos[collection_name]
     return coleccion
 
-def obtener_dataframe(coleccion):
-    datos = coleccion.find()
-    lista_datos = list(datos)
-    df = pd.DataFrame(lista_datos)
-    return df
+def obtener_documentos(coleccion):
+    return coleccion.find({}, {'numero': 1, 'radicado': 1})
 
 def buscar_numero_en_pdfs(numero, carpeta_pdf):
     archivos_encontrados = []
@@ -53,9 +49,8 @@ def main():
     carpeta_revision = os.path.join(carpeta_raiz, 'revision')
     nombre_carpeta_raiz = os.path.basename(os.path.dirname(os.path.abspath(__file__)))
     coleccion = conectar_mongodb(usuario, contrasena, "dbestados", nombre_carpeta_raiz)
-    df = obtener_dataframe(coleccion)
-    for _, fila in df.iterrows():
-        numero = fila['numero']
-        radicado = fila['radicado']
+    for documento in obtener_documentos(coleccion):
+        numero = documento['numero']
+        radicado = documento['radicado']
         archivos_encontrados = buscar_numero_en_pdfs(numero, carpeta_pdf)
         escribir_resultado(carpeta_revision, numero, radicado, archivos_encontrados)
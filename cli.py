@@ -6,16 +6,26 @@ Interfaz de línea de comandos para el sistema de búsqueda de estados procesale
 import argparse
 import sys
 import os
+from typing import TYPE_CHECKING
 
 # Agregar el directorio del proyecto al path
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
-from buscador_estados.juzgados.manager import MultiJuzgadoManager, JuzgadoManager
+# Solo se importa aquí lo liviano: el gestor de juzgados (y con él asyncio,
+# pymongo o pdfplumber) se carga en los comandos que lo usan, para que
+# --list, --help o las consultas arranquen rápido.
+from buscador_estados.config.settings import settings
 from buscador_estados.utils.logger import setup_logger
 
+if TYPE_CHECKING:
+    from buscador_estados.core.historial import HistorialRevisiones
+
 logger = setup_logger('cli')
 
+# Los mismos nombres que pdf_processor.EXTRACTORES, sin importar ese módulo
+BACKENDS = ('auto', 'flujos', 'pdfplumber')
+
 
 def crear_parser() -> argparse.ArgumentParser:
     """Crea el parser de argumentos de línea de comandos."""
@@ -28,6 +38,17 @@ Ejemplos de uso:
   %(prog)s --juzgado JPMCONTADERO       # Procesar solo un juzgado
   %(prog)s --list                       # Listar juzgados disponibles
   %(prog)s --verbose                    # Ejecutar con logs detallados
+  %(prog)s --workers 4                  # Extraer PDFs con 4 procesos
+  %(prog)s --concurrentes 3             # Procesar 3 juzgados a la vez
+  %(prog)s --completo                   # Revisar de nuevo todos los PDFs
+  %(prog)s --backend auto               # Extracción rápida con respaldo en pdfplumber
+  %(prog)s -j JPMCONTADERO --profile    # Perfilar la ejecución con cProfile
+  %(prog)s indexar                      # Actualizar el índice de radicados
+  %(prog)s buscar 2025-00042            # Dónde ha aparecido un radicado o proceso
+  %(prog)s historial --importar         # Cargar al historial los reportes existentes
+  %(prog)s historial 2025-00042         # Primera y última revisión que lo encontró
+  %(prog)s historial -j JPMCONTADERO    # Estados encontrados por fecha
+  %(prog)s watch                        # Revisar los PDFs a medida que llegan
         """
     )
     
@@ -43,12 +64,106 @@ Ejemplos de uso:
         help='Listar todos los juzgados disponibles'
     )
     
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=None,
+        metavar='N',
+        help='Número de procesos para extraer texto de los PDFs en paralelo'
+    )
+    
+    parser.add_argument(
+        '--concurrentes', '-c',
+        type=int,
+        default=None,
+        metavar='N',
+        help='Número de juzgados que se procesan a la vez'
+    )
+    
+    parser.add_argument(
+        '--completo',
+        action='store_true',
+        help='Revisar todos los PDFs, no solo los nuevos o modificados'
+    )
+    
+    parser.add_argument(
+        '--backend', '-b',
+        choices=BACKENDS,
+        default=None,
+        help='Backend de extracción de texto de los PDFs (por defecto PDF_BACKEND o pdfplumber)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='',
+        default=None,
+        metavar='ARCHIVO',
+        help='Perfilar la ejecución con cProfile y guardar ARCHIVO.prof y su resumen .txt'
+    )
+    
+    parser.add_argument(
+        '--profile-top',
+        type=int,
+        default=30,
+        metavar='N',
+        help='Funciones listadas en el resumen del perfil (por defecto 30)'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
         help='Mostrar logs detallados'
     )
     
+    subparsers = parser.add_subparsers(dest='comando', metavar='COMANDO')
+    
+    parser_buscar = subparsers.add_parser(
+        'buscar',
+        help='Buscar en el índice dónde ha aparecido un radicado o número de proceso'
+    )
+    parser_buscar.add_argument(
+        'consulta',
+        help='Radicado de 23 dígitos o número de proceso (AAAA-NNNNN)'
+    )
+    
+    subparsers.add_parser(
+        'indexar',
+        help='Actualizar el índice de radicados con los PDFs de los juzgados'
+    )
+    
+    parser_historial = subparsers.add_parser(
+        'historial',
+        help='Consultar en qué revisiones se encontró un radicado o cuántos estados por fecha'
+    )
+    parser_historial.add_argument(
+        'consulta',
+        nargs='?',
+        help='Radicado o número de proceso. Sin él se muestran los estados encontrados por fecha'
+    )
+    parser_historial.add_argument(
+        '--importar',
+        action='store_true',
+        help='Cargar antes en el historial los reportes revision/*.txt que aún no estén'
+    )
+    
+    parser_watch = subparsers.add_parser(
+        'watch',
+        help='Vigilar las carpetas pdf/ y revisar cada PDF nuevo a medida que llega'
+    )
+    parser_watch.add_argument(
+        '--intervalo',
+        type=float,
+        default=None,
+        metavar='SEG',
+        help='Segundos máximos entre revisiones de las carpetas (por defecto WATCH_INTERVALO o 2)'
+    )
+    parser_watch.add_argument(
+        '--sondeo',
+        action='store_true',
+        help='Sondear las carpetas en lugar de usar inotify, por ejemplo en volúmenes de red'
+    )
+    
     parser.add_argument(
         '--version',
         action='version',
@@ -61,7 +176,7 @@ Ejemplos de uso:
 def listar_juzgados():
     """Lista todos los juzgados disponibles."""
     try:
-        juzgados = MultiJuzgadoManager.get_juzgados_disponibles()
+        juzgados = list(settings.juzgados_config)
         
         if not juzgados:
             print("No se encontraron juzgados configurados.")
@@ -80,8 +195,11 @@ def listar_juzgados():
         return 1
 
 
-def procesar_juzgado_especifico(nombre_juzgado: str):
+def procesar_juzgado_especifico(nombre_juzgado: str, workers: int = None,
+                                incremental: bool = True, extractor: str = None):
     """Procesa un juzgado específico."""
+    from buscador_estados.juzgados.manager import MultiJuzgadoManager
+    
     try:
         juzgados_disponibles = MultiJuzgadoManager.get_juzgados_disponibles()
         
@@ -93,7 +211,8 @@ def procesar_juzgado_especifico(nombre_juzgado: str):
             return 1
         
         logger.info(f"Procesando juzgado: {nombre_juzgado}")
-        MultiJuzgadoManager.procesar_juzgado(nombre_juzgado)
+        MultiJuzgadoManager.procesar_juzgado(nombre_juzgado, workers=workers,
+                                             incremental=incremental, extractor=extractor)
         
         print(f"✓ Juzgado {nombre_juzgado} procesado exitosamente")
         return 0
@@ -104,8 +223,11 @@ def procesar_juzgado_especifico(nombre_juzgado: str):
         return 1
 
 
-def procesar_todos_los_juzgados():
+def procesar_todos_los_juzgados(workers: int = None, concurrentes: int = None,
+                                incremental: bool = True, extractor: str = None):
     """Procesa todos los juzgados."""
+    from buscador_estados.juzgados.manager import MultiJuzgadoManager
+    
     try:
         juzgados = MultiJuzgadoManager.get_juzgados_disponibles()
         
@@ -116,7 +238,19 @@ def procesar_todos_los_juzgados():
         print(f"Procesando {len(juzgados)} juzgados...")
         print("=" * 50)
         
-        MultiJuzgadoManager.procesar_todos_los_juzgados()
+        resultados = MultiJuzgadoManager.procesar_todos_los_juzgados(
+            workers=workers,
+            max_juzgados=concurrentes,
+            incremental=incremental,
+            extractor=extractor
+        )
+        
+        fallidos = {juzgado: error for juzgado, error in resultados.items() if error is not None}
+        if fallidos:
+            print(f"✗ {len(fallidos)} de {len(resultados)} juzgados fallaron:")
+            for juzgado, error in fallidos.items():
+                print(f"  - {juzgado}: {error}")
+            return 1
         
         print("✓ Todos los juzgados procesados exitosamente")
         return 0
@@ -127,11 +261,235 @@ def procesar_todos_los_juzgados():
         return 1
 
 
+def buscar_en_indice(consulta: str):
+    """Muestra dónde ha aparecido un radicado o número de proceso."""
+    from buscador_estados.core.indice import IndiceRadicados, normalizar_consulta
+    
+    if normalizar_consulta(consulta) is None:
+        print(f"Error: '{consulta}' no es un radicado de 23 dígitos ni un número de proceso.")
+        return 1
+    
+    if not os.path.exists(settings.indice_radicados_ruta):
+        print("El índice de radicados no existe. Ejecute primero: cli.py indexar")
+        return 1
+    
+    indice = IndiceRadicados(settings.indice_radicados_ruta)
+    try:
+        apariciones = indice.buscar(consulta)
+    finally:
+        indice.cerrar()
+    
+    if not apariciones:
+        print(f"No se encontró '{consulta}' en el índice.")
+        return 0
+    
+    print(f"Apariciones de '{consulta}':")
+    print("=" * 50)
+    for juzgado, pdf, pagina in apariciones:
+        print(f"  {juzgado} | {pdf} | página {pagina}")
+    
+    print(f"\nTotal: {len(apariciones)} apariciones")
+    return 0
+
+
+def actualizar_indice(nombre_juzgado: str = None, workers: int = None, extractor: str = None):
+    """Actualiza el índice de radicados con los PDFs de uno o todos los juzgados."""
+    from buscador_estados.core.indice import IndiceRadicados
+    from buscador_estados.juzgados.manager import JuzgadoManager, MultiJuzgadoManager
+    
+    juzgados = [nombre_juzgado] if nombre_juzgado else MultiJuzgadoManager.get_juzgados_disponibles()
+    indice = IndiceRadicados(settings.indice_radicados_ruta)
+    fallidos = 0
+    
+    try:
+        for juzgado in juzgados:
+            carpeta_base = settings.juzgados_config.get(juzgado)
+            if carpeta_base is None:
+                logger.error(f"Juzgado no encontrado: {juzgado}")
+                fallidos += 1
+                continue
+            # Sin carpeta de PDFs no hay nada que indexar ni caché que crear
+            if not os.path.isdir(os.path.join(carpeta_base, 'pdf')):
+                logger.warning(f"{juzgado} no tiene carpeta pdf; se omite")
+                continue
+            
+            manager = None
+            try:
+                manager = JuzgadoManager(juzgado, workers=workers, indice=indice,
+                                         extractor=extractor)
+                manager.actualizar_indice()
+            except Exception as e:
+                logger.error(f"Error indexando {juzgado}: {e}")
+                fallidos += 1
+            finally:
+                if manager is not None:
+                    manager.cerrar()
+    finally:
+        indice.cerrar()
+    
+    print(f"✓ Índice actualizado: {len(juzgados) - fallidos} de {len(juzgados)} juzgados")
+    return 1 if fallidos else 0
+
+
+def importar_historial(historial: 'HistorialRevisiones', nombre_juzgado: str = None) -> int:
+    """Carga en el historial los reportes de revisión de uno o todos los juzgados."""
+    juzgados_config = settings.juzgados_config
+    juzgados = [nombre_juzgado] if nombre_juzgado else list(juzgados_config)
+    importados = 0
+    fallidos = 0
+    
+    # Solo se leen los reportes: no hace falta un JuzgadoManager con sus cachés
+    for juzgado in juzgados:
+        try:
+            if juzgado not in juzgados_config:
+                raise ValueError(f"Juzgado no encontrado: {juzgado}")
+            importados += historial.importar_reportes(
+                juzgado, os.path.join(juzgados_config[juzgado], 'revision')
+            )
+        except Exception as e:
+            logger.error(f"Error importando el historial de {juzgado}: {e}")
+            fallidos += 1
+    
+    print(f"✓ Historial actualizado: {importados} reportes importados de "
+          f"{len(juzgados) - fallidos} juzgados")
+    return 1 if fallidos else 0
+
+
+def consultar_historial(consulta: str = None, nombre_juzgado: str = None,
+                        importar: bool = False) -> int:
+    """Muestra la primera y última aparición de un radicado o los conteos por fecha."""
+    from buscador_estados.core.historial import HistorialRevisiones
+    from buscador_estados.core.indice import normalizar_consulta
+    
+    if consulta is not None and normalizar_consulta(consulta) is None:
+        print(f"Error: '{consulta}' no es un radicado de 23 dígitos ni un número de proceso.")
+        return 1
+    
+    if not importar and not os.path.exists(settings.historial_revisiones_ruta):
+        print("El historial de revisiones no existe. Ejecute primero: cli.py historial --importar")
+        return 1
+    
+    historial = HistorialRevisiones(settings.historial_revisiones_ruta)
+    try:
+        codigo = importar_historial(historial, nombre_juzgado) if importar else 0
+        
+        if consulta is None:
+            conteos = historial.conteos_por_fecha(nombre_juzgado)
+            if not conteos:
+                print("El historial está vacío.")
+                return codigo
+            
+            print(f"Estados encontrados por fecha{f' en {nombre_juzgado}' if nombre_juzgado else ''}:")
+            print("=" * 50)
+            for fecha, encontrados, revisados, juzgados in conteos:
+                revisados = f" de {revisados}" if revisados is not None else ""
+                print(f"  {fecha} | {encontrados}{revisados} estados | {juzgados} juzgados")
+            return codigo
+        
+        apariciones = historial.apariciones(consulta)
+        primera = historial.primera_aparicion(consulta)
+        ultima = historial.ultima_aparicion(consulta)
+    finally:
+        historial.cerrar()
+    
+    if not apariciones:
+        print(f"'{consulta}' no aparece en el historial de revisiones.")
+        return codigo
+    
+    fechas = {fecha for fecha, *_ in apariciones}
+    print(f"Historial de '{consulta}':")
+    print("=" * 50)
+    print(f"  Primera aparición: {primera[0]} en {primera[1]}")
+    print(f"  Última aparición:  {ultima[0]} en {ultima[1]}")
+    print(f"  Encontrado en {len(fechas)} fechas\n")
+    for fecha, juzgado, numero, radicado, archivos in apariciones:
+        print(f"  {fecha} | {juzgado} | {numero} | {', '.join(archivos)}")
+    return codigo
+
+
+def vigilar_juzgados(nombre_juzgado: str = None, workers: int = None, extractor: str = None,
+                     intervalo: float = None, sondeo: bool = False) -> int:
+    """Vigila las carpetas pdf/ y revisa los PDFs nuevos hasta que se interrumpa."""
+    import signal
+    from buscador_estados.juzgados.vigilante import VigilanteJuzgados
+    
+    if nombre_juzgado and nombre_juzgado not in settings.juzgados_config:
+        print(f"Error: Juzgado '{nombre_juzgado}' no encontrado.")
+        return 1
+    
+    vigilante = VigilanteJuzgados(
+        [nombre_juzgado] if nombre_juzgado else None,
+        workers=workers,
+        extractor=extractor,
+        intervalo=intervalo,
+        sondeo=True if sondeo else None
+    )
+    # Un SIGTERM (systemd, docker stop) termina la vigilancia igual que Ctrl+C
+    signal.signal(signal.SIGTERM, lambda *_: vigilante.detener.set())
+    
+    print("Vigilando las carpetas pdf/ de los juzgados (Ctrl+C para terminar)...")
+    try:
+        vigilante.ejecutar()
+    except KeyboardInterrupt:
+        pass
+    print("✓ Vigilancia terminada")
+    return 0
+
+
+def ejecutar_comando(args) -> int:
+    """Ejecuta el comando solicitado en la línea de comandos."""
+    if args.comando == 'buscar':
+        return buscar_en_indice(args.consulta)
+    elif args.comando == 'indexar':
+        return actualizar_indice(args.juzgado, args.workers, args.backend)
+    elif args.comando == 'historial':
+        return consultar_historial(args.consulta, args.juzgado, args.importar)
+    elif args.comando == 'watch':
+        if args.intervalo is not None and args.intervalo <= 0:
+            print("Error: --intervalo debe ser mayor que 0")
+            return 1
+        return vigilar_juzgados(args.juzgado, args.workers, args.backend, args.intervalo,
+                                args.sondeo)
+    elif args.list:
+        return listar_juzgados()
+    elif args.juzgado:
+        return procesar_juzgado_especifico(args.juzgado, args.workers, not args.completo,
+                                           args.backend)
+    else:
+        return procesar_todos_los_juzgados(args.workers, args.concurrentes, not args.completo,
+                                           args.backend)
+
+
+def ejecutar_con_perfil(args) -> int:
+    """Ejecuta el comando bajo cProfile y guarda el perfil y su resumen."""
+    from buscador_estados.utils.perfilado import perfilar, ruta_perfil_por_defecto
+    
+    ruta_prof = args.profile or ruta_perfil_por_defecto()
+    if (args.workers or settings.pdf_workers) > 1:
+        print("Nota: la extracción en procesos de trabajo no aparece en el perfil; "
+              "use --workers 1 para perfilarla.")
+    
+    try:
+        codigo, ruta_resumen = perfilar(lambda: ejecutar_comando(args), ruta_prof, args.profile_top)
+    finally:
+        print(f"Perfil guardado en {ruta_prof}")
+    
+    print(f"Resumen de puntos calientes en {ruta_resumen}")
+    return codigo
+
+
 def main():
     """Función principal de la CLI."""
     parser = crear_parser()
     args = parser.parse_args()
     
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers debe ser un entero mayor o igual a 1')
+    if args.concurrentes is not None and args.concurrentes < 1:
+        parser.error('--concurrentes debe ser un entero mayor o igual a 1')
+    if args.profile_top < 1:
+        parser.error('--profile-top debe ser un entero mayor o igual a 1')
+    
     # Configurar nivel de logging
     log_level = 'DEBUG' if args.verbose else 'INFO'
     import logging
@@ -139,12 +497,9 @@ def main():
     
     try:
         # Ejecutar comando solicitado
-        if args.list:
-            return listar_juzgados()
-        elif args.juzgado:
-            return procesar_juzgado_especifico(args.juzgado)
-        else:
-            return procesar_todos_los_juzgados()
+        if args.profile is not None:
+            return ejecutar_con_perfil(args)
+        return ejecutar_comando(args)
             
     except KeyboardInterrupt:
         print("\n✗ Proceso interrumpido por el usuario")
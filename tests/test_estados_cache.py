@@ -0,0 +1,71 @@
+"""
+Pruebas de la copia local de los estados de un juzgado (core/estados_cache.py).
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from buscador_estados.core.estados_cache import CacheEstados
+from buscador_estados.core.models import EstadoProcesal
+
+
+def estado(id_estado, numero, radicado='05001310300120250004200'):
+    return EstadoProcesal(numero=numero, radicado=radicado, id=id_estado)
+
+
+class TestCacheEstados(unittest.TestCase):
+    
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.carpeta.name, '.cache_estados.sqlite3')
+        self.cache = CacheEstados(self.ruta)
+    
+    def tearDown(self):
+        self.cache.cerrar()
+        self.carpeta.cleanup()
+    
+    def test_aplicar_entrega_solo_los_cambios_efectivos(self):
+        cambios = self.cache.aplicar([estado('1', '00001'), estado('2', '00002')])
+        self.assertEqual([e.numero for e in cambios.agregados], ['00001', '00002'])
+        self.assertEqual(cambios.eliminados, [])
+        
+        # Sin cambios reales no hay nada que volver a buscar
+        self.assertFalse(self.cache.aplicar([estado('1', '00001')]))
+        
+        cambios = self.cache.aplicar([estado('1', '00011')], eliminados=['2', '9'])
+        self.assertEqual(cambios.agregados, [estado('1', '00011')])
+        self.assertEqual(cambios.eliminados, [estado('1', '00001'), estado('2', '00002')])
+        self.assertEqual(list(self.cache.estados()), [estado('1', '00011')])
+    
+    def test_ignora_estados_sin_id(self):
+        self.assertFalse(self.cache.aplicar([EstadoProcesal(numero='00001', radicado='')]))
+        self.assertEqual(len(self.cache), 0)
+    
+    def test_reemplazar_reconcilia_con_la_coleccion(self):
+        self.cache.aplicar([estado('1', '00001'), estado('2', '00002')])
+        cambios = self.cache.reemplazar([estado('2', '00002'), estado('3', '00003')])
+        
+        self.assertEqual(cambios.agregados, [estado('3', '00003')])
+        self.assertEqual(cambios.eliminados, [estado('1', '00001')])
+        self.assertEqual([e.id for e in self.cache.estados()], ['2', '3'])
+    
+    def test_meta_y_cambio_de_version(self):
+        self.cache.aplicar([estado('1', '00001')])
+        self.cache.guardar_meta(ultimo_id='1', token=None)
+        self.assertEqual(self.cache.leer_meta('ultimo_id'), '1')
+        self.assertIsNone(self.cache.leer_meta('token'))
+        self.cache.cerrar()
+        
+        with sqlite3.connect(self.ruta) as conexion:
+            conexion.execute("UPDATE meta SET valor = '0' WHERE clave = 'version'")
+        conexion.close()
+        
+        self.cache = CacheEstados(self.ruta)
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNone(self.cache.leer_meta('ultimo_id'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Pruebas de las actualizaciones del modo watch (FileManager.agregar_a_revision):
+el reporte de texto y el JSONL del día deben quedar de acuerdo.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from buscador_estados.core.file_manager import FileManager
+from buscador_estados.core.historial import leer_reporte_revision
+from buscador_estados.core.models import EstadoProcesal, ResultadoBusqueda
+
+FECHA = date(2026, 10, 18)
+
+
+def resultado(numero, archivos=()):
+    estado = EstadoProcesal(numero=numero, radicado=f"0500131030012025{numero}00", id=f"id-{numero}")
+    return ResultadoBusqueda(estado, list(archivos), FECHA,
+                             paginas={archivo: [1] for archivo in archivos})
+
+
+class TestAgregarARevision(unittest.TestCase):
+    
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.file_manager = FileManager(self.carpeta.name, juzgado='A')
+        # Revisión completa: 00001 encontrado, 00002 no
+        with self.file_manager.abrir_escritor(FECHA, formatos=['jsonl']) as escritor:
+            escritor.agregar(resultado('00001', ['ESTADOS 1.pdf']))
+            escritor.agregar(resultado('00002'))
+    
+    def tearDown(self):
+        self.carpeta.cleanup()
+    
+    def _filas(self):
+        with open(self.file_manager.get_archivo_resultados(FECHA, 'jsonl'), encoding='utf-8') as archivo:
+            return [json.loads(linea) for linea in archivo]
+    
+    def test_reemplaza_la_fila_del_estado_en_el_jsonl(self):
+        self.file_manager.agregar_a_revision([resultado('00002', ['NUEVO.pdf'])], 'NUEVO.pdf',
+                                             fecha=FECHA, formatos=['jsonl'])
+        
+        filas = {fila['numero']: fila for fila in self._filas()}
+        self.assertEqual(len(self._filas()), 2)
+        self.assertTrue(filas['00001']['encontrado'])
+        self.assertTrue(filas['00002']['encontrado'])
+        self.assertEqual(filas['00002']['archivos'], ['NUEVO.pdf'])
+        
+        encontrados, total = leer_reporte_revision(self.file_manager.get_archivo_revision(FECHA))
+        self.assertEqual({numero for numero, _, _ in encontrados}, {'00001', '00002'})
+        self.assertEqual(total, 2)
+    
+    def test_sin_formatos_no_toca_el_jsonl(self):
+        antes = self._filas()
+        self.file_manager.agregar_a_revision([resultado('00002', ['NUEVO.pdf'])], 'NUEVO.pdf',
+                                             fecha=FECHA, formatos=[])
+        self.assertEqual(self._filas(), antes)
+    
+    def test_crea_el_jsonl_si_no_hay_revision_completa(self):
+        otra_fecha = date(2026, 10, 19)
+        self.file_manager.agregar_a_revision([resultado('00003', ['NUEVO.pdf'])], 'NUEVO.pdf',
+                                             fecha=otra_fecha, formatos=['jsonl'])
+        with open(self.file_manager.get_archivo_resultados(otra_fecha, 'jsonl'), encoding='utf-8') as archivo:
+            filas = [json.loads(linea) for linea in archivo]
+        self.assertEqual([fila['numero'] for fila in filas], ['00003'])
+        self.assertEqual(filas[0]['juzgado'], 'A')
+
+
+if __name__ == '__main__':
+    unittest.main()
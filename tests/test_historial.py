@@ -0,0 +1,114 @@
+"""
+Pruebas del historial de revisiones (core/historial.py): lectura de los
+reportes de texto, importación y consultas por radicado o proceso.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from buscador_estados.core.historial import HistorialRevisiones, leer_reporte_revision
+
+RADICADO = '05001-31-03-001-2025-00042-00'
+
+REPORTE = f"""=== REVISIÓN DEL 2026-10-17 ===
+
+Se encontró el numero 2025-00042 con radicado {RADICADO} en los archivos: ESTADOS 1.pdf (págs. 1, 3), ANEXO, 2.PDF
+
+=== ACTUALIZACIÓN 10:15:00: NUEVO.pdf ===
+
+Se encontró el numero 2025-00043 con radicado 05001310300120250004300 en los archivos: NUEVO.pdf (pág. 2)
+
+=== ESTADÍSTICAS ===
+Estados encontrados: 2 de 40 (5.0%)
+Estados no encontrados: 38
+
+=== FIN DE REVISIÓN ===
+"""
+
+
+class TestLeerReporteRevision(unittest.TestCase):
+    
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.carpeta.cleanup()
+    
+    def _reporte(self, nombre, contenido):
+        ruta = os.path.join(self.carpeta.name, nombre)
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(contenido)
+        return ruta
+    
+    def test_lee_estados_archivos_y_total(self):
+        encontrados, total = leer_reporte_revision(self._reporte('2026-10-17_revision.txt', REPORTE))
+        self.assertEqual(encontrados, [
+            ('2025-00042', RADICADO, ['ESTADOS 1.pdf', 'ANEXO, 2.PDF']),
+            ('2025-00043', '05001310300120250004300', ['NUEVO.pdf']),
+        ])
+        self.assertEqual(total, 40)
+    
+    def test_reporte_sin_estadisticas(self):
+        contenido = REPORTE[:REPORTE.index('=== ESTADÍSTICAS')]
+        encontrados, total = leer_reporte_revision(self._reporte('2026-10-17_revision.txt', contenido))
+        self.assertEqual(len(encontrados), 2)
+        self.assertIsNone(total)
+
+
+class TestHistorialRevisiones(unittest.TestCase):
+    
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.historial = HistorialRevisiones(os.path.join(self.carpeta.name, 'historial.sqlite3'))
+        self.revision = os.path.join(self.carpeta.name, 'revision')
+        os.makedirs(self.revision)
+    
+    def tearDown(self):
+        self.historial.cerrar()
+        self.carpeta.cleanup()
+    
+    def _reporte(self, fecha):
+        with open(os.path.join(self.revision, f'{fecha}_revision.txt'), 'w', encoding='utf-8') as archivo:
+            archivo.write(REPORTE)
+    
+    def test_importa_los_reportes_una_sola_vez(self):
+        self._reporte('2026-10-16')
+        self._reporte('2026-10-17')
+        with open(os.path.join(self.revision, '2026-10-17_metricas.json'), 'w') as archivo:
+            archivo.write('{}')
+        
+        self.assertEqual(self.historial.importar_reportes('A', self.revision), 2)
+        self.assertEqual(self.historial.importar_reportes('A', self.revision), 0)
+        self.assertEqual(self.historial.importar_reportes('A', self.revision, reemplazar=True), 2)
+        self.assertEqual(self.historial.conteos_por_fecha('A'),
+                         [('2026-10-16', 2, 40, 1), ('2026-10-17', 2, 40, 1)])
+    
+    def test_carpeta_inexistente(self):
+        self.assertEqual(self.historial.importar_reportes('A', os.path.join(self.carpeta.name, 'otra')), 0)
+    
+    def test_consulta_por_radicado_o_proceso(self):
+        self._reporte('2026-10-16')
+        self._reporte('2026-10-17')
+        self.historial.importar_reportes('A', self.revision)
+        
+        for consulta in (RADICADO, '05001310300120250004200', '2025-00042', '2025-42'):
+            with self.subTest(consulta=consulta):
+                self.assertEqual(self.historial.primera_aparicion(consulta), ('2026-10-16', 'A'))
+                self.assertEqual(self.historial.ultima_aparicion(consulta), ('2026-10-17', 'A'))
+        
+        apariciones = self.historial.apariciones('2025-00043')
+        self.assertEqual([(fecha, archivos) for fecha, _, _, _, archivos in apariciones],
+                         [('2026-10-16', ['NUEVO.pdf']), ('2026-10-17', ['NUEVO.pdf'])])
+        self.assertEqual(self.historial.apariciones('2024-00001'), [])
+    
+    def test_tiene_revision(self):
+        self._reporte('2026-10-17')
+        self.historial.importar_reportes('A', self.revision)
+        self.assertTrue(self.historial.tiene_revision('A', date(2026, 10, 17)))
+        self.assertFalse(self.historial.tiene_revision('B', date(2026, 10, 17)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Pruebas del índice de radicados (core/indice.py): tokens que se extraen de
+cada página y consultas sobre un índice en SQLite.
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from buscador_estados.core.indice import IndiceRadicados, extraer_tokens, normalizar_consulta
+from buscador_estados.core.matcher import MatcherNormalizado
+
+RADICADO = '52210408900120250004200'
+RADICADO_CON_GUIONES = '52210-40-89-001-2025-00042-00'
+
+
+class TestExtraerTokens(unittest.TestCase):
+    
+    def test_radicado_con_separadores(self):
+        tokens = extraer_tokens(f"Proceso {RADICADO_CON_GUIONES} ejecutivo")
+        self.assertEqual(tokens, {RADICADO, '2025-00042'})
+    
+    def test_radicado_partido_por_salto_de_linea(self):
+        self.assertIn(RADICADO, extraer_tokens("52210-40-89-001-\n2025-00042-00"))
+    
+    def test_radicado_despues_de_otro_numero(self):
+        texto = f"1 {RADICADO} MATRIMONIO"
+        self.assertEqual(extraer_tokens(texto), {RADICADO, '2025-00042'})
+        self.assertEqual(MatcherNormalizado([RADICADO]).buscar(texto), {RADICADO})
+    
+    def test_radicado_antes_de_una_fecha(self):
+        texto = f"{RADICADO} 19 05 2025"
+        self.assertEqual(extraer_tokens(texto), {RADICADO, '2025-00042'})
+        self.assertEqual(MatcherNormalizado([RADICADO]).buscar(texto), {RADICADO})
+    
+    def test_radicados_seguidos(self):
+        otro = '52001310300120240012300'
+        self.assertEqual(extraer_tokens(f"{RADICADO} {otro}"),
+                         {RADICADO, '2025-00042', otro, '2024-00123'})
+    
+    def test_digitos_que_no_forman_radicado(self):
+        self.assertEqual(extraer_tokens("Folio 12 345 6789 de 19 05 2025"), set())
+    
+    def test_numero_corto_de_proceso(self):
+        self.assertEqual(extraer_tokens("Proceso 2025– 42"), {'2025-00042'})
+    
+    def test_normalizar_consulta(self):
+        self.assertEqual(normalizar_consulta(RADICADO_CON_GUIONES), RADICADO)
+        self.assertEqual(normalizar_consulta('2025-42'), '2025-00042')
+        self.assertIsNone(normalizar_consulta('abc'))
+
+
+class TestIndiceRadicados(unittest.TestCase):
+    
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.indice = IndiceRadicados(os.path.join(self.carpeta.name, 'indice.sqlite3'))
+    
+    def tearDown(self):
+        self.indice.cerrar()
+        self.carpeta.cleanup()
+    
+    def test_buscar_por_radicado_y_por_proceso(self):
+        self.indice.indexar_documento('J1', 'ESTADOS 1.pdf', 'h1',
+                                      ['sin radicados', f"1 {RADICADO} MATRIMONIO"])
+        esperado = [('J1', 'ESTADOS 1.pdf', 2)]
+        self.assertEqual(self.indice.buscar(RADICADO_CON_GUIONES), esperado)
+        self.assertEqual(self.indice.buscar('2025-00042'), esperado)
+    
+    def test_reindexar_reemplaza_las_paginas(self):
+        self.indice.indexar_documento('J1', 'ESTADOS 1.pdf', 'h1', [RADICADO])
+        self.indice.indexar_documento('J1', 'ESTADOS 1.pdf', 'h2', ['otro texto', RADICADO])
+        self.assertTrue(self.indice.esta_indexado('J1', 'ESTADOS 1.pdf', 'h2'))
+        self.assertFalse(self.indice.esta_indexado('J1', 'ESTADOS 1.pdf', 'h1'))
+        self.assertEqual(self.indice.buscar(RADICADO), [('J1', 'ESTADOS 1.pdf', 2)])
+    
+    def test_indice_de_otra_version_se_reconstruye(self):
+        self.indice.indexar_documento('J1', 'ESTADOS 1.pdf', 'h1', [RADICADO])
+        self.indice.cerrar()
+        with sqlite3.connect(self.indice.ruta_db) as conexion:
+            conexion.execute('PRAGMA user_version = 0')
+        conexion.close()
+        self.indice = IndiceRadicados(self.indice.ruta_db)
+        self.assertFalse(self.indice.esta_indexado('J1', 'ESTADOS 1.pdf', 'h1'))
+        self.assertEqual(self.indice.buscar(RADICADO), [])
+    
+    def test_eliminar_ausentes(self):
+        self.indice.indexar_documento('J1', 'ESTADOS 1.pdf', 'h1', [RADICADO])
+        self.indice.eliminar_ausentes('J1', [])
+        self.assertEqual(self.indice.buscar(RADICADO), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
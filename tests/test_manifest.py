@@ -0,0 +1,83 @@
+"""
+Pruebas del manifest de la revisión incremental (core/manifest.py): qué
+PDFs se reutilizan, cuándo se descarta y qué textos quedan por buscar.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from buscador_estados.core.manifest import ManifestRevision
+
+
+class TestManifestRevision(unittest.TestCase):
+    
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.carpeta.name, '.manifest_revision.json')
+        self.pdf = os.path.join(self.carpeta.name, 'ESTADOS 1.pdf')
+        with open(self.pdf, 'wb') as archivo:
+            archivo.write(b'%PDF-1.4 contenido')
+    
+    def tearDown(self):
+        self.carpeta.cleanup()
+    
+    def _guardar(self, extractor='flujos'):
+        manifest = ManifestRevision(self.ruta, extractor)
+        manifest.sincronizar(['ESTADOS 1.pdf'], ['00042'])
+        manifest.registrar_archivo('ESTADOS 1.pdf', self.pdf, {'00042': [2]})
+        manifest.guardar()
+        return manifest
+    
+    def test_reutiliza_los_pdfs_sin_cambios(self):
+        self._guardar()
+        manifest = ManifestRevision.cargar(self.ruta, 'flujos')
+        self.assertTrue(manifest.esta_vigente('ESTADOS 1.pdf', self.pdf))
+        self.assertEqual(manifest.coincidencias(['ESTADOS 1.pdf']), {'00042': {'ESTADOS 1.pdf': [2]}})
+    
+    def test_pdf_modificado_no_esta_vigente(self):
+        self._guardar()
+        with open(self.pdf, 'ab') as archivo:
+            archivo.write(b' anexo')
+        manifest = ManifestRevision.cargar(self.ruta, 'flujos')
+        self.assertFalse(manifest.esta_vigente('ESTADOS 1.pdf', self.pdf))
+    
+    def test_mismo_contenido_con_otra_fecha_sigue_vigente(self):
+        self._guardar()
+        estado = os.stat(self.pdf)
+        os.utime(self.pdf, ns=(estado.st_atime_ns, estado.st_mtime_ns + 10**9))
+        manifest = ManifestRevision.cargar(self.ruta, 'flujos')
+        self.assertTrue(manifest.esta_vigente('ESTADOS 1.pdf', self.pdf))
+    
+    def test_otro_backend_descarta_el_manifest(self):
+        self._guardar()
+        manifest = ManifestRevision.cargar(self.ruta, 'pdfplumber')
+        self.assertEqual(manifest.archivos, {})
+        self.assertEqual(manifest.textos, set())
+    
+    def test_version_anterior_descarta_el_manifest(self):
+        self._guardar()
+        with open(self.ruta, 'r', encoding='utf-8') as archivo:
+            datos = json.load(archivo)
+        datos['version'] = ManifestRevision.VERSION - 1
+        with open(self.ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(datos, archivo)
+        manifest = ManifestRevision.cargar(self.ruta, 'flujos')
+        self.assertFalse(manifest.esta_vigente('ESTADOS 1.pdf', self.pdf))
+    
+    def test_sincronizar_entrega_solo_los_textos_nuevos(self):
+        manifest = self._guardar()
+        nuevos = manifest.sincronizar(['ESTADOS 1.pdf'], ['00042', '00077'])
+        self.assertEqual(nuevos, {'00077'})
+    
+    def test_sincronizar_retira_textos_y_pdfs_ausentes(self):
+        manifest = self._guardar()
+        manifest.sincronizar(['ESTADOS 1.pdf'], ['00077'])
+        self.assertEqual(manifest.archivos['ESTADOS 1.pdf']['coincidencias'], {})
+        manifest.sincronizar([], ['00077'])
+        self.assertEqual(manifest.archivos, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Pruebas de los buscadores multipatrón (core/matcher.py) y de la sombra de
+dígitos con la que se comparan los radicados (core/normalizacion.py).
+"""
+
+import unittest
+
+from buscador_estados.core import matcher as modulo_matcher
+from buscador_estados.core.matcher import AhoCorasickMatcher, MatcherNormalizado
+from buscador_estados.core.normalizacion import SombraDigitos, normalizar_radicado
+from buscador_estados.core.pdf_processor import buscar_por_pagina
+from buscador_estados.core.text_cache import SEPARADOR_PAGINA
+
+RADICADO = '05001310300120250004200'
+IMPRESO = '05001-31-03-001-2025-00042-00'
+
+
+class TestAhoCorasickMatcher(unittest.TestCase):
+    
+    def test_encuentra_patrones_solapados(self):
+        matcher = AhoCorasickMatcher(['he', 'she', 'hers', 'his'])
+        self.assertEqual(matcher.buscar('ushers'), {'he', 'she', 'hers'})
+        self.assertEqual(sorted(matcher.iter_coincidencias('ushers')),
+                         [(4, 'he'), (4, 'she'), (6, 'hers')])
+    
+    def test_busca_en_bytes_utf8_y_en_rangos(self):
+        matcher = AhoCorasickMatcher(['2025-00042', 'año'])
+        texto = 'Proceso 2025-00042 del año'
+        self.assertEqual(matcher.buscar(texto.encode('utf-8')), {'2025-00042', 'año'})
+        self.assertEqual(matcher.buscar(texto, 0, 18), {'2025-00042'})
+        self.assertEqual(matcher.buscar(texto, 9), {'año'})
+    
+    def test_agregar_y_quitar_despues_de_construir(self):
+        matcher = AhoCorasickMatcher(['00042', '00043'])
+        self.assertEqual(matcher.buscar('00042 00043'), {'00042', '00043'})
+        
+        matcher.agregar_patron('00044')
+        matcher.quitar_patron('00042')
+        self.assertEqual(matcher.buscar('00042 00043 00044'), {'00043', '00044'})
+        
+        # Un patrón retirado que se vuelve a agregar no pasa por el autómata aparte
+        matcher.agregar_patron('00042')
+        matcher.quitar_patron('00044')
+        self.assertEqual(matcher.buscar('00042 00043 00044'), {'00042', '00043'})
+        self.assertEqual(matcher.patrones, {'00042', '00043'})
+    
+    def test_compacta_tras_muchos_cambios(self):
+        minimo = modulo_matcher.MIN_CAMBIOS_COMPACTACION
+        modulo_matcher.MIN_CAMBIOS_COMPACTACION = 2
+        self.addCleanup(setattr, modulo_matcher, 'MIN_CAMBIOS_COMPACTACION', minimo)
+        
+        matcher = AhoCorasickMatcher(['a1', 'a2'])
+        matcher.buscar('a1')
+        for patron in ('b1', 'b2', 'b3'):
+            matcher.agregar_patron(patron)
+        
+        self.assertIsNone(matcher._agregados)
+        self.assertEqual(matcher.buscar('a1 a2 b1 b2 b3'), {'a1', 'a2', 'b1', 'b2', 'b3'})
+
+
+class TestMatcherNormalizado(unittest.TestCase):
+    
+    def test_encuentra_el_radicado_con_cualquier_formato(self):
+        matcher = MatcherNormalizado([IMPRESO, '2025-00042'])
+        for texto in (f'Radicado {RADICADO}.',
+                      'Radicado 05001 31 03 001 2025 00042 00',
+                      'Radicado 05001-31-03-001-\n2025-00042-00'):
+            with self.subTest(texto=texto):
+                self.assertIn(IMPRESO, matcher.buscar(texto))
+        self.assertEqual(matcher.buscar('Proceso 2025-00042'), {'2025-00042'})
+    
+    def test_radicado_incompleto_no_coincide(self):
+        matcher = MatcherNormalizado([RADICADO])
+        self.assertEqual(matcher.buscar(RADICADO[:-1] + 'x'), set())
+    
+    def test_fragmentos_conservan_el_texto_impreso(self):
+        matcher = MatcherNormalizado([RADICADO])
+        texto = 'Auto del 05001 - 31-03-001-2025-00042-00 notificado'
+        self.assertEqual(matcher.fragmentos(texto), {RADICADO: '05001 - 31-03-001-2025-00042-00'})
+    
+    def test_quitar_una_forma_conserva_las_demas(self):
+        matcher = MatcherNormalizado([RADICADO, IMPRESO])
+        self.assertEqual(len(matcher), 2)
+        
+        matcher.quitar_patron(RADICADO)
+        self.assertNotIn(RADICADO, matcher)
+        self.assertEqual(matcher.buscar(IMPRESO), {IMPRESO})
+        
+        matcher.quitar_patron(IMPRESO)
+        self.assertEqual(matcher.buscar(IMPRESO), set())
+        self.assertEqual(len(matcher), 0)
+
+
+class TestSombraDigitos(unittest.TestCase):
+    
+    def test_normalizar_radicado(self):
+        self.assertEqual(normalizar_radicado(IMPRESO), RADICADO)
+        self.assertIsNone(normalizar_radicado('2025-00042'))
+        self.assertIsNone(normalizar_radicado(f'R{RADICADO}'))
+    
+    def test_omite_secuencias_cortas_y_mapea_al_original(self):
+        texto = f'Folio 12 radicado {IMPRESO} fin'
+        sombra = SombraDigitos(texto)
+        self.assertEqual(sombra.texto, RADICADO)
+        self.assertEqual(sombra.fragmento_original(len(RADICADO), len(RADICADO)), IMPRESO)
+    
+    def test_bytes_con_guion_largo(self):
+        texto = '05001–31–03–001–2025–00042–00'
+        sombra = SombraDigitos(texto.encode('utf-8'))
+        self.assertEqual(sombra.texto, RADICADO)
+        self.assertEqual(sombra.fragmento_original(len(RADICADO), len(RADICADO)), texto)
+
+
+class TestBuscarPorPagina(unittest.TestCase):
+    
+    def test_entrega_las_paginas_de_cada_patron(self):
+        matcher = MatcherNormalizado(['2025-00042', RADICADO])
+        contenido = SEPARADOR_PAGINA.join([
+            'Proceso 2025-00042',
+            'Sin estados',
+            f'Proceso 2025-00042, radicado {IMPRESO}',
+        ])
+        self.assertEqual(buscar_por_pagina(matcher, contenido),
+                         {'2025-00042': [1, 3], RADICADO: [3]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,310 @@
+"""
+Pruebas del lector de content streams (core/pdf_raw.py) con PDFs mínimos
+escritos a mano: filtros de stream, object streams, CMaps ToUnicode, tablas
+xref dañadas y el respaldo de ExtractorAutomatico.
+"""
+
+import base64
+import os
+import tempfile
+import unittest
+import zlib
+from typing import Dict, List
+
+from buscador_estados.core.pdf_processor import ExtractorAutomatico, ExtractorFlujos
+from buscador_estados.core.pdf_raw import DocumentoCrudo, ErrorPDFCrudo, _decodificar_lzw, extraer_paginas
+
+RADICADO = '52001310300120250004200'
+CONTENIDO = b'BT /F1 10 Tf 1 0 0 1 30 760 Tm (Radicado ' + RADICADO.encode() + b') Tj ET'
+FUENTE_SIMPLE = (b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding '
+                 b'/FirstChar 32 /LastChar 255 /Widths [' + b' '.join([b'556'] * 224) + b'] >>')
+
+
+def _lzw(datos: bytes) -> bytes:
+    """Codifica con LZW (códigos de 9 a 12 bits, EarlyChange 1) como lo haría un PDF."""
+    tabla = {bytes([i]): i for i in range(256)}
+    siguiente = 258
+    ancho = 9
+    codigos = [(256, 9)]
+    actual = b''
+    for byte in datos:
+        candidato = actual + bytes([byte])
+        if candidato in tabla:
+            actual = candidato
+            continue
+        codigos.append((tabla[actual], ancho))
+        tabla[candidato] = siguiente
+        siguiente += 1
+        if siguiente + 1 > (1 << ancho) and ancho < 12:
+            ancho += 1
+        actual = bytes([byte])
+    if actual:
+        codigos.append((tabla[actual], ancho))
+        if siguiente + 2 > (1 << ancho) and ancho < 12:
+            ancho += 1
+    codigos.append((257, ancho))
+    
+    acumulado = 0
+    bits = 0
+    salida = bytearray()
+    for codigo, largo in codigos:
+        acumulado = (acumulado << largo) | codigo
+        bits += largo
+        while bits >= 8:
+            bits -= 8
+            salida.append((acumulado >> bits) & 0xFF)
+    if bits:
+        salida.append((acumulado << (8 - bits)) & 0xFF)
+    return bytes(salida)
+
+
+def _stream(datos: bytes, extra: bytes = b'') -> bytes:
+    """Cuerpo de un objeto stream con su Length."""
+    return b'<< /Length %d %s>>\nstream\n' % (len(datos), extra) + datos + b'\nendstream'
+
+
+def _pdf(objetos: Dict[int, bytes], xref: str = 'valida') -> bytes:
+    """
+    Arma un PDF con los objetos indicados; el 1 debe ser el catálogo.
+    
+    Con xref='danada' la tabla apunta a desplazamientos falsos y startxref
+    a cualquier parte; con xref='ausente' no se escribe.
+    """
+    salida = bytearray(b'%PDF-1.5\n%\xe2\xe3\xcf\xd3\n')
+    posiciones = {}
+    for numero in sorted(objetos):
+        posiciones[numero] = len(salida)
+        salida += b'%d 0 obj\n' % numero + objetos[numero] + b'\nendobj\n'
+    
+    total = max(objetos) + 1
+    if xref != 'ausente':
+        inicio_xref = len(salida)
+        salida += b'xref\n0 %d\n0000000000 65535 f \n' % total
+        for numero in range(1, total):
+            desplazamiento = posiciones.get(numero, 0) if xref == 'valida' else 7 * numero + 3
+            salida += b'%010d 00000 n \n' % desplazamiento
+        salida += b'trailer\n<< /Size %d /Root 1 0 R >>\n' % total
+        salida += b'startxref\n%d\n%%%%EOF\n' % (inicio_xref if xref == 'valida' else 999999)
+    return bytes(salida)
+
+
+def _pdf_una_pagina(contenido: bytes, extra_contenido: bytes = b'', fuente: bytes = FUENTE_SIMPLE,
+                    otros: Dict[int, bytes] = None, xref: str = 'valida') -> bytes:
+    """PDF de una página con la fuente /F1 (objeto 3) y el content stream (objeto 4)."""
+    objetos = {
+        1: b'<< /Type /Catalog /Pages 2 0 R >>',
+        2: b'<< /Type /Pages /Kids [5 0 R] /Count 1 >>',
+        3: fuente,
+        4: _stream(contenido, extra_contenido),
+        5: (b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents 4 0 R >>'),
+    }
+    objetos.update(otros or {})
+    return _pdf(objetos, xref)
+
+
+class PruebaPDF(unittest.TestCase):
+    """Base que escribe los PDFs en una carpeta temporal."""
+    
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.carpeta.cleanup)
+    
+    def escribir(self, datos: bytes, nombre: str = 'gaceta.pdf') -> str:
+        ruta = os.path.join(self.carpeta.name, nombre)
+        with open(ruta, 'wb') as archivo:
+            archivo.write(datos)
+        return ruta
+    
+    def paginas(self, datos: bytes) -> List[str]:
+        return list(extraer_paginas(self.escribir(datos)))
+
+
+class TestFiltros(PruebaPDF):
+    """Decodificación de streams con uno o varios filtros."""
+    
+    def test_flate(self):
+        paginas = self.paginas(_pdf_una_pagina(zlib.compress(CONTENIDO), b'/Filter /FlateDecode '))
+        self.assertEqual(paginas, [f'Radicado {RADICADO}'])
+    
+    def test_flate_truncado(self):
+        comprimido = zlib.compress(CONTENIDO)[:-4]
+        paginas = self.paginas(_pdf_una_pagina(comprimido, b'/Filter /FlateDecode '))
+        self.assertIn(RADICADO, paginas[0])
+    
+    def test_ascii_hex(self):
+        datos = CONTENIDO.hex().upper().encode() + b'\n>'
+        paginas = self.paginas(_pdf_una_pagina(datos, b'/Filter /ASCIIHexDecode '))
+        self.assertEqual(paginas, [f'Radicado {RADICADO}'])
+    
+    def test_ascii85(self):
+        datos = base64.a85encode(CONTENIDO, wrapcol=40) + b'~>'
+        paginas = self.paginas(_pdf_una_pagina(datos, b'/Filter /A85 '))
+        self.assertEqual(paginas, [f'Radicado {RADICADO}'])
+    
+    def test_lzw(self):
+        paginas = self.paginas(_pdf_una_pagina(_lzw(CONTENIDO), b'/Filter /LZWDecode '))
+        self.assertEqual(paginas, [f'Radicado {RADICADO}'])
+    
+    def test_lzw_codigos_de_mas_de_9_bits(self):
+        datos = bytes(range(256)) * 20 + b'abcabcabcabd' * 300
+        self.assertEqual(_decodificar_lzw(_lzw(datos)), datos)
+    
+    def test_cadena_de_filtros(self):
+        # Se aplican en orden: primero ASCII85, luego Flate
+        datos = base64.a85encode(zlib.compress(CONTENIDO)) + b'~>'
+        paginas = self.paginas(_pdf_una_pagina(datos, b'/Filter [/ASCII85Decode /FlateDecode] '))
+        self.assertEqual(paginas, [f'Radicado {RADICADO}'])
+        
+        datos = zlib.compress(_lzw(CONTENIDO)).hex().encode() + b'>'
+        paginas = self.paginas(_pdf_una_pagina(
+            datos, b'/Filter [/AHx /Fl /LZW] /DecodeParms [null null << /EarlyChange 1 >>] '
+        ))
+        self.assertEqual(paginas, [f'Radicado {RADICADO}'])
+    
+    def test_filtro_no_soportado(self):
+        documento = DocumentoCrudo(_pdf_una_pagina(CONTENIDO, b'/Filter /DCTDecode '))
+        self.assertIsNone(documento.flujo(4))
+    
+    def test_predictor_no_soportado(self):
+        documento = DocumentoCrudo(_pdf_una_pagina(
+            zlib.compress(CONTENIDO), b'/Filter /FlateDecode /DecodeParms << /Predictor 12 >> '
+        ))
+        self.assertIsNone(documento.flujo(4))
+    
+    def test_stream_danado(self):
+        documento = DocumentoCrudo(_pdf_una_pagina(b'zz no es hex >', b'/Filter /ASCIIHexDecode '))
+        self.assertIsNone(documento.flujo(4))
+
+
+class TestObjectStreams(PruebaPDF):
+    """Objetos comprimidos dentro de object streams (PDF 1.5+)."""
+    
+    def test_pagina_y_fuente_en_object_stream(self):
+        internos = [
+            (2, b'<< /Type /Pages /Kids [5 0 R] /Count 1 >>'),
+            (3, FUENTE_SIMPLE),
+            (5, b'<< /Type /Page /Parent 2 0 R /Resources << /Font << /F1 3 0 R >> >> /Contents 4 0 R >>'),
+        ]
+        encabezado = bytearray()
+        cuerpo = bytearray()
+        for numero, objeto in internos:
+            encabezado += b'%d %d ' % (numero, len(cuerpo))
+            cuerpo += objeto + b' '
+        contenido = bytes(encabezado) + bytes(cuerpo)
+        datos = _pdf({
+            1: b'<< /Type /Catalog /Pages 2 0 R >>',
+            4: _stream(zlib.compress(CONTENIDO), b'/Filter /FlateDecode '),
+            6: _stream(zlib.compress(contenido),
+                       b'/Type /ObjStm /N 3 /First %d /Filter /FlateDecode ' % len(encabezado)),
+        }, xref='ausente')
+        
+        documento = DocumentoCrudo(datos)
+        self.assertEqual(documento.objeto(2)['Count'], 1)
+        self.assertEqual(self.paginas(datos), [f'Radicado {RADICADO}'])
+    
+    def test_objeto_directo_prevalece_sobre_object_stream(self):
+        contenido = b'3 0 << /Repetido true >>'
+        datos = _pdf_una_pagina(CONTENIDO, otros={
+            6: _stream(contenido, b'/Type /ObjStm /N 1 /First 4 '),
+        })
+        self.assertEqual(DocumentoCrudo(datos).objeto(3)['Subtype'], 'Type1')
+
+
+class TestToUnicode(PruebaPDF):
+    """Fuentes Type0 de dos bytes por código con CMap ToUnicode."""
+    
+    CMAP = (b'/CIDInit /ProcSet findresource begin 12 dict begin begincmap\n'
+            b'1 begincodespacerange <0000> <FFFF> endcodespacerange\n'
+            b'2 beginbfchar <0003> <0020> <0020> <00D3> endbfchar\n'
+            b'2 beginbfrange <0010> <0019> <0030> <0021> <0022> [<0041> <0042>] endbfrange\n'
+            b'endcmap CMapName currentdict /CMap defineresource pop end end')
+    
+    def _fuente(self) -> Dict[int, bytes]:
+        return {
+            3: b'<< /Type /Font /Subtype /Type0 /BaseFont /Arial /Encoding /Identity-H '
+               b'/DescendantFonts [7 0 R] /ToUnicode 6 0 R >>',
+            6: _stream(zlib.compress(self.CMAP), b'/Filter /FlateDecode '),
+            7: b'<< /Type /Font /Subtype /CIDFontType2 /DW 1000 /W [16 [556 556 556] 3 3 278] >>',
+        }
+    
+    def test_bfchar_y_bfrange(self):
+        # "AB 2025" y una Ó: A y B por el arreglo de bfrange, dígitos por el rango
+        codigos = '0021 0022 0003 0012 0010 0012 0015 0020'
+        contenido = b'BT /F1 10 Tf 1 0 0 1 30 760 Tm <' + codigos.replace(' ', '').encode() + b'> Tj ET'
+        fuentes = self._fuente()
+        datos = _pdf_una_pagina(contenido, fuente=fuentes.pop(3), otros=fuentes)
+        self.assertEqual(self.paginas(datos), ['AB 2025Ó'])
+    
+    def test_radicado_completo(self):
+        codigos = ''.join(f'{0x10 + int(digito):04X}' for digito in RADICADO)
+        contenido = b'BT /F1 9 Tf 1 0 0 1 30 700 Tm <' + codigos.encode() + b'> Tj ET'
+        fuentes = self._fuente()
+        datos = _pdf_una_pagina(contenido, fuente=fuentes.pop(3), otros=fuentes)
+        self.assertEqual(self.paginas(datos), [RADICADO])
+
+
+class TestXrefDanada(PruebaPDF):
+    """Los objetos se ubican recorriendo el archivo, no con la tabla xref."""
+    
+    def test_desplazamientos_falsos(self):
+        datos = _pdf_una_pagina(zlib.compress(CONTENIDO), b'/Filter /FlateDecode ', xref='danada')
+        self.assertEqual(self.paginas(datos), [f'Radicado {RADICADO}'])
+    
+    def test_sin_xref(self):
+        datos = _pdf_una_pagina(CONTENIDO, xref='ausente')
+        self.assertEqual(self.paginas(datos), [f'Radicado {RADICADO}'])
+    
+    def test_no_es_pdf(self):
+        with self.assertRaises(ErrorPDFCrudo):
+            DocumentoCrudo(b'<html>no es un PDF</html>')
+    
+    def test_sin_arbol_de_paginas(self):
+        datos = _pdf({1: b'<< /Type /Catalog >>', 2: b'<< /Nada true >>'}, xref='danada')
+        with self.assertRaises(ErrorPDFCrudo):
+            self.paginas(datos)
+
+
+class _RespaldoFalso:
+    """Respaldo que registra las llamadas en lugar de abrir pdfplumber."""
+    
+    def __init__(self):
+        self.rutas = []
+    
+    def extraer_paginas(self, ruta_archivo: str):
+        self.rutas.append(ruta_archivo)
+        return iter(['texto del respaldo 2025-00042'])
+
+
+class TestRespaldoAutomatico(PruebaPDF):
+    """ExtractorAutomatico recurre al respaldo cuando la lectura rápida no sirve."""
+    
+    def setUp(self):
+        super().setUp()
+        self.extractor = ExtractorAutomatico()
+        self.respaldo = _RespaldoFalso()
+        self.extractor.respaldo = self.respaldo
+    
+    def test_usa_lectura_rapida_si_hay_digitos(self):
+        ruta = self.escribir(_pdf_una_pagina(CONTENIDO, xref='danada'))
+        self.assertEqual(list(self.extractor.extraer_paginas(ruta)), [f'Radicado {RADICADO}'])
+        self.assertEqual(self.respaldo.rutas, [])
+    
+    def test_respaldo_con_xref_y_arbol_danados(self):
+        ruta = self.escribir(_pdf({1: b'<< /Type /Catalog >>'}, xref='danada'))
+        self.assertEqual(list(self.extractor.extraer_paginas(ruta)), ['texto del respaldo 2025-00042'])
+        self.assertEqual(self.respaldo.rutas, [ruta])
+    
+    def test_respaldo_con_archivo_truncado(self):
+        datos = _pdf_una_pagina(zlib.compress(CONTENIDO), b'/Filter /FlateDecode ')
+        ruta = self.escribir(datos[:len(datos) // 3])
+        self.assertEqual(list(self.extractor.extraer_paginas(ruta)), ['texto del respaldo 2025-00042'])
+    
+    def test_respaldo_con_filtro_no_soportado(self):
+        ruta = self.escribir(_pdf_una_pagina(CONTENIDO, b'/Filter /JBIG2Decode '))
+        self.assertEqual(list(ExtractorFlujos().extraer_paginas(ruta)), [''])
+        self.assertEqual(list(self.extractor.extraer_paginas(ruta)), ['texto del respaldo 2025-00042'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Pruebas de la caché de textos extraídos (core/text_cache.py): vigencia por
+contenido, desalojo y compactación del corpus.
+"""
+
+import os
+import tempfile
+import unittest
+
+from buscador_estados.core.text_cache import TextCache
+
+
+class TestTextCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.ruta_db = os.path.join(self.carpeta.name, '.cache_textos.sqlite3')
+    
+    def tearDown(self):
+        self.carpeta.cleanup()
+    
+    def _pdf(self, nombre, contenido):
+        ruta = os.path.join(self.carpeta.name, nombre)
+        with open(ruta, 'wb') as archivo:
+            archivo.write(contenido)
+        return ruta
+    
+    def _abrir(self, **kwargs):
+        cache = TextCache(self.ruta_db, **kwargs)
+        self.addCleanup(cache.cerrar)
+        return cache
+    
+    def test_guarda_y_obtiene_por_contenido(self):
+        cache = self._abrir()
+        pdf = self._pdf('ESTADOS 1.pdf', b'%PDF uno')
+        cache.guardar(pdf, 'página 1\fpágina 2', 'flujos')
+        
+        self.assertEqual(cache.obtener(pdf, 'flujos'), 'página 1\fpágina 2')
+        self.assertEqual(cache.obtener_fragmento(pdf, 'flujos').paginas, 2)
+        # Otro backend no reutiliza el texto
+        self.assertIsNone(cache.obtener(pdf, 'pdfplumber'))
+        # Un PDF duplicado con otro nombre comparte la entrada
+        self.assertEqual(cache.obtener(self._pdf('COPIA.pdf', b'%PDF uno'), 'flujos'), 'página 1\fpágina 2')
+    
+    def test_pdf_modificado_deja_de_estar_vigente(self):
+        cache = self._abrir()
+        pdf = self._pdf('ESTADOS 1.pdf', b'%PDF uno')
+        cache.guardar(pdf, 'texto', 'flujos')
+        self._pdf('ESTADOS 1.pdf', b'%PDF dos distinto')
+        
+        self.assertFalse(cache.es_vigente(pdf, 'flujos'))
+        self.assertIsNone(cache.obtener(pdf, 'flujos'))
+    
+    def test_desaloja_y_compacta_el_corpus(self):
+        cache = self._abrir(max_bytes=250)
+        pdfs = [self._pdf(f'ESTADOS {i}.pdf', f'%PDF {i}'.encode()) for i in range(4)]
+        for i, pdf in enumerate(pdfs):
+            cache.guardar(pdf, str(i) * 100, 'flujos')
+        
+        # Solo caben dos textos; se desalojan los primeros
+        self.assertIsNone(cache.obtener(pdfs[0], 'flujos'))
+        self.assertIsNone(cache.obtener(pdfs[1], 'flujos'))
+        self.assertEqual(cache.obtener(pdfs[3], 'flujos'), '3' * 100)
+        
+        generacion = cache.generacion
+        corpus_anterior = cache.ruta_corpus()
+        cache.compactar()
+        
+        self.assertEqual(cache.generacion, generacion + 1)
+        self.assertFalse(os.path.exists(corpus_anterior))
+        self.assertEqual(os.path.getsize(cache.ruta_corpus()), 200)
+        self.assertEqual(cache.obtener(pdfs[2], 'flujos'), '2' * 100)
+        self.assertEqual(cache.obtener(pdfs[3], 'flujos'), '3' * 100)
+    
+    def test_conserva_los_textos_al_reabrir(self):
+        cache = self._abrir()
+        pdf = self._pdf('ESTADOS 1.pdf', b'%PDF uno')
+        cache.guardar(pdf, 'texto', 'flujos')
+        cache.compactar()
+        cache.cerrar()
+        
+        cache = self._abrir()
+        self.assertEqual(cache.obtener(pdf, 'flujos'), 'texto')
+    
+    def test_corpus_perdido_descarta_los_textos(self):
+        cache = self._abrir()
+        pdf = self._pdf('ESTADOS 1.pdf', b'%PDF uno')
+        cache.guardar(pdf, 'texto', 'flujos')
+        cache.cerrar()
+        os.remove(cache.ruta_corpus())
+        
+        cache = self._abrir()
+        self.assertFalse(cache.es_vigente(pdf, 'flujos'))
+
+
+if __name__ == '__main__':
+    unittest.main()